@@ -0,0 +1,37 @@
+# ============================================
+# PAGE 1 — HOMEPAGE
+# ============================================
+import streamlit as st
+
+st.markdown("""
+    <h1 style="text-align:center; margin-bottom:0;">🍽️ Dallas Restaurants Dashboard</h1>
+    <p style="text-align:center; font-size:18px; margin-top:0; color:#ffffff;">
+        Explore, analyze, and visualize restaurant data across Dallas.
+    </p>
+""", unsafe_allow_html=True)
+st.write("---")
+col1, col2 = st.columns([1.3, 1])
+with col1:
+    st.subheader("Welcome!")
+    st.write("""
+        This application connects to the **group02 MySQL restaurant database** and allows you to:
+        - 📍 View restaurants on an interactive map  
+        - 🗂️ Browse and filter restaurant data  
+        - ➕ Add new restaurant entries  
+        - 🗃️ Archive/restore restaurant records (soft delete)
+        - ⭐ Manage restaurant reviews
+        
+        Use the sidebar to navigate.
+    """)
+with col2:
+    st.image("drelogo.png", caption="Dallas Restaurant Explorer", use_container_width=True)
+st.write("---")
+st.subheader("Features")
+feat1, feat2, feat3, feat4, feat5 = st.columns(5)
+with feat1: st.markdown("### 🗺️ Map")
+with feat2: st.markdown("### 📋 Search")
+with feat3: st.markdown("### ➕ Add")
+with feat4: st.markdown("### 🗃️ Archive")
+with feat5: st.markdown("### ⭐ Reviews")
+st.write("---")
+st.markdown("<p style='text-align:center; color:#bbbbbb;'>Built by Group02 • Powered by Streamlit & MySQL</p>", unsafe_allow_html=True)
@@ -0,0 +1,378 @@
+# ============================================
+# PAGE 4 — MANAGE RESTAURANTS
+# ============================================
+import streamlit as st
+from mysql.connector import Error
+from services import bulk_import, db, export, profiling, repository, selection_grid, session, writes
+
+connection = session.connect()
+db_connected = connection is not None
+
+st.header("🗃️ Manage Restaurants")
+st.markdown("---")
+if not db_connected:
+    st.error("Database connection unavailable.")
+else:
+    # Only the selected section runs (and queries) on a rerun; st.tabs
+    # would run all five every time
+    restaurant_sections = ["Archive Restaurants", "Restore Archived", "View All Status",
+                           "➕ Add New Restaurant", "🔄 Update Existing Restaurant", "📥 Bulk Import"]
+    section = st.radio("Section", restaurant_sections, horizontal=True,
+                       label_visibility="collapsed", key="restaurant_section")
+    profiling.begin(section)
+
+    # Result of a write made in a fragment (shown after the full rerun)
+    if "flash" in st.session_state:
+        st.success(st.session_state.pop("flash"))
+        st.balloons()
+    
+    # TAB 1: Archive Restaurants
+    if section == restaurant_sections[0]:
+        st.subheader("📦 Archive Restaurants")
+        st.info("ℹ️ Archiving removes restaurants from active listings but preserves all data.")
+
+        # Selecting and paging rerun only this fragment; archiving reruns the app
+        @session.fragment
+        @profiling.section(restaurant_sections[0])
+        def archive_section():
+            try:
+                df = repository.load_active_restaurants()
+                if df.empty:
+                    st.info("No active restaurants to archive.")
+                    return
+                st.success(f"📊 {len(df)} active restaurants available")
+                selected = selection_grid.selection_grid(
+                    df, "selected_to_archive", "restaurant_id", ["name", "price_symbol", "cuisines", "description"],
+                    column_config={"name": "Name", "price_symbol": "Price", "cuisines": "Cuisines", "description": "Description"},
+                    extend_page=lambda rows: repository.with_descriptions(rows, readonly=False), select_buttons=True)
+                if len(selected) > 0:
+                    st.warning(f"⚠️ {len(selected)} restaurant(s) selected for archiving")
+                    col1, col2, _ = st.columns([1, 1, 3])
+                    with col1:
+                        if st.button("📦 Archive Selected", type="primary"):
+                            try:
+                                archived = writes.set_restaurants_active(db.get_connection(), selected, False)
+                                repository.invalidate_after_archive()
+                                selection_grid.clear_selection("selected_to_archive")
+                                st.session_state.flash = f"✅ Successfully archived {archived} restaurant(s)!"
+                                st.rerun(scope="app")
+                            except Error as e:
+                                st.error(f"❌ Failed to archive: {e}")
+                    with col2:
+                        st.button("Cancel", on_click=selection_grid.clear_selection, args=("selected_to_archive",))
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
+
+        archive_section()
+
+    # TAB 2: Restore
+    if section == restaurant_sections[1]:
+        st.subheader("♻️ Restore Archived Restaurants")
+
+        @session.fragment
+        @profiling.section(restaurant_sections[1])
+        def restore_section():
+            try:
+                df = repository.load_archived_restaurants()
+                if df.empty:
+                    st.info("No archived restaurants to restore.")
+                    return
+                st.success(f"📊 {len(df)} archived restaurants")
+                selected = selection_grid.selection_grid(
+                    df, "selected_to_restore", "restaurant_id", ["name", "price_symbol"],
+                    column_config={"name": "Name", "price_symbol": "Price"})
+                if len(selected) > 0:
+                    if st.button("♻️ Restore Selected", type="primary"):
+                        try:
+                            restored = writes.set_restaurants_active(db.get_connection(), selected, True)
+                            repository.invalidate_after_restore()
+                            selection_grid.clear_selection("selected_to_restore")
+                            st.session_state.flash = f"✅ Restored {restored} restaurant(s)!"
+                            st.rerun(scope="app")
+                        except Error as e:
+                            st.error(f"❌ Failed: {e}")
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
+
+        restore_section()
+
+    # TAB 3: View All Status
+    if section == restaurant_sections[2]:
+        st.subheader("📊 All Restaurants - Status Overview")
+        try:
+            df = repository.load_restaurant_status()
+            if not df.empty:
+                df = repository.with_ratings(df)
+                df["status"] = df["is_active"].apply(lambda x: "✅ Active" if x else "📦 Archived")
+                col1, col2, col3 = st.columns(3)
+                with col1: st.metric("Total", len(df))
+                with col2: st.metric("Active", len(df[df["is_active"] == True]))
+                with col3: st.metric("Archived", len(df[df["is_active"] == False]))
+                st.dataframe(df[["restaurant_id", "name", "status", "price_symbol", "cuisines", "avg_rating", "review_count"]],
+                           use_container_width=True, height=500,
+                           column_config={"avg_rating": st.column_config.NumberColumn("Rating", format="%.1f ⭐"),
+                                          "review_count": "Reviews"})
+                st.caption("Download every restaurant with its full record (streamed from the database):")
+                export.download_buttons("restaurant_status", *export.status_export(), key="status_export")
+        except Exception as e:
+            st.error(f"❌ Error: {e}")
+    
+    # TAB 4: Add Restaurant
+    if section == restaurant_sections[3]:
+        st.subheader("➕ Add New Restaurant")
+        # Typing in a form does not rerun the app; Save submits all fields at once
+        with st.form("add_restaurant_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                name = st.text_input("Restaurant Name *", placeholder="e.g., Joe's Pizza")
+                street = st.text_input("Street Address *")
+                zip_code = st.text_input("ZIP Code *")
+            with col2:
+                city = st.text_input("City", value="Dallas")
+                state = st.text_input("State", value="TX", max_chars=2)
+                phone = st.text_input("Phone")
+            description = st.text_area("Description")
+            website = st.text_input("Website")
+            lat = st.number_input("Latitude", value=32.7767, format="%.6f")
+            lng = st.number_input("Longitude", value=-96.7970, format="%.6f")
+            price = st.selectbox("Price Range", ["$", "$$", "$$$", "$$$$"])
+            submitted = st.form_submit_button("💾 Save Restaurant", type="primary")
+
+        if submitted:
+            if not name or not street or not zip_code:
+                st.error("❌ Required fields missing!")
+            else:
+                try:
+                    cursor = connection.cursor()
+                    cursor.execute("""
+                        INSERT INTO Restaurants (name, street_address, city, state, zip_code, phone, 
+                                               website, description, latitude, longitude, is_active, updated_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, TRUE, CURRENT_TIMESTAMP)
+                    """, (name, street, city, state, zip_code, phone, website, description, lat, lng))
+                    connection.commit()
+                    cursor.close()
+                    repository.invalidate_after_add()
+                    st.success(f"✅ Added {name}!")
+                    st.balloons()
+                except Error as e:
+                    connection.rollback()
+                    st.error(f"❌ Error: {e}")
+    
+# TAB 5: Update Restaurant
+    if section == restaurant_sections[4]:
+        st.subheader("🔄 Update Existing Restaurant")
+        st.info("Select a restaurant to edit its details")
+        
+        try:
+            # Get all active restaurants
+            restaurants = repository.load_active_restaurant_names()
+            
+            if not restaurants:
+                st.warning("No active restaurants available to update.")
+            else:
+                # Create a dictionary for the selectbox
+                restaurant_options = {f"{name} (ID: {rid})": rid for rid, name in restaurants}
+                
+                # Restaurant selection
+                selected_restaurant_display = st.selectbox(
+                    "Select Restaurant to Update *",
+                    list(restaurant_options.keys())
+                )
+                selected_restaurant_id = restaurant_options[selected_restaurant_display]
+                
+                # Fetch current restaurant details
+                current_data = repository.load_restaurant_details(selected_restaurant_id)
+                
+                if current_data:
+                    st.markdown("---")
+                    st.markdown("### Current Restaurant Information")
+                    st.info("Edit the fields below and click 'Update Restaurant' to save changes.")
+                    
+                    # Create form for updating (edits stay in the browser until submitted)
+                    with st.form(f"update_form_{selected_restaurant_id}"):
+                        col1, col2 = st.columns(2)
+                    
+                        with col1:
+                            new_name = st.text_input(
+                                "Restaurant Name *", 
+                                value=current_data['name'] if current_data['name'] else "",
+                                key=f"update_name_{selected_restaurant_id}"
+                            )
+                            new_street = st.text_input(
+                                "Street Address *", 
+                                value=current_data['street_address'] if current_data['street_address'] else "",
+                                key=f"update_street_{selected_restaurant_id}"
+                            )
+                            new_zip = st.text_input(
+                                "ZIP Code *", 
+                                value=current_data['zip_code'] if current_data['zip_code'] else "",
+                                key=f"update_zip_{selected_restaurant_id}"
+                            )
+                    
+                        with col2:
+                            new_city = st.text_input(
+                                "City", 
+                                value=current_data['city'] if current_data['city'] else "Dallas",
+                                key=f"update_city_{selected_restaurant_id}"
+                            )
+                            new_state = st.text_input(
+                                "State", 
+                                value=current_data['state'] if current_data['state'] else "TX",
+                                max_chars=2,
+                                key=f"update_state_{selected_restaurant_id}"
+                            )
+                            new_phone = st.text_input(
+                                "Phone", 
+                                value=current_data['phone'] if current_data['phone'] else "",
+                                key=f"update_phone_{selected_restaurant_id}"
+                            )
+                    
+                        new_description = st.text_area(
+                            "Description", 
+                            value=current_data['description'] if current_data['description'] else "",
+                            key=f"update_desc_{selected_restaurant_id}"
+                        )
+                        new_website = st.text_input(
+                            "Website", 
+                            value=current_data['website'] if current_data['website'] else "",
+                            key=f"update_website_{selected_restaurant_id}"
+                        )
+                    
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            new_lat = st.number_input(
+                                "Latitude", 
+                                value=float(current_data['latitude']) if current_data['latitude'] else 32.7767,
+                                format="%.6f",
+                                key=f"update_lat_{selected_restaurant_id}"
+                            )
+                        with col2:
+                            new_lng = st.number_input(
+                                "Longitude", 
+                                value=float(current_data['longitude']) if current_data['longitude'] else -96.7970,
+                                format="%.6f",
+                                key=f"update_lng_{selected_restaurant_id}"
+                            )
+                    
+                        # Price range selection
+                        price_options = ["$", "$$", "$$$", "$$$$"]
+                        current_price_index = price_options.index(current_data['price_symbol']) if current_data['price_symbol'] in price_options else 0
+                        new_price = st.selectbox(
+                            "Price Range", 
+                            price_options,
+                            index=current_price_index,
+                            key=f"update_price_{selected_restaurant_id}"
+                        )
+                    
+                        st.markdown("---")
+                    
+                        # Update button
+                        col1, col2, _ = st.columns([1, 1, 3])
+                        with col1:
+                            if st.form_submit_button("💾 Update Restaurant", type="primary"):
+                                if not new_name or not new_street or not new_zip:
+                                    st.error("❌ Required fields (Name, Street Address, ZIP Code) cannot be empty!")
+                                else:
+                                    try:
+                                        cursor = connection.cursor()
+                                    
+                                        # Update restaurant basic info
+                                        cursor.execute("""
+                                            UPDATE Restaurants 
+                                            SET name = %s, street_address = %s, city = %s, state = %s, 
+                                                zip_code = %s, phone = %s, website = %s, description = %s,
+                                                latitude = %s, longitude = %s, updated_at = CURRENT_TIMESTAMP
+                                            WHERE restaurant_id = %s
+                                        """, (new_name, new_street, new_city, new_state, new_zip, 
+                                              new_phone, new_website, new_description, new_lat, new_lng, 
+                                              selected_restaurant_id))
+                                    
+                                        # Update price range
+                                        # First, get the price_range_id for the selected price symbol
+                                        cursor.execute("""
+                                            SELECT price_range_id FROM PriceRanges WHERE price_symbol = %s
+                                        """, (new_price,))
+                                        price_range_result = cursor.fetchone()
+                                    
+                                        if price_range_result:
+                                            price_range_id = price_range_result[0]
+                                        
+                                            # Check if pricing record exists
+                                            cursor.execute("""
+                                                SELECT COUNT(*) FROM RestaurantPricing 
+                                                WHERE restaurant_id = %s
+                                            """, (selected_restaurant_id,))
+                                            pricing_exists = cursor.fetchone()[0]
+                                        
+                                            if pricing_exists:
+                                                # Update existing pricing
+                                                cursor.execute("""
+                                                    UPDATE RestaurantPricing 
+                                                    SET price_range_id = %s 
+                                                    WHERE restaurant_id = %s
+                                                """, (price_range_id, selected_restaurant_id))
+                                            else:
+                                                # Insert new pricing record
+                                                cursor.execute("""
+                                                    INSERT INTO RestaurantPricing (restaurant_id, price_range_id)
+                                                    VALUES (%s, %s)
+                                                """, (selected_restaurant_id, price_range_id))
+                                    
+                                        connection.commit()
+                                        cursor.close()
+                                        repository.invalidate_after_update(selected_restaurant_id)
+                                        st.success(f"✅ Successfully updated **{new_name}**!")
+                                        st.balloons()
+                                    
+                                    except Error as e:
+                                        connection.rollback()
+                                        st.error(f"❌ Database error: {e}")
+                    
+                        with col2:
+                            # Drop the edited values so the fields show the stored record again
+                            def reset_update_form():
+                                for field in ["name", "street", "zip", "city", "state", "phone",
+                                              "desc", "website", "lat", "lng", "price"]:
+                                    st.session_state.pop(f"update_{field}_{selected_restaurant_id}", None)
+
+                            st.form_submit_button("🔄 Reset Form", on_click=reset_update_form)
+                
+        except Exception as e:
+            st.error(f"❌ Error loading restaurant data: {e}")
+            
+
+    # TAB 6: Bulk Import
+    if section == restaurant_sections[5]:
+        st.subheader("📥 Bulk Import")
+        st.info("ℹ️ Upload a CSV, JSON array or JSON Lines file. Required columns: name, street_address, zip_code. "
+                "Optional: city, state, phone, website, description, latitude, longitude, price_symbol ($ to $$$$) "
+                "and cuisines (separated by commas or semicolons).")
+        upload = st.file_uploader("Restaurants file", type=["csv", "json", "jsonl", "ndjson"])
+        dry_run = st.checkbox("Validate only (write nothing)")
+        if upload is not None and st.button("📥 Import", type="primary"):
+            upload.seek(0)
+            progress = st.progress(0.0, text="Starting import...")
+            report = bulk_import.new_report()
+
+            def show_progress(report):
+                progress.progress(min(upload.tell() / upload.size, 1.0) if upload.size else 1.0,
+                                  text=f"{report['read']} rows read, {report['imported']} "
+                                       f"{'valid' if dry_run else 'imported'}, {report['rejected']} rejected")
+
+            try:
+                bulk_import.import_records(db.get_connection(), bulk_import.read_records(upload, upload.name),
+                                           report, show_progress, dry_run)
+                progress.progress(1.0, text="Done")
+                st.success(f"✅ {report['imported']} restaurant(s) {'valid' if dry_run else 'imported'}, "
+                           f"{report['rejected']} rejected, in {report['seconds']:.1f} s")
+            except (Error, ValueError) as e:
+                st.error(f"❌ Import stopped after {report['imported']} row(s): {e}")
+            if report["imported"] and not dry_run:
+                repository.invalidate_after_add()
+            if report["errors"]:
+                listed = len(report["errors"])
+                label = f"⚠️ {report['rejected']} rejected row(s)"
+                if report["rejected"] > listed:
+                    label += f" (first {listed} listed)"
+                with st.expander(label):
+                    st.dataframe({"Rejected row": report["errors"]}, hide_index=True, use_container_width=True)
@@ -0,0 +1,199 @@
+# ============================================
+# PAGE 5 — MANAGE REVIEWS (NEW SEPARATE PAGE)
+# ============================================
+import streamlit as st
+import pandas as pd
+from mysql.connector import Error
+from services import db, export, profiling, repository, reviews, selection_grid, session, writes
+
+connection = session.connect()
+db_connected = connection is not None
+
+st.header("⭐ Manage Reviews")
+st.markdown("---")
+
+if not db_connected:
+    st.error("Database connection unavailable.")
+else:
+    review_sections = ["📋 View Reviews", "➕ Add Review", "🗑️ Delete Review"]
+    section = st.radio("Section", review_sections, horizontal=True,
+                       label_visibility="collapsed", key="review_section")
+    profiling.begin(section)
+
+    # Result of a write made in a fragment (shown after the full rerun)
+    if "flash" in st.session_state:
+        st.success(st.session_state.pop("flash"))
+    
+# TAB 1: View Reviews
+    if section == review_sections[0]:
+        st.subheader("📋 All Reviews")
+
+        try:
+            reviewed = repository.load_reviewed_restaurants()
+
+            if not reviewed:
+                st.info("No reviews found in the database.")
+            else:
+                # Filter by restaurant
+                restaurant_options = {"All Restaurants": None}
+                restaurant_options.update({name: rid for rid, name in reviewed})
+                restaurant_filter = st.selectbox("Filter by Restaurant:", list(restaurant_options.keys()))
+                restaurant_id = restaurant_options[restaurant_filter]
+
+                # Start over from the newest review when the filter changes
+                if "review_cursors" not in st.session_state or st.session_state.review_filter != restaurant_id:
+                    st.session_state.review_filter = restaurant_id
+                    st.session_state.review_cursors = [None]
+
+                # Rating summary
+                summary = repository.load_rating_summary(restaurant_id)
+                col1, col2 = st.columns([1, 2])
+                with col1:
+                    st.metric("Reviews", summary["count"])
+                    if summary["average"] is not None:
+                        st.metric("Average Rating", f"{summary['average']:.2f} ⭐")
+                with col2:
+                    st.bar_chart(pd.Series({f"{rating} ⭐": count for rating, count in summary["histogram"].items()},
+                                           name="Reviews"))
+                st.caption(f"Download the review history of {restaurant_filter.lower() if restaurant_id is None else restaurant_filter}:")
+                export.download_buttons("reviews", *export.reviews_export(restaurant_id), key="reviews_export")
+
+                st.markdown("---")
+
+                # Keyword search (full-text index, most relevant first) or the
+                # newest-first feed (keyset pages)
+                keywords = st.text_input("🔎 Search review text:", placeholder="e.g. brisket tacos", key="review_keywords")
+                searching = bool(reviews.match_expression(keywords))
+                if searching:
+                    if st.session_state.get("review_search") != (keywords, restaurant_id):
+                        st.session_state.review_search = (keywords, restaurant_id)
+                        st.session_state.review_search_page = 0
+                    search_page = st.session_state.review_search_page
+                    page_df, total = repository.search_reviews(keywords, restaurant_id, search_page)
+                    st.caption(f"{total} review(s) matching \"{keywords}\"")
+                    page_label = f"Page {search_page + 1} of {max((total - 1) // reviews.REVIEW_PAGE_SIZE + 1, 1)}"
+                    has_previous = search_page > 0
+                    has_more = (search_page + 1) * reviews.REVIEW_PAGE_SIZE < total
+                else:
+                    cursors = st.session_state.review_cursors
+                    page_df, has_more = repository.load_review_page(restaurant_id, cursors[-1])
+                    page_label = f"Page {len(cursors)}"
+                    has_previous = len(cursors) > 1
+
+                # Display one page of reviews
+                for _, review in page_df.iterrows():
+                    stars = "⭐" * int(review['rating'])
+                    text = f"\n\n> {review['review_text']}" if pd.notna(review['review_text']) else ""
+                    st.markdown(f"**{review['restaurant_name']}** · {stars} ({review['rating']}/5) · "
+                                f"📅 {review['created_at']}{text}")
+                    st.markdown("---")
+
+                # Previous / Next page
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    if st.button("⬅️ Previous", key="reviews_prev", disabled=not has_previous):
+                        if searching:
+                            st.session_state.review_search_page -= 1
+                        else:
+                            cursors.pop()
+                        st.rerun()
+                with col2:
+                    st.markdown(f"<p style='text-align:center;'>{page_label}</p>", unsafe_allow_html=True)
+                with col3:
+                    if st.button("Next ➡️", key="reviews_next", disabled=not has_more):
+                        if searching:
+                            st.session_state.review_search_page += 1
+                        else:
+                            cursors.append(reviews.page_cursor(page_df))
+                        st.rerun()
+
+        except Exception as e:
+            st.error(f"❌ Error loading reviews: {e}")
+    # TAB 2: Add Review
+    if section == review_sections[1]:
+        st.subheader("➕ Add New Review")
+        try:
+            restaurants = repository.load_active_restaurant_names()
+            
+            if not restaurants:
+                st.warning("No active restaurants available to review.")
+            else:
+                restaurant_options = {name: rid for rid, name in restaurants}
+                # The form only reruns the app when it is submitted (or cleared)
+                with st.form("add_review_form", clear_on_submit=True):
+                    selected_restaurant = st.selectbox("Select Restaurant *", list(restaurant_options.keys()))
+                    selected_restaurant_id = restaurant_options[selected_restaurant]
+
+                    rating = st.slider("Rating *", 1, 5, 5, help="Rate from 1 to 5 stars")
+                    review_text = st.text_area("Review Text", placeholder="Share your experience...", height=150)
+
+                    st.markdown("---")
+                    col1, col2, _ = st.columns([1, 1, 3])
+                    with col1:
+                        submitted = st.form_submit_button("💾 Submit Review", type="primary")
+                    with col2:
+                        st.form_submit_button("Clear Form")
+                if submitted:
+                    try:
+                        writes.add_review(connection, selected_restaurant_id, rating, review_text)
+                        repository.invalidate_after_review_change()
+                        st.success(f"✅ Review submitted successfully for **{selected_restaurant}**!")
+                        st.balloons()
+                    except Error as e:
+                        st.error(f"❌ Database error: {e}")
+        except Exception as e:
+            st.error(f"❌ Error loading form: {e}")
+    
+    # TAB 3: Delete Review
+    if section == review_sections[2]:
+        st.subheader("🗑️ Delete Reviews")
+        st.warning("⚠️ This action cannot be undone!")
+
+        # Selecting and paging rerun only this fragment; deleting reruns the app
+        @session.fragment
+        @profiling.section(review_sections[2])
+        def delete_reviews_section():
+            try:
+                reviews_df = repository.load_reviews()
+
+                if reviews_df.empty:
+                    st.info("No reviews to delete.")
+                    return
+                st.info(f"📊 {len(reviews_df)} reviews available")
+
+                st.markdown("---")
+
+                # Display reviews with checkboxes (Select This Page / Deselect All above them)
+                selected = selection_grid.selection_grid(
+                    reviews_df, "selected_reviews_to_delete", "review_id",
+                    ["restaurant_name", "rating", "created_at", "review_text"],
+                    column_config={"restaurant_name": "Restaurant",
+                                   "rating": st.column_config.NumberColumn("Rating", format="%d ⭐"),
+                                   "created_at": st.column_config.DatetimeColumn("📅 Date"),
+                                   "review_text": "Review"},
+                    select_buttons=True)
+
+                # Delete button
+                st.markdown("---")
+                if len(selected) > 0:
+                    st.error(f"⚠️ {len(selected)} review(s) selected for deletion")
+                    col1, col2, _ = st.columns([1, 1, 3])
+                    with col1:
+                        if st.button("🗑️ Delete Selected", type="primary"):
+                            try:
+                                deleted = writes.delete_reviews(db.get_connection(), selected)
+                                repository.invalidate_after_review_change()
+                                selection_grid.clear_selection("selected_reviews_to_delete")
+                                st.session_state.flash = f"✅ Successfully deleted {deleted} review(s)!"
+                                st.rerun(scope="app")
+                            except Error as e:
+                                st.error(f"❌ Failed to delete: {e}")
+                    with col2:
+                        st.button("Cancel", on_click=selection_grid.clear_selection,
+                                  args=("selected_reviews_to_delete",))
+                else:
+                    st.info("👆 Select reviews above to delete them")
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
+
+        delete_reviews_section()
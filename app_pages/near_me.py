@@ -0,0 +1,83 @@
+# ============================================
+# PAGE 3 — RESTAURANT MAP
+# ============================================
+import streamlit as st
+from streamlit_folium import st_folium
+from services import maps, proximity, repository, session, viewport
+
+db_connected = session.connect_reader()
+
+st.header("🗺️ Find Food Near Me")
+st.markdown("---")
+if not db_connected:
+    st.error("Database connection unavailable.")
+else:
+    # Location input: a typed place/address or manual coordinates
+    with st.expander("📍 Search near a location", expanded=True):
+        location_mode = st.radio("Location", ["Address or place", "Coordinates"], horizontal=True)
+        if location_mode == "Address or place":
+            address = st.text_input("Address or place:", placeholder="e.g., Deep Ellum, Bishop Arts, Love Field")
+        else:
+            col1, col2 = st.columns(2)
+            with col1: near_lat = st.number_input("Latitude", value=32.7767, format="%.6f", key="near_lat")
+            with col2: near_lng = st.number_input("Longitude", value=-96.7970, format="%.6f", key="near_lng")
+        search_mode = st.radio("Show", ["Within a radius", "Closest restaurants"], horizontal=True)
+        if search_mode == "Within a radius":
+            radius_mi = st.slider("Radius (miles)", 0.5, 20.0, 2.0, step=0.5)
+            k = None
+        else:
+            k = st.slider("Number of restaurants", 1, 50, 10)
+            radius_mi = None
+        col1, col2, _ = st.columns([1, 1, 3])
+        with col1:
+            if st.button("📍 Find Nearby"):
+                point = proximity.geocode(address) if location_mode == "Address or place" else (near_lat, near_lng)
+                if point is None:
+                    st.error("❌ Location not found. Try a Dallas neighborhood or enter coordinates.")
+                else:
+                    st.session_state.near_point = point
+        with col2:
+            if st.button("🗺️ Show All"):
+                st.session_state.pop("near_point", None)
+
+    try:
+        near_point = st.session_state.get("near_point")
+        if near_point:
+            if proximity.PROXIMITY_SOURCE == "sql":
+                df = repository.find_restaurants_near(*near_point, radius_mi=radius_mi, k=k)
+            else:
+                df = repository.find_restaurants_nearby(*near_point, radius_mi=radius_mi, k=k)
+            if df.empty:
+                st.warning("No active restaurants found near this location")
+            else:
+                df = repository.with_ratings(df)
+                # Marker style is picked from the row count
+                m = maps.get_restaurant_map(df, near_point)
+                st_folium(m, height=600, width=None)
+                st.success(f"Found {len(df)} active restaurants near you!")
+                nearby = df.assign(distance_mi=df["distance_mi"].round(2))
+                st.dataframe(nearby[["name", "price_symbol", "distance_mi"]], use_container_width=True, hide_index=True)
+        else:
+            # Browse mode: load only the tiles covering the visible map area.
+            # st_folium stores its last bounds/zoom under its key, so panning
+            # reruns the page and fetches just the tiles that came into view.
+            map_state = st.session_state.get("viewport_map") or {}
+            bounds = viewport.bounds_from_map_state(map_state) or viewport.estimate_bounds()
+            tiles = viewport.tiles_for_bounds(bounds, map_state.get("zoom") or viewport.DEFAULT_ZOOM)
+            df, truncated = repository.load_viewport_restaurants(tiles)
+            df = repository.with_ratings(df)
+            st_folium(maps.get_base_map(viewport.DEFAULT_CENTER, viewport.DEFAULT_ZOOM), key="viewport_map",
+                      feature_group_to_add=maps.build_viewport_layer(df),
+                      returned_objects=["bounds", "zoom"], height=600, width=None)
+            if df.empty:
+                st.warning("No active restaurants in this area. Pan or zoom out to see more.")
+            else:
+                st.success(f"Mapped {len(df)} active restaurants in view!")
+            if truncated:
+                st.info("ℹ️ Some areas have more restaurants than shown. Zoom in to see them all.")
+        st.markdown("""**Marker Color Key (Price Ranges):**  
+            - Light Blue: $ (Budget-friendly)  
+            - Blue: $$ (Moderate)  
+            - Dark Blue: $$$ (Upscale)""")
+    except Exception as e:
+        st.error(f"Map query failed: {e}")
@@ -0,0 +1,101 @@
+# ============================================
+# PAGE 2 — RESTAURANT SEARCH
+# ============================================
+import streamlit as st
+from services import export, profiling, repository, search, session
+
+db_connected = session.connect_reader()
+
+st.header("📋 Restaurant Search")
+st.markdown("---")
+if not db_connected:
+    st.error("Database connection unavailable.")
+else:
+    # Filtering and paging rerun only this fragment (the search-as-you-type
+    # box commits after every typing pause)
+    @session.fragment
+    @profiling.section("Restaurant Search")
+    def search_section():
+        try:
+            if "filter_price" not in st.session_state: st.session_state.filter_price = "All"
+            if "filter_name" not in st.session_state: st.session_state.filter_name = ""
+            if "filter_cuisines" not in st.session_state: st.session_state.filter_cuisines = []
+            if "search_page" not in st.session_state: st.session_state.search_page = 0
+
+            st.markdown("### Filter Options")
+            live_search = st.toggle("⚡ Search as you type (typo-tolerant)", key="search_live")
+            # Typo-tolerant name matching runs on the cached in-memory index
+            use_index = live_search or search.SEARCH_BACKEND == "memory"
+            col1, col2 = st.columns([2, 2])
+            with col1:
+                name_input = st.text_input("Restaurant Name:", value=st.session_state.filter_name,
+                                           placeholder="Enter part of a name", live="200ms" if live_search else False)
+            with col2:
+                price_options = ["All", "$", "$$", "$$$"]
+                selected_price = st.selectbox("Price Range:", options=price_options, index=price_options.index(st.session_state.filter_price))
+                if use_index:
+                    search_index = repository.load_search_index()
+                    all_cuisines = search_index["cuisine_index"]["cuisines"]
+                else:
+                    all_cuisines = repository.load_cuisine_names()
+                selected_cuisines = st.multiselect("Cuisine Type(s):", options=all_cuisines, default=st.session_state.filter_cuisines)
+
+            st.session_state.filter_name = name_input
+            st.session_state.filter_price = selected_price
+            st.session_state.filter_cuisines = selected_cuisines
+
+            # Filters are applied in SQL (or on the cached frame with the
+            # trigram name index); only the current page of results is fetched
+            criteria = (name_input, selected_price, tuple(selected_cuisines))
+            if live_search:
+                if st.session_state.get("search_criteria") != criteria:
+                    st.session_state.search_criteria = criteria
+                    st.session_state.search_page = 0
+            elif st.button("🔍 Get Results"):
+                st.session_state.search_criteria = criteria
+                st.session_state.search_page = 0
+
+            if "search_criteria" in st.session_state:
+                if use_index:
+                    results_df, total = search.filter_restaurants(search_index["restaurants"], search_index["cuisine_index"],
+                                                                  *st.session_state.search_criteria,
+                                                                  page=st.session_state.search_page,
+                                                                  name_index=search_index["name_index"], prefix=live_search)
+                else:
+                    results_df, total = repository.search_restaurants(*st.session_state.search_criteria,
+                                                                      page=st.session_state.search_page)
+                if total > 0:
+                    page_count = (total - 1) // search.PAGE_SIZE + 1
+                    st.success(f"✅ Found {total} restaurant(s) matching your criteria")
+                    results_df = repository.with_descriptions(repository.with_ratings(results_df))
+                    st.dataframe(results_df[["name", "avg_rating", "review_count", "description", "website"]],
+                                 use_container_width=True,
+                                 column_config={"avg_rating": st.column_config.NumberColumn("Rating", format="%.1f ⭐"),
+                                                "review_count": "Reviews"})
+                    col1, col2, col3 = st.columns([1, 2, 1])
+                    with col1:
+                        if st.button("⬅️ Previous", disabled=st.session_state.search_page == 0):
+                            st.session_state.search_page -= 1
+                            st.rerun(scope="fragment")
+                    with col2:
+                        st.markdown(f"<p style='text-align:center;'>Page {st.session_state.search_page + 1} of {page_count}</p>",
+                                    unsafe_allow_html=True)
+                    with col3:
+                        if st.button("Next ➡️", disabled=st.session_state.search_page >= page_count - 1):
+                            st.session_state.search_page += 1
+                            st.rerun(scope="fragment")
+                    # All matching restaurants, not just this page; the export
+                    # applies the filters in SQL, where the name is a substring
+                    # match (not typo-tolerant like the index search)
+                    fuzzy_name = use_index and st.session_state.search_criteria[0]
+                    st.caption("Download all results (the download keeps names containing the text as typed, "
+                               "so it can differ from the typo-tolerant results above):" if fuzzy_name else
+                               f"Download all {total} result(s):")
+                    export.download_buttons("restaurant_search", *export.search_export(*st.session_state.search_criteria),
+                                            key="search_export")
+                else:
+                    st.warning("⚠️ No restaurants found. Try adjusting your filters.")
+        except Exception as e:
+            st.error(f"❌ Query failed: {e}")
+
+    search_section()
@@ -0,0 +1,4 @@
+# ============================================
+# Benchmarks for the Dallas Restaurants app
+# ============================================
+# Run a benchmark with:  python -m benchmarks.<name>
@@ -0,0 +1,279 @@
+# ============================================
+# Benchmark suite: timed app scenarios over a stand-in database
+# ============================================
+# Generates (or reuses) a seeded stand-in (benchmarks/standin.py) at the
+# requested scale, runs streamlit_app.py headless with AppTest against it and
+# times every step of each scenario:
+#   search   open Restaurant Search, filter by name, then also by cuisine
+#   map      open Find Food Near Me (viewport map), closest restaurants to a point
+#   archive  open Manage Restaurants, archive N restaurants (restored afterwards)
+#   reviews  open Manage Reviews, next page, keyword search
+# Each scenario runs in its own interpreter, --repeat times in a fresh
+# session: the first run starts with empty caches (cold), the others reuse
+# them (warm). Results are written as JSON; --compare reports the steps whose
+# warm median got slower than in an earlier result file (exit status 1 if any
+# did; the cold time is a single sample, so it is shown but not checked).
+#
+#   python -m benchmarks.bench_app --restaurants 100000 --reviews 500000 --output results.json
+#   python -m benchmarks.bench_app --compare baseline.json
+#   BENCH_MYSQL_HOST=127.0.0.1 python -m benchmarks.bench_app --mysql
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import standin
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ["search", "map", "archive", "reviews"]
+TIMEOUT_SECONDS = 600
+NAME_QUERY = "grill"
+REVIEW_QUERY = "brisket"
+# Settings that change which code paths the scenarios measure
+RECORDED_SETTINGS = ["READ_SOURCE", "SEARCH_BACKEND", "PROXIMITY_SOURCE", "SEARCH_PAGE_SIZE",
+                     "SELECTION_PAGE_SIZE", "REVIEW_PAGE_SIZE", "MAP_MARKER_LIMIT", "COMPACT_DTYPES"]
+# Slower by less than this is noise, whatever the ratio
+NOISE_MS = 5
+
+
+# --------------------------------------------
+# Scenarios (run in the child interpreter)
+# --------------------------------------------
+def _button(at, label):
+    return next(button for button in at.button if label in button.label)
+
+
+def _radio(at, label):
+    return next(radio for radio in at.radio if radio.label == label)
+
+
+# Run the app after `action` (a widget change or click) and record the
+# elapsed time, the queries of that rerun and any errors shown
+def timed_run(at, steps, step, action=None):
+    from services import db
+
+    start = time.perf_counter()
+    (action() if action else at).run()
+    elapsed = (time.perf_counter() - start) * 1000
+    queries = at.session_state[db._COUNT_KEY] if db._COUNT_KEY in at.session_state else 0
+    errors = [str(element.value) for element in list(at.exception) + list(at.error)]
+    steps.append({"step": step, "ms": elapsed, "queries": queries, "errors": errors})
+
+
+def search_scenario(at, context, steps):
+    timed_run(at, steps, "open", lambda: at.switch_page("app_pages/restaurant_search.py"))
+    at.text_input[0].set_value(NAME_QUERY)
+    timed_run(at, steps, "filter_name", lambda: _button(at, "Get Results").click())
+    at.multiselect[0].select(at.multiselect[0].options[0])
+    timed_run(at, steps, "filter_cuisine", lambda: _button(at, "Get Results").click())
+
+
+def map_scenario(at, context, steps):
+    timed_run(at, steps, "open", lambda: at.switch_page("app_pages/near_me.py"))
+    _radio(at, "Location").set_value("Coordinates")
+    _radio(at, "Show").set_value("Closest restaurants").run()
+    timed_run(at, steps, "closest", lambda: _button(at, "Find Nearby").click())
+
+
+def archive_scenario(at, context, steps):
+    ids = context["archive_ids"]
+    timed_run(at, steps, "open", lambda: at.switch_page("app_pages/manage_restaurants.py"))
+    at.session_state["selected_to_archive"] = set(ids)
+    at.run()
+    timed_run(at, steps, f"archive_{len(ids)}", lambda: _button(at, "Archive Selected").click())
+    # Put them back (untimed) so every run and scenario sees the same data
+    at.radio(key="restaurant_section").set_value("Restore Archived").run()
+    at.session_state["selected_to_restore"] = set(ids)
+    at.run()
+    _button(at, "Restore Selected").click().run()
+
+
+def reviews_scenario(at, context, steps):
+    timed_run(at, steps, "open", lambda: at.switch_page("app_pages/manage_reviews.py"))
+    timed_run(at, steps, "next_page", lambda: at.button(key="reviews_next").click())
+    timed_run(at, steps, "keyword_search", lambda: at.text_input(key="review_keywords").input(REVIEW_QUERY))
+
+
+SCENARIO_FUNCTIONS = {"search": search_scenario, "map": map_scenario,
+                      "archive": archive_scenario, "reviews": reviews_scenario}
+
+
+# Ids of the first n active restaurants (the archive scenario's selection)
+def active_ids(n):
+    from services import db
+
+    connection = db.open_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT restaurant_id FROM Restaurants WHERE is_active = TRUE "
+                       "ORDER BY restaurant_id LIMIT %s", (n,))
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+# Child process: run one scenario `repeat` times and print its steps as JSON
+def run_scenario(name, repeat, archive_count):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    context = {"archive_ids": active_ids(archive_count) if name == "archive" else []}
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    runs = []
+    for _ in range(repeat):
+        at = AppTest.from_file(os.path.join(APP_DIR, "streamlit_app.py"), default_timeout=TIMEOUT_SECONDS).run()
+        steps = []
+        SCENARIO_FUNCTIONS[name](at, context, steps)
+        runs.append(steps)
+    print(json.dumps(runs))
+
+
+# --------------------------------------------
+# Parent: data set, child runs, JSON results
+# --------------------------------------------
+# cold = first run, warm = median (and range) of the others, per step
+def summarize(runs):
+    summary = {}
+    for position, first in enumerate(runs[0]):
+        warm = [run[position]["ms"] for run in runs[1:]] or [first["ms"]]
+        summary[first["step"]] = {
+            "cold_ms": round(first["ms"], 2),
+            "warm_ms": round(statistics.median(warm), 2),
+            "warm_min_ms": round(min(warm), 2),
+            "warm_max_ms": round(max(warm), 2),
+            "cold_queries": first["queries"],
+            "warm_queries": runs[-1][position]["queries"],
+            "errors": sorted({error for run in runs for error in run[position]["errors"]}),
+        }
+    return summary
+
+
+def run_child(name, args, env):
+    command = [sys.executable, "-m", "benchmarks.bench_app", "--run-scenario", name,
+               "--repeat", str(args.repeat), "--archive", str(args.archive)]
+    result = subprocess.run(command, cwd=APP_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"{name} failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+# Point the children at the stand-in: a working copy of the SQLite file
+# (archiving writes to it), or the BENCH_MYSQL_* database, loaded if empty
+def prepare_backend(args, env):
+    if args.mysql:
+        import mysql.connector
+
+        config = standin.mysql_config()
+        connection = mysql.connector.connect(**config)
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT COUNT(*) FROM Restaurants")
+                loaded = cursor.fetchone()[0] > 0
+            except mysql.connector.Error:
+                loaded = False
+            cursor.close()
+            if not loaded:
+                standin.load_mysql(connection, args.restaurants, args.reviews, args.seed)
+        finally:
+            connection.close()
+        env.update(DB_BACKEND="mysql", DB_HOST=config["host"], DB_PORT=str(config["port"]),
+                   DB_USER=config["user"], DB_PASSWORD=config["password"], DB_NAME=config["database"])
+        return f"mysql {config['host']}/{config['database']}"
+    work = os.path.join(tempfile.gettempdir(), "group02_bench_app.db")
+    shutil.copyfile(standin.standin_path(args.restaurants, args.reviews, args.seed), work)
+    env.update(DB_BACKEND="sqlite", DB_SQLITE_PATH=work)
+    return "sqlite"
+
+
+def metadata(args, backend):
+    import pandas as pd
+    import streamlit as st
+
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, capture_output=True, text=True)
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit.stdout.strip() or None,
+        "python": platform.python_version(),
+        "streamlit": st.__version__,
+        "pandas": pd.__version__,
+        "backend": backend,
+        "dataset": {"restaurants": args.restaurants, "reviews": args.reviews, "seed": args.seed},
+        "repeat": args.repeat,
+        "settings": {name: os.environ[name] for name in RECORDED_SETTINGS if name in os.environ},
+    }
+
+
+# Steps whose warm median is slower than in the baseline by more than
+# `threshold` (a fraction)
+def compare(baseline, current, threshold):
+    regressions = []
+    for scenario, steps in current["results"].items():
+        for step, result in steps.items():
+            before = baseline["results"].get(scenario, {}).get(step)
+            if before is None:
+                continue
+            change = result["warm_ms"] / before["warm_ms"] - 1 if before["warm_ms"] else 0
+            slower = change > threshold and result["warm_ms"] - before["warm_ms"] > NOISE_MS
+            print(f"  {scenario}/{step}: warm {before['warm_ms']:9.1f} -> {result['warm_ms']:9.1f} ms ({change:+.0%}), "
+                  f"cold {before['cold_ms']:9.1f} -> {result['cold_ms']:9.1f} ms{'  REGRESSION' if slower else ''}")
+            if slower:
+                regressions.append(f"{scenario}/{step}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restaurants", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="repeatable; default: all")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--archive", type=int, default=100, help="restaurants archived by the archive scenario")
+    parser.add_argument("--mysql", action="store_true", help="run against the BENCH_MYSQL_* database")
+    parser.add_argument("--output", default="bench_app_results.json")
+    parser.add_argument("--compare", help="earlier result file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown reported as a regression")
+    parser.add_argument("--run-scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        run_scenario(args.run_scenario, args.repeat, args.archive)
+        return
+
+    env = dict(os.environ)
+    backend = prepare_backend(args, env)
+    report = metadata(args, backend)
+    report["results"] = {}
+    print(f"{args.restaurants} restaurants, {args.reviews} reviews on {backend} ({args.repeat} runs per scenario; "
+          f"queries per rerun cold / warm)")
+    for name in args.scenario or SCENARIOS:
+        report["results"][name] = summarize(run_child(name, args, env))
+        for step, result in report["results"][name].items():
+            print(f"  {name:8} {step:15} cold {result['cold_ms']:9.1f} ms  warm {result['warm_ms']:9.1f} ms  "
+                  f"queries {result['cold_queries']:3} / {result['warm_queries']:3}{'  ERRORS: ' + '; '.join(result['errors']) if result['errors'] else ''}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare} ({baseline.get('commit')}, {baseline['dataset']}):")
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ============================================
+# Benchmark: connect-per-rerun vs pooled connection reuse
+# ============================================
+# Simulates script reruns (get connection -> Restaurant Search query -> release)
+# and reports reruns per second for the old pattern (connect/close every rerun)
+# and the pooled pattern used by services/db.py.
+#
+#   python -m benchmarks.bench_connection                 # SQLite stand-in
+#   BENCH_MYSQL_HOST=127.0.0.1 BENCH_MYSQL_USER=root \
+#   BENCH_MYSQL_PASSWORD=... BENCH_MYSQL_DB=group02 python -m benchmarks.bench_connection
+
+import argparse
+import os
+import queue
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.standin import build_standin, mysql_config
+
+QUERY = """
+    SELECT r.restaurant_id, r.name, pr.price_symbol
+    FROM Restaurants r
+    LEFT JOIN RestaurantPricing rp ON r.restaurant_id = rp.restaurant_id
+    LEFT JOIN PriceRanges pr ON rp.price_range_id = pr.price_range_id
+    WHERE r.is_active = TRUE
+    LIMIT 50
+"""
+
+
+# Run n reruns and return reruns per second
+def run_reruns(acquire, release, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        conn = acquire()
+        cursor = conn.cursor()
+        cursor.execute(QUERY)
+        cursor.fetchall()
+        cursor.close()
+        release(conn)
+    return n / (time.perf_counter() - start)
+
+
+def mysql_patterns(pool_size):
+    import mysql.connector
+    from mysql.connector.pooling import MySQLConnectionPool
+
+    config = mysql_config()
+    pool = MySQLConnectionPool(pool_name="bench_pool", pool_size=pool_size, **config)
+    before = (lambda: mysql.connector.connect(**config), lambda conn: conn.close())
+    after = (pool.get_connection, lambda conn: conn.close())
+    return "MySQL " + config["host"], before, after
+
+
+def sqlite_patterns(pool_size):
+    path = os.path.join(tempfile.gettempdir(), "group02_bench_connection.db")
+    build_standin(path).close()
+    pool = queue.Queue()
+    for _ in range(pool_size):
+        pool.put(sqlite3.connect(path, check_same_thread=False))
+    before = (lambda: sqlite3.connect(path), lambda conn: conn.close())
+    after = (pool.get, pool.put)
+    return "SQLite stand-in " + path, before, after
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=5)
+    args = parser.parse_args()
+
+    patterns = mysql_patterns if os.environ.get("BENCH_MYSQL_HOST") else sqlite_patterns
+    label, before, after = patterns(args.pool_size)
+    print(f"Backend: {label} ({args.reruns} reruns)")
+    slow = run_reruns(*before, args.reruns)
+    fast = run_reruns(*after, args.reruns)
+    print(f"  connect per rerun : {slow:10.1f} reruns/s")
+    print(f"  pooled reuse      : {fast:10.1f} reruns/s")
+    print(f"  speedup           : {fast / slow:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
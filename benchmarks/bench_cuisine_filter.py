@@ -0,0 +1,65 @@
+# ============================================
+# Benchmark: per-row apply vs cuisine membership matrix
+# ============================================
+# Compares the original cuisine filter (split the GROUP_CONCAT string per row
+# with apply) and option list (split/explode/unique) against the boolean
+# matrix from services/search.build_cuisine_index.
+#
+#   python -m benchmarks.bench_cuisine_filter [--rows 100000]
+
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.standin import CUISINES
+from services import search
+
+SELECTED = ["BBQ", "Thai", "Vegan"]
+
+
+def synthetic_cuisines(rows, seed=2025):
+    rng = random.Random(seed)
+    values = [",".join(rng.sample(CUISINES, rng.randint(1, 3))) for _ in range(rows)]
+    for i in range(0, rows, 50):
+        values[i] = None
+    return pd.Series(values, name="cuisines")
+
+
+# Median milliseconds of fn() over repeat runs
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2] * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    cuisines = synthetic_cuisines(args.rows)
+    apply_ms, apply_mask = timed(lambda: cuisines.apply(
+        lambda x: any(c in x.split(",") for c in SELECTED) if pd.notna(x) else False).to_numpy(), args.repeat)
+    options_ms, options = timed(lambda: sorted(cuisines.dropna().str.split(",").explode().unique()), args.repeat)
+    build_ms, index = timed(lambda: search.build_cuisine_index(cuisines), args.repeat)
+    mask_ms, index_mask = timed(lambda: search.cuisine_mask(index, SELECTED), args.repeat)
+
+    assert np.array_equal(apply_mask, index_mask)
+    assert options == index["cuisines"]
+    print(f"{args.rows} rows, filter on {SELECTED}")
+    print(f"  apply filter (per click)       : {apply_ms:8.2f} ms")
+    print(f"  option list (per rerun)        : {options_ms:8.2f} ms")
+    print(f"  build index (per data refresh) : {build_ms:8.2f} ms")
+    print(f"  matrix filter (per click)      : {mask_ms:8.2f} ms  ({apply_ms / mask_ms:.0f}x faster)")
+    print(f"  option list from index         :     free")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ============================================
+# Benchmark: chunked export vs read_sql into a DataFrame
+# ============================================
+# Exports the status overview and the review history of a stand-in twice,
+# each run in a fresh interpreter:
+#   dataframe  pd.read_sql of the whole result, then DataFrame.to_csv / to_parquet
+#   chunked    services/export.py (unbuffered cursor, fetchmany, streamed writer)
+# and reports time and the peak memory the export added to the process.
+#
+#   python -m benchmarks.bench_export --restaurants 100000 --reviews 300000
+#   python -m benchmarks.bench_export --format parquet
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import standin
+
+EXPORTS = ["status", "reviews"]
+METHODS = ["dataframe", "chunked"]
+
+
+# Peak resident memory of this process, in MB
+def peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# Child process: one export with one method; prints seconds and added peak MB
+def run_one(method, what, file_format):
+    import pandas as pd
+    import pyarrow.parquet  # noqa: F401 (imported before the baseline, like pandas)
+    from services import db, export
+
+    query, params, columns = export.status_export() if what == "status" else export.reviews_export()
+    path = os.path.join(tempfile.gettempdir(), f"group02_bench_export_{what}.{file_format}")
+    baseline = peak_mb()
+    start = time.perf_counter()
+    with open(path, "wb") as out:
+        if method == "chunked":
+            export.export(query, params, columns, out, file_format)
+        else:
+            connection = db.open_connection()
+            frame = pd.read_sql(query.replace("%s", "?"), connection._connection, params=params)
+            connection.close()
+            frame.to_parquet(out) if file_format == "parquet" else frame.to_csv(out, index=False)
+    print(json.dumps({"seconds": time.perf_counter() - start, "peak_mb": peak_mb() - baseline,
+                      "file_mb": os.path.getsize(path) / 1e6}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restaurants", type=int, default=100000)
+    parser.add_argument("--reviews", type=int, default=300000)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--run", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_one(*args.run, args.format)
+        return
+
+    env = dict(os.environ, DB_BACKEND="sqlite",
+               DB_SQLITE_PATH=standin.standin_path(args.restaurants, args.reviews, args.seed))
+    print(f"{args.restaurants} restaurants, {args.reviews} reviews, {args.format}")
+    for what in EXPORTS:
+        for method in METHODS:
+            result = subprocess.run([sys.executable, "-m", "benchmarks.bench_export", "--run", method, what,
+                                     "--format", args.format], env=env, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise SystemExit(result.stderr[-2000:])
+            measured = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f"  {what:8} {method:10} {measured['seconds']:6.2f} s  peak +{measured['peak_mb']:7.1f} MB  "
+                  f"file {measured['file_mb']:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
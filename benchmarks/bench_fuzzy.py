@@ -0,0 +1,59 @@
+# ============================================
+# Benchmark: substring scan vs trigram index for name search
+# ============================================
+# Compares the old name filter (str.contains over every row per click) with
+# services/trigram.py on synthetic restaurant names and descriptions, for
+# exact, typo'd and as-you-type (prefix) queries.
+#
+#   python -m benchmarks.bench_fuzzy [--rows 100000]
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from benchmarks.standin import NOUNS, WORDS
+from services import trigram
+
+SYLLABLES = ["ma", "ri", "lo", "ta", "ne", "ko", "sa", "vi", "do", "ra", "chi", "bel", "mon", "tor", "lu"]
+QUERIES = [("exact", "pizzeria", False), ("typo", "pizzzeria", False),
+           ("two words", "smoky grill", False), ("prefix", "smok", True)]
+
+
+def synthetic_restaurants(rows, seed=2025):
+    rng = random.Random(seed)
+    owners = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title() for _ in range(rows)]
+    names = [f"{owner}'s {rng.choice(WORDS)} {rng.choice(NOUNS)}" for owner in owners]
+    descriptions = [f"{rng.choice(NOUNS)} in {rng.choice(WORDS)} run by the {owner} family" for owner in owners]
+    return pd.Series(names), pd.Series(descriptions)
+
+
+# Median milliseconds of fn() over repeat runs
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2] * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=21)
+    args = parser.parse_args()
+
+    names, descriptions = synthetic_restaurants(args.rows)
+    build_ms, index = timed(lambda: trigram.build_trigram_index(names, descriptions), 3)
+    print(f"{args.rows} restaurants, index built in {build_ms:.0f} ms (once per data refresh)")
+    for label, query, prefix in QUERIES:
+        scan_ms, scan = timed(lambda: names.str.contains(query, case=False, regex=False).sum(), args.repeat)
+        index_ms, (rows, _) = timed(lambda: trigram.search(index, query, prefix=prefix), args.repeat)
+        print(f"  {label:10} {query!r:14} str.contains: {scan_ms:7.2f} ms, {scan:6} hits | "
+              f"trigram: {index_ms:6.3f} ms, {len(rows):6} hits, top: {names.iloc[rows[0]] if len(rows) else '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# ============================================
+# Benchmark: bulk restaurant import vs one INSERT per restaurant
+# ============================================
+# Writes N seeded restaurants (benchmarks/standin.py rows, with price symbol
+# and cuisine names) to a CSV, JSON or JSON Lines file, then imports it into
+# a fresh copy of a small stand-in:
+#   form    one INSERT + commit per restaurant, like "Add New Restaurant"
+#           (timed on the first FORM_ROWS rows only, then extrapolated)
+#   import  services/bulk_import.py: streamed, validated, multi-row INSERTs
+#           in IMPORT_BATCH_ROWS transactions
+#
+#   python -m benchmarks.bench_import --rows 50000 [--format json]
+#   BENCH_MYSQL_HOST=127.0.0.1 python -m benchmarks.bench_import --mysql
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks import standin
+from services import bulk_import, sqlite_backend
+
+FORM_ROWS = 1000
+FIELDS = ["name", "street_address", "city", "state", "zip_code", "phone", "website", "description",
+          "latitude", "longitude", "price_symbol", "cuisines"]
+
+
+# Seeded restaurant records as the import reads them
+def records(n):
+    for restaurants, pricing, cuisines in standin.restaurant_chunks(n):
+        prices = dict(pricing)
+        names = {}
+        for restaurant_id, cuisine_id in cuisines:
+            names.setdefault(restaurant_id, []).append(standin.CUISINES[cuisine_id - 1])
+        for row in restaurants:
+            record = dict(zip(standin.RESTAURANT_COLUMNS[1:11], row[1:11]))
+            record["price_symbol"] = standin.PRICES[prices[row[0]] - 1][0]
+            record["cuisines"] = ", ".join(names[row[0]])
+            yield record
+
+
+def write_file(n, file_format):
+    path = os.path.join(tempfile.gettempdir(), f"group02_import_{n}.{file_format}")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            writer = csv.DictWriter(f, FIELDS)
+            writer.writeheader()
+            writer.writerows(records(n))
+        elif file_format == "json":
+            f.write("[\n" + ",\n".join(json.dumps(record) for record in records(n)) + "\n]\n")
+        else:
+            f.writelines(json.dumps(record) + "\n" for record in records(n))
+    return path
+
+
+# One INSERT and commit per restaurant (the form's write path)
+def form_inserts(connection, path, limit):
+    cursor = connection.cursor()
+    with open(path, "rb") as f:
+        for number, (_, record) in enumerate(bulk_import.read_records(f, path)):
+            if number == limit:
+                break
+            cursor.execute("""
+                INSERT INTO Restaurants (name, street_address, city, state, zip_code, phone,
+                                         website, description, latitude, longitude, is_active, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, TRUE, CURRENT_TIMESTAMP)
+            """, [record.get(column) or None for column in bulk_import.INSERT_COLUMNS])
+            connection.commit()
+    cursor.close()
+    return number
+
+
+def bulk(connection, path):
+    report = bulk_import.new_report()
+    with open(path, "rb") as f:
+        bulk_import.import_records(connection, bulk_import.read_records(f, path), report)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--format", choices=["csv", "json", "jsonl"], default="csv")
+    parser.add_argument("--mysql", action="store_true", help="import into the BENCH_MYSQL_* database (adds rows)")
+    args = parser.parse_args()
+
+    path = write_file(args.rows, args.format)
+    print(f"{args.rows} restaurants in {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    if args.mysql:
+        import mysql.connector
+        connect = lambda: mysql.connector.connect(**standin.mysql_config())
+    else:
+        work = os.path.join(tempfile.gettempdir(), "group02_bench_import.db")
+        shutil.copyfile(standin.standin_path(1000, 0), work)
+        connect = lambda: sqlite_backend.connect(work)
+
+    connection = connect()
+    start = time.perf_counter()
+    rows = form_inserts(connection, path, FORM_ROWS)
+    form_seconds = (time.perf_counter() - start) / rows * args.rows
+    connection.close()
+    print(f"  form    {form_seconds:8.2f} s (extrapolated from {rows} rows)")
+
+    connection = connect()
+    report = bulk(connection, path)
+    connection.close()
+    print(f"  import  {report['seconds']:8.2f} s ({report['imported']} imported, {report['rejected']} rejected, "
+          f"{report['imported'] / report['seconds']:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# ============================================
+# Benchmark: map render time and payload size per rendering mode
+# ============================================
+# Builds the Find Food Near Me map with services/maps.py at 1k, 10k and 100k
+# synthetic restaurants and reports build + HTML render time and the size of
+# the HTML shipped to the browser. The per-row marker mode is skipped above
+# --marker-max rows because it does not finish in reasonable time.
+#
+#   python -m benchmarks.bench_map [--sizes 1000 10000 100000]
+
+import argparse
+import random
+import time
+import warnings
+
+import pandas as pd
+
+from benchmarks.standin import PRICES
+from services import maps
+
+
+def synthetic_points(rows, seed=2025):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        "name": [f"Restaurant #{i}" for i in range(rows)],
+        "latitude": [32.7767 + rng.uniform(-0.25, 0.25) for _ in range(rows)],
+        "longitude": [-96.7970 + rng.uniform(-0.3, 0.3) for _ in range(rows)],
+        "price_symbol": [rng.choice(PRICES)[0] for _ in range(rows)],
+    })
+
+
+def main():
+    warnings.filterwarnings("ignore", message="CartoDB tiles")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--marker-max", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>7} {'mode':<8} {'auto':<5} {'build ms':>9} {'render ms':>10} {'payload MB':>11}")
+    for rows in args.sizes:
+        points = synthetic_points(rows)
+        auto = maps.choose_mode(rows)
+        for mode in ["markers", "canvas", "cluster"]:
+            if mode == "markers" and rows > args.marker_max:
+                continue
+            start = time.perf_counter()
+            m = maps.build_map(points, mode)
+            built = time.perf_counter()
+            html = m.get_root().render()
+            rendered = time.perf_counter()
+            print(f"{rows:>7} {mode:<8} {'*' if mode == auto else '':<5} {(built - start) * 1000:>9.0f} "
+                  f"{(rendered - built) * 1000:>10.0f} {len(html.encode()) / 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
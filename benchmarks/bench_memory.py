@@ -0,0 +1,143 @@
+# ============================================
+# Benchmark: memory of the cached frames, before and after compaction
+# ============================================
+# Loads the frames the app keeps for a stand-in and reports their size, each
+# layout in a fresh interpreter:
+#   before  inferred dtypes (COMPACT_DTYPES=0), descriptions in the restaurant
+#           table, listings filtered out of it on every rerun, the reviews
+#           frame copied to every rerun (st.cache_data)
+#   after   compact dtypes, descriptions read for the page on screen, listings
+#           built once per table version and shared (copy-on-write views)
+# "shared" frames are held once per server; "per rerun" is what one rerun of
+# each page allocates (measured: numpy/Python allocations plus Arrow's pool),
+# and a session holds one rerun's frames per open page.
+#
+#   python -m benchmarks.bench_memory --restaurants 100000 --reviews 300000 --sessions 10
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tracemalloc
+import warnings
+
+from benchmarks import standin
+
+LAYOUTS = ["before", "after"]
+SHARED = ["restaurant table", "search listing", "shared listings", "rating lookup", "reviews"]
+PAGES = ["archive tab", "status tab", "map", "search page", "delete reviews"]
+
+
+# Bytes allocated by fn() that are still held by its result
+def allocated(fn):
+    import pyarrow as pa
+
+    tracemalloc.start()
+    arrow = pa.total_allocated_bytes()
+    result = fn()
+    held = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes() - arrow
+    tracemalloc.stop()
+    del result
+    return held
+
+
+# Child process: sizes of one layout, printed as JSON
+def run_one(layout):
+    warnings.filterwarnings("ignore")
+    from services import frames, repository, search
+
+    frame, _ = repository._restaurants()
+    index = repository.load_search_index()
+    ratings = repository.load_rating_lookup()
+    reviews = repository.load_reviews()
+    columns = repository.LISTING_COLUMNS + ["description"]
+    page = slice(0, search.PAGE_SIZE)
+
+    if layout == "before":
+        # The loaders as they were: the table with descriptions, listings
+        # filtered per call, the reviews unpickled for every rerun
+        descriptions = dict(repository._read_rows("SELECT restaurant_id, description FROM Restaurants"))
+        frame = frame.assign(description=frame["restaurant_id"].map(descriptions))
+        active = lambda: frame.loc[frame["is_active"] == 1, columns].reset_index(drop=True)
+        listing = active()
+        shared = {"restaurant table": frame, "search listing": listing, "shared listings": None}
+        reruns = {
+            "archive tab": active,
+            "status tab": lambda: frame[columns].sort_values("is_active", ascending=False, kind="stable")
+            .reset_index(drop=True),
+            "map": lambda: frame.loc[(frame["is_active"] == 1) & frame["latitude"].notna(),
+                                     ["restaurant_id", "name", "latitude", "longitude", "price_symbol"]]
+            .reset_index(drop=True),
+            "search page": lambda: repository.with_ratings(listing.iloc[page]),
+            "delete reviews": lambda: pickle.loads(pickle.dumps(reviews)),
+        }
+    else:
+        listing = index["restaurants"]
+        status, on_map = repository.load_restaurant_status(), repository.load_map_restaurants()
+        shared = {"restaurant table": frame, "search listing": None,
+                  "shared listings": [listing, status, on_map]}
+        reruns = {
+            "archive tab": lambda: repository.with_descriptions(repository.load_active_restaurants().iloc[page]),
+            "status tab": repository.load_restaurant_status,
+            "map": repository.load_map_restaurants,
+            "search page": lambda: repository.with_descriptions(repository.with_ratings(listing.iloc[page])),
+            "delete reviews": repository.load_reviews,
+        }
+    shared["rating lookup"] = ratings
+    shared["reviews"] = reviews
+
+    sizes = {}
+    for name, value in shared.items():
+        values = value if isinstance(value, list) else [value] if value is not None else []
+        sizes[name] = sum(frames.frame_bytes(item) for item in values)
+    for name, rerun in reruns.items():
+        rerun()  # warm the caches it reads
+        sizes[name] = allocated(rerun)
+    print(json.dumps(sizes))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restaurants", type=int, default=100000)
+    parser.add_argument("--reviews", type=int, default=300000)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_one(args.run)
+        return
+
+    path = standin.standin_path(args.restaurants, args.reviews, args.seed)
+    results = {}
+    for layout in LAYOUTS:
+        env = dict(os.environ, DB_BACKEND="sqlite", DB_SQLITE_PATH=path, READ_SOURCE="mysql",
+                   COMPACT_DTYPES="1" if layout == "after" else "0")
+        result = subprocess.run([sys.executable, "-m", "benchmarks.bench_memory", "--run", layout],
+                                env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise SystemExit(result.stderr[-2000:])
+        results[layout] = json.loads(result.stdout.strip().splitlines()[-1])
+
+    mb = lambda value: f"{value / 1e6:9.1f} MB"
+    print(f"{args.restaurants} restaurants, {args.reviews} reviews")
+    print(f"  {'':18} {'before':>12} {'after':>12}")
+    totals = {}
+    for title, names in (("shared", SHARED), ("per rerun", PAGES)):
+        print(f"  {title}")
+        for name in names:
+            print(f"    {name:16} {mb(results['before'][name])}  {mb(results['after'][name])}")
+        totals[title] = {layout: sum(results[layout][name] for name in names) for layout in LAYOUTS}
+        print(f"    {'total':16} {mb(totals[title]['before'])}  {mb(totals[title]['after'])}")
+    footprint = {layout: totals["shared"][layout] + args.sessions * totals["per rerun"][layout]
+                 for layout in LAYOUTS}
+    print(f"  {args.sessions} sessions, one rerun of each page open:")
+    print(f"    {'total':16} {mb(footprint['before'])}  {mb(footprint['after'])}  "
+          f"({footprint['before'] / footprint['after']:.1f}x less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# ============================================
+# Benchmark: LIKE scan vs full-text index for review keyword search
+# ============================================
+# Runs the View Reviews keyword search against the SQLite stand-in twice:
+# as a LIKE '%word%' scan over every review_text, and through the FTS5 index
+# with the queries built by services/reviews.py (the MySQL build uses the
+# FULLTEXT index from migration 7 the same way).
+#
+#   python -m benchmarks.bench_review_search [--reviews 200000]
+
+import argparse
+import os
+import re
+import tempfile
+import time
+
+from benchmarks.standin import build_standin, execute, seed_reviews
+from services import reviews
+
+QUERIES = ["brisket", "pad thai", "outstanding ramen", "salt", "went with priya"]
+
+
+# LIKE version of the search (page and count): every word must appear
+# somewhere in the text
+def like_filter(text):
+    words = re.findall(r"\w+", text.lower())
+    return " AND ".join(["rv.review_text LIKE %s"] * len(words)), [f"%{word}%" for word in words]
+
+
+def like_query(text):
+    where, params = like_filter(text)
+    query = f"""
+        SELECT rv.review_id, rv.rating, rv.review_text, rv.created_at, r.name AS restaurant_name
+        FROM Reviews rv
+        INNER JOIN Restaurants r ON rv.restaurant_id = r.restaurant_id
+        WHERE {where}
+        ORDER BY rv.created_at DESC, rv.review_id DESC
+        LIMIT %s
+    """
+    return query, params + [reviews.REVIEW_PAGE_SIZE]
+
+
+def like_count_query(text):
+    where, params = like_filter(text)
+    return f"SELECT COUNT(*) FROM Reviews rv WHERE {where}", params
+
+
+# Median milliseconds of fn() over repeat runs
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2] * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restaurants", type=int, default=5000)
+    parser.add_argument("--reviews", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=11)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), f"standin_reviews_{args.restaurants}_{args.reviews}.db")
+    conn = seed_reviews(build_standin(path, args.restaurants), args.reviews)
+    print(f"{args.reviews} reviews over {args.restaurants} restaurants ({path})")
+    for text in QUERIES:
+        like_ms, like_rows = timed(lambda: execute(conn, *like_query(text)).fetchall(), args.repeat)
+        like_count_ms, _ = timed(lambda: execute(conn, *like_count_query(text)).fetchone(), args.repeat)
+        search_ms, search_rows = timed(
+            lambda: execute(conn, *reviews.build_review_search_query(text, dialect="sqlite")).fetchall(), args.repeat)
+        count_ms, (total,) = timed(
+            lambda: execute(conn, *reviews.build_review_search_count_query(text, dialect="sqlite")).fetchone(),
+            args.repeat)
+        print(f"  {text!r:19} LIKE page + count: {like_ms:7.2f} + {like_count_ms:7.2f} ms | "
+              f"full-text page + count: {search_ms:7.2f} + {count_ms:6.2f} ms ({total} matches)")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
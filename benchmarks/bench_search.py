@@ -0,0 +1,96 @@
+# ============================================
+# Benchmark: pandas filtering vs SQL pushdown for Restaurant Search
+# ============================================
+# Compares the old "Get Results" path (load every active restaurant, then
+# filter with str.contains / apply) with the paged query built by
+# services/search.py, on a synthetic SQLite stand-in of 100k restaurants.
+#
+#   python -m benchmarks.bench_search [--restaurants 100000]
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.standin import build_standin, execute
+from services import search
+
+FULL_QUERY = """
+    SELECT r.restaurant_id, r.name, r.description, r.website, pr.price_symbol,
+           GROUP_CONCAT(ct.cuisine_name) AS cuisines
+    FROM Restaurants r
+    LEFT JOIN RestaurantPricing rp ON r.restaurant_id = rp.restaurant_id
+    LEFT JOIN PriceRanges pr ON rp.price_range_id = pr.price_range_id
+    LEFT JOIN RestaurantCuisines rc ON r.restaurant_id = rc.restaurant_id
+    LEFT JOIN CuisineTypes ct ON rc.cuisine_id = ct.cuisine_id
+    WHERE r.is_active = TRUE
+    GROUP BY r.restaurant_id, r.name, r.description, r.website, pr.price_symbol
+"""
+
+SCENARIOS = [
+    ("no filters", "", "All", ()),
+    ("name", "grill", "All", ()),
+    ("price", "", "$$", ()),
+    ("cuisines", "", "All", ("BBQ", "Thai")),
+    ("all filters", "grill", "$$", ("BBQ", "Thai")),
+]
+
+
+# Old path: full load + pandas filtering (as in the original Get Results handler)
+def pandas_search(conn, name, price, cuisines):
+    df = pd.read_sql(FULL_QUERY, conn)
+    filtered_df = df.copy()
+    if name:
+        filtered_df = filtered_df[filtered_df["name"].str.contains(name, case=False, na=False)]
+    if price != "All":
+        filtered_df = filtered_df[filtered_df["price_symbol"] == price]
+    if cuisines:
+        filtered_df = filtered_df[filtered_df["cuisines"].apply(
+            lambda x: any(c in x.split(",") for c in cuisines) if pd.notna(x) else False)]
+    return filtered_df.head(search.PAGE_SIZE), len(filtered_df)
+
+
+# New path: one page + count, filtered in SQL
+def sql_search(conn, name, price, cuisines):
+    query, params = search.build_search_query(name, price, cuisines)
+    page = pd.read_sql(query.replace("%s", "?"), conn, params=params)
+    count_query, count_params = search.build_count_query(name, price, cuisines)
+    return page, execute(conn, count_query, count_params).fetchone()[0]
+
+
+# Median latency (ms) and peak traced memory (MB) of one search
+def measure(fn, conn, args, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(conn, *args)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    _, total = fn(conn, *args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return sorted(timings)[len(timings) // 2] * 1000, peak / 1e6, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restaurants", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), f"group02_bench_{args.restaurants}.db")
+    conn = build_standin(path, args.restaurants)
+    print(f"SQLite stand-in with {args.restaurants} restaurants ({path})")
+    print(f"{'scenario':<12} {'matches':>8} {'pandas ms':>10} {'pandas MB':>10} {'sql ms':>8} {'sql MB':>7}")
+    for label, *filters in SCENARIOS:
+        old_ms, old_mb, old_total = measure(pandas_search, conn, filters, args.repeat)
+        new_ms, new_mb, new_total = measure(sql_search, conn, filters, args.repeat)
+        assert old_total == new_total, (label, old_total, new_total)
+        print(f"{label:<12} {new_total:>8} {old_ms:>10.1f} {old_mb:>10.1f} {new_ms:>8.1f} {new_mb:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# ============================================
+# Benchmark: cold start (import time + first paint)
+# ============================================
+# Starts a fresh interpreter per run with `python -X importtime`, renders one
+# page of streamlit_app.py headless with AppTest, and reports:
+#   - first paint: wall time of the first script run
+#   - the slowest imports triggered by the app (streamlit itself excluded)
+#   - whether the heavy libraries (pandas, folium, ...) were loaded at all
+# --page is a module in app_pages/. Home needs no database; the data pages
+# need the usual DB_* settings.
+#
+#   python -m benchmarks.bench_startup [--page home] [--runs 5]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "numpy", "folium", "streamlit_folium", "pyarrow", "mysql.connector"]
+MARKER = "--- app start ---"
+
+# Child process: everything printed to stderr after MARKER is the app's own
+# importtime output; the result line goes to stdout as JSON.
+CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+page, heavy, marker = sys.argv[1], sys.argv[2].split(","), sys.argv[3]
+print(marker, file=sys.stderr, flush=True)
+start = time.perf_counter()
+at = AppTest.from_file("streamlit_app.py", default_timeout=120).run()
+if page != "home":
+    at.switch_page(f"app_pages/{page}.py").run()
+elapsed = time.perf_counter() - start
+print(json.dumps({"first_paint_ms": elapsed * 1000,
+                  "exception": [e.value for e in at.exception],
+                  "loaded": [name for name in heavy if name in sys.modules]}))
+"""
+
+
+# Parse `-X importtime` lines ("import time: self | cumulative | name") into
+# (cumulative microseconds, module) for the top-level imports
+def parse_importtime(stderr):
+    lines = stderr.split(MARKER, 1)[-1].splitlines()
+    imports = []
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            imports.append((int(cumulative), name.strip()))
+    return imports
+
+
+def run_once(page):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD, page, ",".join(HEAVY_MODULES), MARKER],
+                            cwd=APP_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(result.stderr[-2000:])
+    return json.loads(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page", default="home")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [run_once(args.page) for _ in range(args.runs)]
+    paints = sorted(summary["first_paint_ms"] for summary, _ in runs)
+    summary, imports = runs[-1]
+    print(f"{args.page}: first paint {paints[len(paints) // 2]:.0f} ms (median of {args.runs}, "
+          f"min {paints[0]:.0f}, max {paints[-1]:.0f})")
+    if summary["exception"]:
+        print(f"  app raised: {summary['exception']}")
+    print(f"  heavy modules loaded: {', '.join(summary['loaded']) or 'none'}")
+    print(f"  imports triggered by the app: {sum(cumulative for cumulative, _ in imports) / 1000:.0f} ms")
+    for cumulative, name in sorted(imports, reverse=True)[:args.top]:
+        print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
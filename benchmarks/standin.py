@@ -0,0 +1,324 @@
+# ============================================
+# Local SQLite stand-in for the group02 MySQL database
+# ============================================
+# Same tables and columns as the production schema (see
+# Project_Documentation_Report.md), filled with seeded synthetic Dallas
+# restaurants and reviews so the benchmarks can run without the remote
+# DigitalOcean host. The same seed always gives the same rows, at any scale
+# (1k to 1M rows; they are generated and inserted in chunks).
+#
+# A stand-in file runs the whole app (DB_BACKEND=sqlite, DB_SQLITE_PATH=<file>)
+# and also works as an offline snapshot fixture (READ_SOURCE=snapshot,
+# SNAPSHOT_PATH=<file>, SNAPSHOT_REFRESH_SECONDS=0). The rows can also be
+# loaded into a scratch MySQL database (load_mysql; the migrations then add
+# the indexes and derived tables).
+#
+#   python -m benchmarks.standin --restaurants 100000 --reviews 500000 [--path x.db]
+#   BENCH_MYSQL_HOST=127.0.0.1 python -m benchmarks.standin --mysql --restaurants 100000
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+
+from services import rating_stats
+
+CHUNK_ROWS = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS Restaurants (
+    restaurant_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL,
+    street_address VARCHAR(150),
+    city VARCHAR(50),
+    state VARCHAR(2),
+    zip_code VARCHAR(10),
+    phone VARCHAR(20),
+    website VARCHAR(100),
+    description TEXT,
+    latitude DECIMAL(9,6),
+    longitude DECIMAL(9,6),
+    is_active BOOLEAN DEFAULT TRUE,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS CuisineTypes (
+    cuisine_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cuisine_name VARCHAR(50) NOT NULL
+);
+CREATE TABLE IF NOT EXISTS PriceRanges (
+    price_range_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    price_symbol VARCHAR(4) NOT NULL,
+    description VARCHAR(100)
+);
+CREATE TABLE IF NOT EXISTS RestaurantCuisines (
+    restaurant_id INT,
+    cuisine_id INT,
+    PRIMARY KEY (restaurant_id, cuisine_id)
+);
+CREATE TABLE IF NOT EXISTS RestaurantPricing (
+    restaurant_id INT PRIMARY KEY,
+    price_range_id INT
+);
+CREATE TABLE IF NOT EXISTS Reviews (
+    review_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    restaurant_id INT NOT NULL,
+    user_id INT,
+    rating INT NOT NULL,
+    review_text TEXT,
+    created_at DATETIME
+);
+CREATE TABLE IF NOT EXISTS RestaurantRatingStats (
+    restaurant_id INT PRIMARY KEY,
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_1 INT NOT NULL DEFAULT 0,
+    rating_2 INT NOT NULL DEFAULT 0,
+    rating_3 INT NOT NULL DEFAULT 0,
+    rating_4 INT NOT NULL DEFAULT 0,
+    rating_5 INT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_restaurants_active_name ON Restaurants (is_active, name);
+CREATE INDEX IF NOT EXISTS idx_restaurants_lat_lng ON Restaurants (latitude, longitude);
+CREATE INDEX IF NOT EXISTS idx_restaurant_cuisines_cuisine ON RestaurantCuisines (cuisine_id);
+CREATE INDEX IF NOT EXISTS idx_restaurant_pricing_price ON RestaurantPricing (price_range_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_restaurant ON Reviews (restaurant_id);
+CREATE INDEX IF NOT EXISTS idx_restaurants_updated ON Restaurants (updated_at);
+CREATE INDEX IF NOT EXISTS idx_rating_stats_updated ON RestaurantRatingStats (updated_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS ReviewsFTS USING fts5(review_text, content='Reviews', content_rowid='review_id');
+CREATE TRIGGER IF NOT EXISTS reviews_fts_insert AFTER INSERT ON Reviews BEGIN
+    INSERT INTO ReviewsFTS (rowid, review_text) VALUES (new.review_id, new.review_text);
+END;
+CREATE TRIGGER IF NOT EXISTS reviews_fts_delete AFTER DELETE ON Reviews BEGIN
+    INSERT INTO ReviewsFTS (ReviewsFTS, rowid, review_text) VALUES ('delete', old.review_id, old.review_text);
+END;
+CREATE TRIGGER IF NOT EXISTS reviews_fts_update AFTER UPDATE OF review_text ON Reviews BEGIN
+    INSERT INTO ReviewsFTS (ReviewsFTS, rowid, review_text) VALUES ('delete', old.review_id, old.review_text);
+    INSERT INTO ReviewsFTS (rowid, review_text) VALUES (new.review_id, new.review_text);
+END;
+"""
+
+CUISINES = ["American", "BBQ", "Chinese", "French", "Indian", "Italian", "Japanese",
+            "Korean", "Mediterranean", "Mexican", "Pizza", "Seafood", "Steakhouse",
+            "Sushi", "Tex-Mex", "Thai", "Vegan", "Vietnamese"]
+PRICES = [("$", "Budget-friendly"), ("$$", "Moderate"), ("$$$", "Upscale"), ("$$$$", "Fine dining")]
+WORDS = ["Golden", "Lone Star", "Uptown", "Deep Ellum", "Bishop Arts", "Oak Lawn", "Trinity",
+         "Smoky", "Little", "Big D", "Casa", "Corner", "Garden", "Harbor", "Blue", "Red"]
+DISHES = ["brisket", "tacos", "ramen", "pho", "burger", "enchiladas", "pad thai", "sushi",
+          "margherita", "queso", "ribs", "dumplings", "curry", "biscuits", "tamales", "gelato"]
+PHRASES = ["The {dish} was {adjective}.", "Service was {adjective} and the {dish} came out fast.",
+           "Came for the {dish}, stayed for the patio.", "Would skip the {dish} next time.",
+           "Best {dish} in Dallas, hands down.", "Portions were {adjective}; try the {dish}."]
+GUESTS = ["Ava", "Ben", "Carmen", "Diego", "Elena", "Farah", "Gus", "Hana", "Ivan", "Jade", "Kofi", "Lena",
+          "Marco", "Nia", "Omar", "Priya", "Quinn", "Rosa", "Sam", "Tariq", "Uma", "Vic", "Wen", "Yusuf"]
+ADJECTIVES = ["amazing", "fine", "bland", "outstanding", "too salty", "perfect", "friendly", "slow"]
+NOUNS = ["Kitchen", "Grill", "Bistro", "Cantina", "Diner", "Cafe", "House", "Taqueria",
+         "Pizzeria", "Smokehouse", "Noodle Bar", "Eatery"]
+
+
+# Base tables of a MySQL stand-in; migrations 1-8 add the rest
+MYSQL_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS Restaurants (
+        restaurant_id INT PRIMARY KEY AUTO_INCREMENT, name VARCHAR(100) NOT NULL,
+        street_address VARCHAR(150), city VARCHAR(50), state VARCHAR(2), zip_code VARCHAR(10),
+        phone VARCHAR(20), website VARCHAR(100), description TEXT,
+        latitude DECIMAL(9,6), longitude DECIMAL(9,6), is_active BOOLEAN DEFAULT TRUE)""",
+    """CREATE TABLE IF NOT EXISTS CuisineTypes (
+        cuisine_id INT PRIMARY KEY AUTO_INCREMENT, cuisine_name VARCHAR(50) NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS PriceRanges (
+        price_range_id INT PRIMARY KEY AUTO_INCREMENT, price_symbol VARCHAR(4) NOT NULL, description VARCHAR(100))""",
+    """CREATE TABLE IF NOT EXISTS RestaurantCuisines (
+        restaurant_id INT, cuisine_id INT, PRIMARY KEY (restaurant_id, cuisine_id),
+        FOREIGN KEY (restaurant_id) REFERENCES Restaurants(restaurant_id),
+        FOREIGN KEY (cuisine_id) REFERENCES CuisineTypes(cuisine_id))""",
+    """CREATE TABLE IF NOT EXISTS RestaurantPricing (
+        restaurant_id INT PRIMARY KEY, price_range_id INT,
+        FOREIGN KEY (restaurant_id) REFERENCES Restaurants(restaurant_id),
+        FOREIGN KEY (price_range_id) REFERENCES PriceRanges(price_range_id))""",
+    """CREATE TABLE IF NOT EXISTS Reviews (
+        review_id INT PRIMARY KEY AUTO_INCREMENT, restaurant_id INT NOT NULL, user_id INT,
+        rating INT NOT NULL, review_text TEXT, created_at DATETIME,
+        FOREIGN KEY (restaurant_id) REFERENCES Restaurants(restaurant_id))""",
+]
+RESTAURANT_COLUMNS = ["restaurant_id", "name", "street_address", "city", "state", "zip_code", "phone",
+                      "website", "description", "latitude", "longitude", "is_active"]
+REVIEW_COLUMNS = ["restaurant_id", "user_id", "rating", "review_text", "created_at"]
+
+
+# Run a MySQL-style (%s placeholder) statement on a SQLite connection
+def execute(conn, query, params=()):
+    return conn.execute(query.replace("%s", "?"), list(params))
+
+
+# --------------------------------------------
+# Seeded rows
+# --------------------------------------------
+# (Restaurants, RestaurantPricing, RestaurantCuisines) rows, CHUNK_ROWS
+# restaurants at a time
+def restaurant_chunks(n_restaurants, seed=2025):
+    rng = random.Random(seed)
+    for first in range(1, n_restaurants + 1, CHUNK_ROWS):
+        restaurants, pricing, cuisines = [], [], []
+        for rid in range(first, min(first + CHUNK_ROWS, n_restaurants + 1)):
+            name = f"{rng.choice(WORDS)} {rng.choice(NOUNS)} #{rid}"
+            restaurants.append((rid, name, f"{rng.randint(100, 9999)} Main St", "Dallas", "TX",
+                                f"752{rng.randint(0, 99):02d}", None, f"https://example.com/{rid}",
+                                f"{name} serves Dallas since {rng.randint(1950, 2024)}.",
+                                round(32.7767 + rng.uniform(-0.25, 0.25), 6),
+                                round(-96.7970 + rng.uniform(-0.3, 0.3), 6),
+                                rng.random() > 0.1))
+            pricing.append((rid, rng.randint(1, len(PRICES))))
+            for cid in rng.sample(range(1, len(CUISINES) + 1), rng.randint(1, 3)):
+                cuisines.append((rid, cid))
+        yield restaurants, pricing, cuisines
+
+
+# Reviews rows (text built from DISHES / PHRASES) spread over restaurant ids
+# 1..restaurant_count, CHUNK_ROWS at a time
+def review_chunks(n_reviews, restaurant_count, seed=2025):
+    rng = random.Random(seed)
+    for first in range(0, n_reviews, CHUNK_ROWS):
+        rows = []
+        for _ in range(min(CHUNK_ROWS, n_reviews - first)):
+            text = " ".join(rng.choice(PHRASES).format(dish=rng.choice(DISHES), adjective=rng.choice(ADJECTIVES))
+                            for _ in range(rng.randint(1, 4)))
+            if rng.random() < 0.2:
+                text += f" Went with {rng.choice(GUESTS)}."
+            rows.append((rng.randint(1, restaurant_count), 1, rng.randint(1, 5), text,
+                         f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:00:00"))
+        yield rows
+
+
+def _insert(cursor, table, columns, rows, placeholder="?"):
+    cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) "
+                       f"VALUES ({', '.join([placeholder] * len(columns))})", rows)
+
+
+# Fill the lookup, restaurant and review tables through a DB-API cursor
+def _load(cursor, commit, n_restaurants, n_reviews, seed, placeholder):
+    _insert(cursor, "CuisineTypes", ["cuisine_name"], [(c,) for c in CUISINES], placeholder)
+    _insert(cursor, "PriceRanges", ["price_symbol", "description"], PRICES, placeholder)
+    for restaurants, pricing, cuisines in restaurant_chunks(n_restaurants, seed):
+        _insert(cursor, "Restaurants", RESTAURANT_COLUMNS, restaurants, placeholder)
+        _insert(cursor, "RestaurantPricing", ["restaurant_id", "price_range_id"], pricing, placeholder)
+        _insert(cursor, "RestaurantCuisines", ["restaurant_id", "cuisine_id"], cuisines, placeholder)
+        commit()
+    for rows in review_chunks(n_reviews, n_restaurants, seed):
+        _insert(cursor, "Reviews", REVIEW_COLUMNS, rows, placeholder)
+        commit()
+
+
+def _recompute_rating_stats(cursor):
+    cursor.execute("DELETE FROM RestaurantRatingStats")
+    cursor.execute(f"INSERT INTO RestaurantRatingStats (restaurant_id, {', '.join(rating_stats.STATS_COLUMNS)}) "
+                   f"{rating_stats.RECOMPUTE_QUERY}")
+
+
+# --------------------------------------------
+# SQLite stand-in
+# --------------------------------------------
+# Create (or reuse) a stand-in database file with n_restaurants seeded rows.
+# A file left over from an older schema is generated again.
+def build_standin(path, n_restaurants=1000, seed=2025):
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA)
+    except sqlite3.OperationalError:
+        conn.close()
+        os.remove(path)
+        conn = sqlite3.connect(path)
+        conn.executescript(SCHEMA)
+    if conn.execute("SELECT COUNT(*) FROM Restaurants").fetchone()[0] >= n_restaurants:
+        return conn
+    # A stand-in can be regenerated: skip the fsyncs while loading
+    conn.execute("PRAGMA synchronous = OFF")
+    _load(conn.cursor(), conn.commit, n_restaurants, 0, seed, "?")
+    conn.execute("PRAGMA synchronous = FULL")
+    return conn
+
+
+# Add n seeded reviews across the restaurants already in the stand-in
+def seed_reviews(conn, n_reviews, seed=2025):
+    existing = conn.execute("SELECT COUNT(*) FROM Reviews").fetchone()[0]
+    if existing >= n_reviews:
+        return conn
+    restaurant_count = conn.execute("SELECT COUNT(*) FROM Restaurants").fetchone()[0]
+    for rows in review_chunks(n_reviews - existing, restaurant_count, seed):
+        _insert(conn, "Reviews", REVIEW_COLUMNS, rows)
+        conn.commit()
+    _recompute_rating_stats(conn)
+    conn.commit()
+    return conn
+
+
+# Stand-in file for a given scale, generated on first use and reused after
+def standin_path(n_restaurants, n_reviews, seed=2025):
+    path = os.path.join(tempfile.gettempdir(), f"group02_standin_{n_restaurants}_{n_reviews}_{seed}.db")
+    if not os.path.exists(path):
+        seed_reviews(build_standin(path, n_restaurants, seed), n_reviews, seed).close()
+    return path
+
+
+# --------------------------------------------
+# MySQL stand-in
+# --------------------------------------------
+# Scratch MySQL database from the BENCH_MYSQL_* settings
+def mysql_config():
+    return {
+        "host": os.environ["BENCH_MYSQL_HOST"],
+        "port": int(os.environ.get("BENCH_MYSQL_PORT", 3306)),
+        "user": os.environ.get("BENCH_MYSQL_USER", "root"),
+        "password": os.environ.get("BENCH_MYSQL_PASSWORD", ""),
+        "database": os.environ.get("BENCH_MYSQL_DB", "group02"),
+    }
+
+
+# Load the seeded rows into an empty MySQL database and bring its schema up
+# to date (indexes are built once, after the bulk insert)
+def load_mysql(connection, n_restaurants, n_reviews, seed=2025):
+    from services import migrations
+
+    cursor = connection.cursor()
+    try:
+        for statement in MYSQL_SCHEMA:
+            cursor.execute(statement)
+        cursor.execute("SELECT COUNT(*) FROM Restaurants")
+        if cursor.fetchone()[0] > 0:
+            raise SystemExit("Restaurants is not empty; load the stand-in into an empty database")
+        _load(cursor, connection.commit, n_restaurants, n_reviews, seed, "%s")
+        migrations.run_migrations(connection)
+        _recompute_rating_stats(cursor)
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restaurants", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--path", help="SQLite file (default: one per scale in the temp directory)")
+    parser.add_argument("--mysql", action="store_true", help="load into the BENCH_MYSQL_* database instead")
+    args = parser.parse_args()
+
+    if args.mysql:
+        import mysql.connector
+        connection = mysql.connector.connect(**mysql_config())
+        try:
+            load_mysql(connection, args.restaurants, args.reviews, args.seed)
+        finally:
+            connection.close()
+        print(f"Loaded {args.restaurants} restaurants and {args.reviews} reviews into MySQL {mysql_config()['host']}")
+        return
+    if args.path:
+        seed_reviews(build_standin(args.path, args.restaurants, args.seed), args.reviews, args.seed).close()
+        path = args.path
+    else:
+        path = standin_path(args.restaurants, args.reviews, args.seed)
+    print(f"Stand-in with {args.restaurants} restaurants and {args.reviews} reviews: {path}")
+
+
+if __name__ == "__main__":
+    main()
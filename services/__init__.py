@@ -0,0 +1,3 @@
+# ============================================
+# Shared services for the Dallas Restaurants app
+# ============================================
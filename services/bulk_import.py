@@ -0,0 +1,314 @@
+# ============================================
+# Bulk restaurant import (CSV / JSON)
+# ============================================
+# Streams a CSV, JSON array or JSON Lines file in chunks (the whole file is
+# never held in memory), validates every row and writes the valid ones with
+# multi-row INSERTs, IMPORT_BATCH_ROWS restaurants per transaction:
+#   Restaurants         one INSERT per batch; the new ids follow from the
+#                       first one in steps of @@auto_increment_increment
+#                       (MySQL allocates all the ids of a multi-row INSERT
+#                       at once; replicated servers often step by more than 1)
+#   RestaurantPricing   one INSERT per batch, for rows with a price
+#   RestaurantCuisines  one INSERT per batch, for rows with cuisines
+# Price symbols and cuisine names are resolved against PriceRanges and
+# CuisineTypes, read once per import. Invalid rows are skipped and reported
+# (where, why); a database error rolls back the current batch and stops the
+# import, leaving the batches committed before it.
+#
+# Columns (header names, case-insensitive): name, street_address, zip_code
+# (required), city (default Dallas), state (default TX), phone, website,
+# description, latitude, longitude, price_symbol ("$".."$$$$") and cuisines
+# (names separated by "," or ";", or a JSON list). Other columns are ignored,
+# so a restaurant export imports as-is.
+#
+#   python -m services.bulk_import restaurants.csv [--dry-run]
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+
+from mysql.connector import Error
+
+BATCH_ROWS = int(os.environ.get("IMPORT_BATCH_ROWS", 1000))
+READ_CHUNK_CHARS = 64 * 1024
+# Rejected rows listed in the report (all of them are counted)
+MAX_REPORTED_ERRORS = 100
+
+REQUIRED = ["name", "street_address", "zip_code"]
+# Column -> maximum length, as in the Restaurants table
+TEXT_COLUMNS = {"name": 100, "street_address": 150, "city": 50, "state": 2, "zip_code": 10,
+                "phone": 20, "website": 100, "description": None}
+DEFAULTS = {"city": "Dallas", "state": "TX"}
+ALIASES = {"street": "street_address", "address": "street_address", "zip": "zip_code", "price": "price_symbol",
+           "lat": "latitude", "lng": "longitude", "lon": "longitude", "cuisine": "cuisines"}
+INSERT_COLUMNS = ["name", "street_address", "city", "state", "zip_code", "phone", "website",
+                  "description", "latitude", "longitude"]
+_SEPARATORS = re.compile(r"[,;|]")
+
+
+# --------------------------------------------
+# Reading
+# --------------------------------------------
+# "Street Address" -> "street_address", plus the aliases above
+def _column(header):
+    column = re.sub(r"\s+", "_", str(header).strip().lower())
+    return ALIASES.get(column, column)
+
+
+# (where, record) pairs from a CSV stream of text
+def read_csv(text):
+    reader = csv.DictReader(text)
+    columns = [_column(header) for header in reader.fieldnames or []]
+    missing = [column for column in REQUIRED if column not in columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    for row in reader:
+        yield f"line {reader.line_num}", {_column(header): value for header, value in row.items() if header is not None}
+
+
+# Where a decode error stops when the object is only cut by the end of the
+# buffer: in a number or literal, or in an escape or string that runs to the end
+_CUT_NUMBER = re.compile(r"[-+.\deE]*\Z")
+_CUT_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+
+# Can more text complete the object (cut by the end of the buffer), or is the
+# JSON malformed?
+def _cut_off(buffer, error):
+    rest = buffer[error.pos:]
+    return (error.msg.startswith("Unterminated string") or _CUT_NUMBER.match(rest) is not None
+            or any(literal.startswith(rest) for literal in _CUT_LITERALS)
+            or (error.msg.startswith("Invalid \\uXXXX escape") and len(rest) < 6))
+
+
+# (where, record) pairs from a JSON array of objects or JSON Lines, decoded
+# one object at a time from READ_CHUNK_CHARS-character reads
+def read_json(text):
+    decoder = json.JSONDecoder()
+    buffer, index, number = "", 0, 0
+    while True:
+        # Between objects: whitespace, commas and the array brackets
+        while index < len(buffer) and buffer[index] in " \t\r\n,[]":
+            index += 1
+        if index == len(buffer):
+            buffer, index = text.read(READ_CHUNK_CHARS), 0
+            if not buffer:
+                return
+            continue
+        try:
+            value, end = decoder.raw_decode(buffer, index)
+        except json.JSONDecodeError as e:
+            # Malformed before the end of the buffer: reading more cannot fix it
+            if not _cut_off(buffer, e):
+                raise ValueError(f"Invalid JSON in record {number + 1}: {e.msg}")
+            # Object cut at the end of the buffer: read more, unless there is no more
+            chunk = text.read(READ_CHUNK_CHARS)
+            if not chunk:
+                raise ValueError(f"Invalid JSON after record {number}")
+            buffer, index = buffer[index:] + chunk, 0
+            continue
+        number += 1
+        index = end
+        if isinstance(value, dict):
+            value = {_column(key): item for key, item in value.items()}
+        yield f"record {number}", value
+
+
+# Records of an uploaded or opened binary file; the format comes from the
+# file name (.csv, .json, .jsonl / .ndjson). The stream is left open.
+def read_records(stream, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in (".csv", ".json", ".jsonl", ".ndjson"):
+        raise ValueError(f"Unsupported file type {extension or filename!r}: use .csv, .json or .jsonl")
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield from read_csv(text) if extension == ".csv" else read_json(text)
+    finally:
+        text.detach()
+
+
+# --------------------------------------------
+# Validation
+# --------------------------------------------
+# Price symbol -> price_range_id, lower-case cuisine name -> cuisine_id, and
+# the step between the ids of one multi-row INSERT
+def load_reference(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT price_symbol, price_range_id FROM PriceRanges")
+        prices = {symbol: price_id for symbol, price_id in cursor.fetchall()}
+        cursor.execute("SELECT cuisine_name, cuisine_id FROM CuisineTypes")
+        cuisines = {name.strip().lower(): cuisine_id for name, cuisine_id in cursor.fetchall()}
+        cursor.execute("SELECT @@auto_increment_increment")
+        id_step = int(cursor.fetchone()[0])
+    finally:
+        cursor.close()
+    return {"prices": prices, "cuisines": cuisines, "id_step": id_step}
+
+
+def _text(record, column):
+    value = record.get(column)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _coordinate(record, column, limit):
+    value = _text(record, column)
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"{column} is not a number: {value!r}")
+    if not -limit <= number <= limit:
+        raise ValueError(f"{column} out of range: {number}")
+    return round(number, 6)
+
+
+# (Restaurants values, price_range_id or None, cuisine ids) of a valid
+# record; raises ValueError saying what is wrong otherwise
+def validate(record, reference):
+    if not isinstance(record, dict):
+        raise ValueError("not a JSON object")
+    values = {}
+    for column, length in TEXT_COLUMNS.items():
+        value = _text(record, column) or DEFAULTS.get(column)
+        if value is not None and length is not None and len(value) > length:
+            raise ValueError(f"{column} longer than {length} characters")
+        values[column] = value
+    missing = [column for column in REQUIRED if not values[column]]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} required")
+    values["state"] = values["state"].upper()
+    values["latitude"] = _coordinate(record, "latitude", 90)
+    values["longitude"] = _coordinate(record, "longitude", 180)
+    if (values["latitude"] is None) != (values["longitude"] is None):
+        raise ValueError("latitude and longitude go together")
+
+    price = _text(record, "price_symbol")
+    if price is not None and price not in reference["prices"]:
+        raise ValueError(f"unknown price {price!r}")
+    cuisines = record.get("cuisines")
+    names = cuisines if isinstance(cuisines, list) else _SEPARATORS.split(_text(record, "cuisines") or "")
+    names = [str(name).strip() for name in names if str(name).strip()]
+    unknown = [name for name in names if name.lower() not in reference["cuisines"]]
+    if unknown:
+        raise ValueError(f"unknown cuisine(s): {', '.join(unknown)}")
+    cuisine_ids = list(dict.fromkeys(reference["cuisines"][name.lower()] for name in names))
+    return ([values[column] for column in INSERT_COLUMNS],
+            reference["prices"].get(price), cuisine_ids)
+
+
+# --------------------------------------------
+# Writing
+# --------------------------------------------
+# One multi-row INSERT: row_sql is the VALUES group of one row
+def _insert_values(cursor, statement, row_sql, rows):
+    cursor.execute(f"{statement} VALUES {', '.join([row_sql] * len(rows))}",
+                   [value for row in rows for value in row])
+
+
+# Write one batch of validated rows in a transaction; the new restaurant ids
+# are lastrowid, lastrowid + id_step, ...
+def _write_batch(connection, batch, id_step=1):
+    cursor = connection.cursor()
+    try:
+        _insert_values(cursor, f"INSERT INTO Restaurants ({', '.join(INSERT_COLUMNS)}, is_active, updated_at)",
+                       f"({', '.join(['%s'] * len(INSERT_COLUMNS))}, TRUE, CURRENT_TIMESTAMP)",
+                       [values for values, _, _ in batch])
+        first_id = cursor.lastrowid
+        pricing, cuisines = [], []
+        for number, (_, price_id, cuisine_ids) in enumerate(batch):
+            restaurant_id = first_id + number * id_step
+            if price_id is not None:
+                pricing.append((restaurant_id, price_id))
+            cuisines.extend((restaurant_id, cuisine_id) for cuisine_id in cuisine_ids)
+        if pricing:
+            _insert_values(cursor, "INSERT INTO RestaurantPricing (restaurant_id, price_range_id)", "(%s, %s)", pricing)
+        if cuisines:
+            _insert_values(cursor, "INSERT INTO RestaurantCuisines (restaurant_id, cuisine_id)", "(%s, %s)", cuisines)
+        connection.commit()
+    except Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def new_report():
+    return {"read": 0, "imported": 0, "rejected": 0, "errors": [], "seconds": 0.0}
+
+
+# Validate and write records, updating `report` as it goes (on a database
+# error the caller still sees what was committed) and calling
+# on_progress(report) after every batch. dry_run only validates.
+def import_records(connection, records, report, on_progress=None, dry_run=False, batch_rows=BATCH_ROWS):
+    reference = load_reference(connection)
+    start = time.perf_counter()
+    batch = []
+    reported = {"read": None}
+
+    def flush():
+        if batch and not dry_run:
+            _write_batch(connection, batch, reference["id_step"])
+        report["imported"] += len(batch)
+        report["seconds"] = time.perf_counter() - start
+        batch.clear()
+        # The final flush reports only rows read since the last batch
+        if on_progress and report["read"] != reported["read"]:
+            reported["read"] = report["read"]
+            on_progress(report)
+
+    for where, record in records:
+        report["read"] += 1
+        try:
+            batch.append(validate(record, reference))
+        except ValueError as e:
+            report["rejected"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append(f"{where}: {e}")
+        if len(batch) >= batch_rows:
+            flush()
+    flush()
+    return report
+
+
+def main():
+    from services import db
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", help=".csv, .json (array) or .jsonl file")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS)
+    args = parser.parse_args()
+
+    size = os.path.getsize(args.path)
+    report = new_report()
+    connection = db.open_connection()
+    try:
+        with open(args.path, "rb") as f:
+            def progress(report):
+                sys.stderr.write(f"\r{f.tell() / size if size else 1:6.1%}  {report['read']} read, "
+                                 f"{report['imported']} {'valid' if args.dry_run else 'imported'}, "
+                                 f"{report['rejected']} rejected")
+            import_records(connection, read_records(f, args.path), report, progress, args.dry_run, args.batch_rows)
+    except (Error, ValueError) as e:
+        raise SystemExit(f"\nImport stopped after {report['imported']} rows: {e}")
+    finally:
+        connection.close()
+    sys.stderr.write("\n")
+    for error in report["errors"]:
+        print(f"  rejected {error}")
+    print(f"{report['imported']} restaurants {'valid' if args.dry_run else 'imported'}, "
+          f"{report['rejected']} rejected, in {report['seconds']:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# ============================================
+# Incremental refresh from updated_at watermarks
+# ============================================
+# Restaurants and RestaurantRatingStats carry an updated_at column (migration
+# 8) that every write path sets. A cached copy of such a table remembers a
+# watermark; refreshing it reads only the rows stamped since then and merges
+# them in by key, so a refresh costs as much as the churn, not the table
+# size. Merging changed rows cannot drop deleted ones. Restaurants are never
+# deleted (they are archived), but `rating_stats --rebuild` deletes and
+# re-inserts RestaurantRatingStats: tables that can lose rows pass count(),
+# and a refresh that read changes reloads the table whole when the merged
+# frame has a different number of rows than the table.
+#
+# The watermark is the database clock when the previous read started, minus
+# OVERLAP_SECONDS: updated_at has one-second resolution and a transaction can
+# commit a little after the stamp it wrote. Tables without a clock (the
+# local snapshot, which is swapped in whole) use their newest updated_at,
+# minus the same overlap.
+# The whole table is reloaded every FULL_RELOAD_SECONDS as a backstop.
+
+import datetime
+import os
+import threading
+import time
+
+import pandas as pd
+
+# How often readers look for changed rows (writes from this app trigger a look right away)
+POLL_SECONDS = int(os.environ.get("CHANGE_POLL_SECONDS", 30))
+FULL_RELOAD_SECONDS = int(os.environ.get("FULL_RELOAD_SECONDS", 3600))
+OVERLAP_SECONDS = 5
+
+
+# Empty cache for one table; refresh() fills it
+def new_table():
+    return {"frame": None, "watermark": None, "version": 0, "checked": 0.0, "loaded": 0.0,
+            "lock": threading.Lock()}
+
+
+# Lower bound for "updated_at >= %s" from a database timestamp, as text
+# both MySQL and SQLite compare correctly
+def since(moment, overlap=OVERLAP_SECONDS):
+    moment = datetime.datetime.fromisoformat(str(moment)) - datetime.timedelta(seconds=overlap)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Next watermark: from the clock reading taken before the query, otherwise
+# the newest updated_at read so far; both keep the overlap, so a row that
+# commits late with a slightly older stamp is still read
+def _watermark(started, frame, previous):
+    if started is not None:
+        return since(started)
+    stamps = frame["updated_at"].dropna()
+    if stamps.empty:
+        return previous
+    newest = since(stamps.max())
+    return newest if previous is None or newest > previous else previous
+
+
+# Rows in order, with categorical columns as plain values (a frame's
+# categories depend on all of its rows)
+def _comparable(frame, sort):
+    frame = sort(frame).reset_index(drop=True)
+    return frame.astype({column: object for column in frame.select_dtypes("category").columns})
+
+
+# The cached frame with the changed rows replacing (or added to) the ones
+# with the same key, or None when the changed rows match the cached ones
+# (rows read again because of the overlap)
+def merge(frame, changed, key, sort):
+    cached = frame[frame[key].isin(changed[key])]
+    if len(cached) == len(changed) and _comparable(cached, sort).equals(_comparable(changed, sort)):
+        return None
+    kept = frame[~frame[key].isin(changed[key])]
+    return sort(pd.concat([kept, changed], ignore_index=True))
+
+
+# Bring a table cache up to date and return (frame, version). The first call
+# (and one every FULL_RELOAD_SECONDS) loads the whole table; otherwise, at
+# most every POLL_SECONDS or right after mark_stale(), only the rows changed
+# since the watermark are read and merged. load(where, params) runs the
+# table's query with the given WHERE clause; sort(frame) puts rows in order;
+# clock() returns the database's CURRENT_TIMESTAMP (None: no clock);
+# count() its current number of rows (None: rows are never deleted).
+# The version changes whenever the frame does (key for derived caches).
+def refresh(table, load, key, sort, stamp_column="updated_at", clock=None, count=None):
+    with table["lock"]:
+        now = time.monotonic()
+        poll = now - table["checked"] > POLL_SECONDS
+        # An empty table has no watermark yet: reload it whole
+        reload = table["frame"] is None or now - table["loaded"] > FULL_RELOAD_SECONDS or (
+            poll and table["watermark"] is None)
+        if poll and not reload:
+            started = clock() if clock else None
+            changed = load(f"WHERE {stamp_column} >= %s", [table["watermark"]])
+            table.update(checked=now, watermark=_watermark(started, changed, table["watermark"]))
+            if len(changed):
+                merged = merge(table["frame"], changed, key, sort)
+                frame = table["frame"] if merged is None else merged
+                # Rows deleted from the table are still in the merged frame
+                reload = count is not None and count() != len(frame)
+                if merged is not None and not reload:
+                    table.update(frame=merged, version=table["version"] + 1)
+        if reload:
+            started = clock() if clock else None
+            frame = load("", [])
+            table.update(frame=sort(frame), watermark=_watermark(started, frame, None), loaded=now, checked=now,
+                         version=table["version"] + 1)
+        return table["frame"], table["version"]
+
+
+# Look for changes on the next read (called after this app writes)
+def mark_stale(table):
+    table["checked"] = float("-inf")
@@ -0,0 +1,127 @@
+# ============================================
+# Database connection pool
+# ============================================
+# One MySQL connection pool is shared by every session (st.cache_resource).
+# Each rerun checks out a single warm connection, reuses it for all its
+# queries and hands it back to the pool at the end of the script. Checkout
+# guards against stale connections: the pool reconnects one that is no
+# longer connected before handing it out. Statements executed
+# on it are counted per rerun (SHOW_QUERY_COUNT=1 shows the count) and, with
+# PROFILING=1, timed (services/profiling.py).
+#
+# DB_BACKEND=sqlite runs the app against a local SQLite file at
+# DB_SQLITE_PATH instead (services/sqlite_backend.py), e.g. a stand-in
+# database for the benchmarks.
+
+import os
+
+import streamlit as st
+import mysql.connector
+
+from services import profiling
+from mysql.connector import Error
+from mysql.connector.pooling import MySQLConnectionPool
+from mysql.connector.errors import PoolError
+
+# Connection settings (environment variables override the defaults)
+DB_CONFIG = {
+    "host": os.environ.get("DB_HOST", "db-mysql-itom-do-user-28250611-0.j.db.ondigitalocean.com"),
+    "port": int(os.environ.get("DB_PORT", 25060)),
+    "user": os.environ.get("DB_USER", "group02"),
+    "password": os.environ.get("DB_PASSWORD", "Pass2025_group02"),
+    "database": os.environ.get("DB_NAME", "group02"),
+}
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+SHOW_QUERY_COUNT = os.environ.get("SHOW_QUERY_COUNT", "0") == "1"
+BACKEND = os.environ.get("DB_BACKEND", "mysql")
+SQLITE_PATH = os.environ.get("DB_SQLITE_PATH", "group02_standin.db")
+# SQL dialect of the connections; the few dialect-specific queries
+# (full-text search, the rating stats upsert) branch on it
+DIALECT = "sqlite" if BACKEND == "sqlite" else "mysql"
+
+_SESSION_KEY = "_db_connection"
+_COUNT_KEY = "_db_query_count"
+
+
+# Build the pool once per server process; shared by all sessions and reruns
+@st.cache_resource(show_spinner=False)
+def get_pool():
+    return MySQLConnectionPool(pool_name="group02_pool", pool_size=POOL_SIZE,
+                               pool_reset_session=True, **DB_CONFIG)
+
+
+# Dedicated connection outside the pool (command-line tools, the snapshot
+# refresher); the caller closes it
+def open_connection():
+    if BACKEND == "sqlite":
+        from services import sqlite_backend
+        return sqlite_backend.connect(SQLITE_PATH)
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+# Get this session's connection: the one this rerun already checked out
+# (streamlit_app.py releases it when the rerun ends, also on st.rerun or an
+# error), otherwise a warm one from the pool. If the pool is exhausted, open
+# a one-off overflow connection.
+def get_connection():
+    conn = st.session_state.get(_SESSION_KEY)
+    if conn is not None:
+        return conn
+
+    if BACKEND == "sqlite":
+        # Opening a local file is cheap; no pool needed
+        conn = open_connection()
+    else:
+        try:
+            conn = get_pool().get_connection()
+        except PoolError:
+            conn = mysql.connector.connect(**DB_CONFIG)
+    count_queries(conn)
+    st.session_state[_SESSION_KEY] = conn
+    return conn
+
+
+# --------------------------------------------
+# Per-rerun query count
+# --------------------------------------------
+# Wrap conn.cursor so every execute() on its cursors (including the ones
+# pd.read_sql opens) bumps the session's counter, and is profiled when
+# profiling is on
+def count_queries(conn):
+    make_cursor = conn.cursor
+
+    def counting_cursor(*args, **kwargs):
+        cursor = make_cursor(*args, **kwargs)
+        execute = cursor.execute
+
+        def counting_execute(*args, **kwargs):
+            st.session_state[_COUNT_KEY] = st.session_state.get(_COUNT_KEY, 0) + 1
+            return execute(*args, **kwargs)
+
+        cursor.execute = counting_execute
+        if profiling.ENABLED:
+            profiling.instrument_cursor(cursor)
+        return cursor
+
+    conn.cursor = counting_cursor
+    return conn
+
+
+# Called at the top of the script
+def reset_query_count():
+    st.session_state[_COUNT_KEY] = 0
+
+
+def query_count():
+    return st.session_state.get(_COUNT_KEY, 0)
+
+
+# Return the session's connection to the pool (or close it if it was overflow)
+def release_connection():
+    conn = st.session_state.pop(_SESSION_KEY, None)
+    if conn is None:
+        return
+    try:
+        conn.close()
+    except Error:
+        pass
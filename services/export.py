@@ -0,0 +1,214 @@
+# ============================================
+# Chunked CSV / Parquet export
+# ============================================
+# Exports the restaurant status overview, Restaurant Search results and the
+# review history without loading them into a DataFrame. Rows are read on a
+# dedicated connection with an unbuffered cursor (MySQL streams the result
+# instead of sending it all at once) in EXPORT_CHUNK_ROWS fetchmany() calls,
+# and each chunk is written out before the next one is read: CSV rows, or
+# one Parquet row group per chunk. Reading and writing hold about one chunk
+# whatever the table size.
+#
+# The pages' download buttons run the export only when clicked, into a
+# temporary file that Streamlit then serves. Streamlit reads the whole file
+# into memory to serve it (and keeps it until the session moves on), so an
+# in-app download costs memory in proportion to the export; the temporary
+# file only avoids a second in-memory copy. Large exports should use the
+# command line, which writes the file directly and stays at one chunk:
+#
+#   python -m services.export status --output restaurants.csv
+#   python -m services.export reviews --output reviews.parquet
+#   python -m services.export search --name grill --cuisine BBQ --output grill.csv
+
+import argparse
+import csv
+import datetime
+import io
+import os
+import tempfile
+from decimal import Decimal
+
+from mysql.connector import Error
+
+from services import db, search
+
+CHUNK_ROWS = int(os.environ.get("EXPORT_CHUNK_ROWS", 5000))
+# Format -> (button label, MIME type)
+FORMATS = {"csv": ("CSV", "text/csv"), "parquet": ("Parquet", "application/vnd.apache.parquet")}
+
+# Every restaurant field (an export imports back with services/bulk_import.py)
+# plus its rating; cuisines come from a correlated subquery so rows stream
+# in order without grouping the whole table
+RESTAURANT_QUERY = """
+    SELECT r.restaurant_id, r.name, CASE WHEN r.is_active THEN 'Active' ELSE 'Archived' END AS status,
+           r.street_address, r.city, r.state, r.zip_code, r.phone, r.website, r.description,
+           r.latitude, r.longitude, pr.price_symbol,
+           (SELECT GROUP_CONCAT(ct.cuisine_name) FROM RestaurantCuisines rc
+            JOIN CuisineTypes ct ON rc.cuisine_id = ct.cuisine_id
+            WHERE rc.restaurant_id = r.restaurant_id) AS cuisines,
+           COALESCE(s.review_count, 0) AS review_count,
+           ROUND(s.rating_sum * 1.0 / NULLIF(s.review_count, 0), 2) AS avg_rating
+    FROM Restaurants r
+    LEFT JOIN RestaurantPricing rp ON r.restaurant_id = rp.restaurant_id
+    LEFT JOIN PriceRanges pr ON rp.price_range_id = pr.price_range_id
+    LEFT JOIN RestaurantRatingStats s ON r.restaurant_id = s.restaurant_id
+    {where}
+    ORDER BY {order}
+"""
+RESTAURANT_COLUMNS = [("restaurant_id", "int"), ("name", "text"), ("status", "text"), ("street_address", "text"),
+                      ("city", "text"), ("state", "text"), ("zip_code", "text"), ("phone", "text"),
+                      ("website", "text"), ("description", "text"), ("latitude", "float"), ("longitude", "float"),
+                      ("price_symbol", "text"), ("cuisines", "text"), ("review_count", "int"),
+                      ("avg_rating", "float")]
+# Reviews in id order (the primary key: no sort)
+REVIEW_QUERY = """
+    SELECT rv.review_id, rv.restaurant_id, r.name AS restaurant_name, rv.user_id, rv.rating,
+           rv.review_text, rv.created_at
+    FROM Reviews rv
+    JOIN Restaurants r ON rv.restaurant_id = r.restaurant_id
+    {where}
+    ORDER BY rv.review_id
+"""
+REVIEW_COLUMNS = [("review_id", "int"), ("restaurant_id", "int"), ("restaurant_name", "text"), ("user_id", "int"),
+                  ("rating", "int"), ("review_text", "text"), ("created_at", "timestamp")]
+
+
+# --------------------------------------------
+# Exports: (query, params, columns)
+# --------------------------------------------
+# Every restaurant, active and archived (View All Status)
+def status_export():
+    return RESTAURANT_QUERY.format(where="", order="r.restaurant_id"), [], RESTAURANT_COLUMNS
+
+
+# Every active restaurant matching the Restaurant Search filters, in page order
+def search_export(name="", price="All", cuisines=()):
+    where, params = search.build_filters(name, price, cuisines)
+    return (RESTAURANT_QUERY.format(where=f"WHERE {where}", order="r.name, r.restaurant_id"),
+            params, RESTAURANT_COLUMNS)
+
+
+# The review history, of one restaurant or all
+def reviews_export(restaurant_id=None):
+    if restaurant_id is None:
+        return REVIEW_QUERY.format(where=""), [], REVIEW_COLUMNS
+    return REVIEW_QUERY.format(where="WHERE rv.restaurant_id = %s"), [int(restaurant_id)], REVIEW_COLUMNS
+
+
+# --------------------------------------------
+# Reading and writing
+# --------------------------------------------
+# Lists of at most chunk_rows rows, streamed from an unbuffered cursor
+def read_chunks(connection, query, params=(), chunk_rows=CHUNK_ROWS):
+    cursor = connection.cursor(buffered=False)
+    try:
+        cursor.execute(query, params)
+        rows = cursor.fetchmany(chunk_rows)
+        while rows:
+            yield rows
+            rows = cursor.fetchmany(chunk_rows)
+    finally:
+        try:
+            cursor.close()
+        except Error:
+            # Stopped early: MySQL still has unread rows; the caller closes the connection
+            pass
+
+
+def write_csv(chunks, columns, out):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow([name for name, _ in columns])
+    for rows in chunks:
+        writer.writerows(rows)
+    text.flush()
+    text.detach()
+
+
+# Column values as Parquet expects them: MySQL returns DECIMAL as Decimal,
+# SQLite returns DATETIME as text
+def _float(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def _timestamp(value):
+    return datetime.datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def write_parquet(chunks, columns, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"int": pa.int64(), "float": pa.float64(), "text": pa.string(), "timestamp": pa.timestamp("s")}
+    converters = {"float": _float, "timestamp": _timestamp}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    with pq.ParquetWriter(out, schema) as writer:
+        for rows in chunks:
+            arrays = []
+            for (name, kind), values in zip(columns, zip(*rows)):
+                convert = converters.get(kind)
+                arrays.append(pa.array([convert(value) for value in values] if convert else values, type=types[kind]))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
+# Stream an export to a binary file object on a dedicated connection
+def export(query, params, columns, out, file_format="csv", chunk_rows=CHUNK_ROWS):
+    connection = db.open_connection()
+    try:
+        chunks = read_chunks(connection, query, params, chunk_rows)
+        (write_parquet if file_format == "parquet" else write_csv)(chunks, columns, out)
+    finally:
+        connection.close()
+
+
+# --------------------------------------------
+# Download buttons
+# --------------------------------------------
+# The export as a temporary file (deleted once Streamlit has read it into
+# memory)
+def _export_file(query, params, columns, file_format):
+    out = tempfile.TemporaryFile()
+    export(query, params, columns, out, file_format)
+    out.seek(0)
+    return out
+
+
+# CSV and Parquet download buttons for an export; nothing is read until one
+# is clicked
+def download_buttons(file_stem, query, params, columns, key):
+    import streamlit as st
+
+    for column, file_format in zip(st.columns([1, 1, 4])[:2], FORMATS):
+        with column:
+            label, mime = FORMATS[file_format]
+            st.download_button(f"⬇️ {label}", lambda file_format=file_format:
+                               _export_file(query, params, columns, file_format),
+                               file_name=f"{file_stem}.{file_format}", mime=mime,
+                               on_click="ignore", key=f"{key}_{file_format}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("what", choices=["status", "search", "reviews"])
+    parser.add_argument("--output", required=True, help="file to write; .parquet writes Parquet, anything else CSV")
+    parser.add_argument("--name", default="", help="search: part of the restaurant name")
+    parser.add_argument("--price", default="All", help="search: price symbol")
+    parser.add_argument("--cuisine", action="append", default=[], help="search: cuisine (repeatable)")
+    parser.add_argument("--restaurant", type=int, help="reviews: one restaurant's reviews")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if args.what == "status":
+        query, params, columns = status_export()
+    elif args.what == "search":
+        query, params, columns = search_export(args.name, args.price, tuple(args.cuisine))
+    else:
+        query, params, columns = reviews_export(args.restaurant)
+    file_format = "parquet" if args.output.lower().endswith(".parquet") else "csv"
+    with open(args.output, "wb") as out:
+        export(query, params, columns, out, file_format, args.chunk_rows)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# ============================================
+# Compact DataFrame dtypes
+# ============================================
+# Query results arrive with the dtypes pandas infers: int64 ids and flags,
+# MySQL DECIMAL coordinates as Python Decimal objects, and the same few price
+# symbols and cuisine combinations repeated as separate strings on every row.
+# compact() gives the frames the app keeps in memory explicit dtypes:
+#   "category"         low-cardinality text (price symbol, cuisine combination)
+#   "float32"          coordinates (about a metre of precision in Dallas)
+#   "Int32" / "Int8"   ids, counts and flags (nullable)
+#   "str"              Arrow-backed strings (pandas' default string dtype)
+#   "datetime64[s]"    timestamps (SQLite returns them as text)
+# COMPACT_DTYPES=0 keeps the inferred dtypes (to compare memory use).
+
+import os
+
+ENABLED = os.environ.get("COMPACT_DTYPES", "1") == "1"
+
+
+# The frame with the given column dtypes (columns it lacks are skipped)
+def compact(frame, dtypes):
+    if not ENABLED:
+        return frame
+    return frame.astype({column: dtype for column, dtype in dtypes.items()
+                         if column in frame and frame[column].dtype != dtype})
+
+
+# Bytes held by a frame, strings and categories included
+def frame_bytes(frame):
+    return int(frame.memory_usage(deep=True).sum())
@@ -0,0 +1,135 @@
+# ============================================
+# Restaurant map rendering (Find Food Near Me)
+# ============================================
+# Picks a rendering mode from the number of restaurants:
+#   markers - one folium.Marker with an icon per restaurant (small data sets)
+#   canvas  - one GeoJSON layer of circle markers drawn on a <canvas>
+#   cluster - FastMarkerCluster; points are shipped as plain arrays and the
+#             markers are created in the browser only when a cluster opens
+
+import os
+
+import folium
+from folium.plugins import FastMarkerCluster
+
+MARKER_LIMIT = int(os.environ.get("MAP_MARKER_LIMIT", 300))
+CANVAS_LIMIT = int(os.environ.get("MAP_CANVAS_LIMIT", 2000))
+
+# Folium icon colours for the price ranges (also valid CSS colour names)
+PRICE_COLORS = {"$": "lightblue", "$$": "blue", "$$$": "darkblue", "$$$$": "purple"}
+DEFAULT_COLOR = "blue"
+
+# Browser-side marker factory for FastMarkerCluster: row = [lat, lng, name, color]
+CLUSTER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]),
+        {radius: 6, color: row[3], fillColor: row[3], fillOpacity: 0.8, weight: 1});
+    marker.bindTooltip(row[2]);
+    return marker;
+}
+"""
+
+
+def choose_mode(row_count):
+    if row_count <= MARKER_LIMIT:
+        return "markers"
+    if row_count <= CANVAS_LIMIT:
+        return "canvas"
+    return "cluster"
+
+
+# Vectorized extraction of coordinates, labels and colours (as plain lists).
+# Labels include the average rating when the frame has one.
+def _point_arrays(restaurants):
+    lat = restaurants["latitude"].astype(float).tolist()
+    lng = restaurants["longitude"].astype(float).tolist()
+    names = restaurants["name"].astype(str)
+    prices = restaurants["price_symbol"].astype(object)
+    colors = prices.map(PRICE_COLORS).fillna(DEFAULT_COLOR).tolist()
+    labels = names + " (" + prices.fillna("None").astype(str) + ")"
+    if "avg_rating" in restaurants:
+        ratings = restaurants["avg_rating"]
+        labels = labels.where(ratings.isna(), labels + " ⭐ " + ratings.map("{:.1f}".format)
+                              + " (" + restaurants["review_count"].astype(str) + " reviews)")
+    labels = labels.tolist()
+    return lat, lng, names.tolist(), colors, labels
+
+
+def _add_markers(m, restaurants):
+    for lat, lng, name, color, label in zip(*_point_arrays(restaurants)):
+        folium.Marker(
+            location=[lat, lng],
+            popup=label,
+            tooltip=name,
+            icon=folium.Icon(color=color, icon="info-sign")
+        ).add_to(m)
+
+
+def _add_canvas_layer(m, restaurants):
+    features = [
+        {"type": "Feature",
+         "geometry": {"type": "Point", "coordinates": [lng, lat]},
+         "properties": {"name": name, "label": label, "color": color}}
+        for lat, lng, name, color, label in zip(*_point_arrays(restaurants))
+    ]
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        marker=folium.CircleMarker(radius=6, fill=True, fill_opacity=0.8, weight=1),
+        style_function=lambda feature: {"color": feature["properties"]["color"],
+                                        "fillColor": feature["properties"]["color"]},
+        tooltip=folium.GeoJsonTooltip(fields=["name"], labels=False),
+        popup=folium.GeoJsonPopup(fields=["label"], labels=False),
+    ).add_to(m)
+
+
+def _add_cluster_layer(m, restaurants):
+    lat, lng, names, colors, _ = _point_arrays(restaurants)
+    FastMarkerCluster([list(row) for row in zip(lat, lng, names, colors)], callback=CLUSTER_CALLBACK).add_to(m)
+
+
+# Build the folium map for a restaurant frame (name, latitude, longitude, price_symbol),
+# optionally centred on and marking the user's location
+def build_map(restaurants, mode=None, user_location=None):
+    mode = mode or choose_mode(len(restaurants))
+    if user_location:
+        center = list(user_location)
+    else:
+        center = [restaurants.latitude.astype(float).mean(), restaurants.longitude.astype(float).mean()]
+    m = folium.Map(location=center, zoom_start=12, tiles="CartoDB Positron", prefer_canvas=mode != "markers")
+    if user_location:
+        folium.Marker(location=center, tooltip="You are here",
+                      icon=folium.Icon(color="red", icon="user")).add_to(m)
+    if mode == "markers":
+        _add_markers(m, restaurants)
+    elif mode == "canvas":
+        _add_canvas_layer(m, restaurants)
+    else:
+        _add_cluster_layer(m, restaurants)
+    return m
+
+
+# Base map without restaurants for the viewport mode; the restaurants are sent
+# as a feature group so panning does not reload the map. Built on every call:
+# st_folium adds the feature group to the map it is given, so a cached,
+# shared map would collect every session's markers. A fresh map renders the
+# same HTML (st_folium replaces the map's id), so the component keeps its map.
+def get_base_map(center, zoom):
+    return folium.Map(location=list(center), zoom_start=zoom, tiles="CartoDB Positron", prefer_canvas=True)
+
+
+# Feature group with the restaurants currently in view. Only core Leaflet
+# layers can be added to a live map, so this uses markers or the canvas layer.
+def build_viewport_layer(restaurants):
+    layer = folium.FeatureGroup(name="Restaurants")
+    if len(restaurants) <= MARKER_LIMIT:
+        _add_markers(layer, restaurants)
+    elif len(restaurants):
+        _add_canvas_layer(layer, restaurants)
+    return layer
+
+
+# Built on every call rather than cached: st_folium writes into the map it
+# renders, so a map shared between sessions must not be handed to it (and the
+# render, not the build, is most of the time)
+def get_restaurant_map(restaurants, user_location=None):
+    return build_map(restaurants, user_location=user_location)
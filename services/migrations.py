@@ -0,0 +1,198 @@
+# ============================================
+# Versioned schema migrations
+# ============================================
+# Schema changes run once (at app startup or from the command line) instead
+# of being probed on every page render. Applied versions are recorded in the
+# SchemaMigrations table, so each migration runs exactly once per database.
+#
+#   python -m services.migrations           # apply pending migrations
+#   python -m services.migrations --list    # show applied / pending versions
+
+import argparse
+
+import streamlit as st
+import mysql.connector
+
+from services import db, rating_stats
+
+LOCK_NAME = "group02_migrations"
+
+
+# Does table.column exist in the current database?
+def _column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+# Is there already an index whose leading columns are `columns`?
+# (InnoDB creates one automatically for every FOREIGN KEY constraint.)
+def _index_exists(cursor, table, columns):
+    cursor.execute("""
+        SELECT INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX)
+        FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        GROUP BY INDEX_NAME
+    """, (table,))
+    wanted = ",".join(columns)
+    return any(index_columns.startswith(wanted) for _, index_columns in cursor.fetchall())
+
+
+def _create_index(cursor, table, name, columns):
+    if not _index_exists(cursor, table, columns):
+        cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+
+
+# --------------------------------------------
+# Migrations (append new ones; never edit applied ones)
+# --------------------------------------------
+def add_is_active_column(cursor):
+    if not _column_exists(cursor, "Restaurants", "is_active"):
+        cursor.execute("ALTER TABLE Restaurants ADD COLUMN is_active BOOLEAN DEFAULT TRUE")
+
+
+def add_is_active_index(cursor):
+    # Serves "WHERE is_active = ..." together with "ORDER BY name"
+    _create_index(cursor, "Restaurants", "idx_restaurants_active_name", ["is_active", "name"])
+
+
+def add_foreign_key_indexes(cursor):
+    _create_index(cursor, "RestaurantCuisines", "idx_restaurant_cuisines_cuisine", ["cuisine_id"])
+    _create_index(cursor, "RestaurantPricing", "idx_restaurant_pricing_price", ["price_range_id"])
+    _create_index(cursor, "Reviews", "idx_reviews_restaurant", ["restaurant_id"])
+
+
+def add_coordinates_index(cursor):
+    # Bounding-box prefilter of the "near me" search
+    _create_index(cursor, "Restaurants", "idx_restaurants_lat_lng", ["latitude", "longitude"])
+
+
+def add_review_keyset_indexes(cursor):
+    # Keyset paging of View Reviews, unfiltered and per restaurant
+    _create_index(cursor, "Reviews", "idx_reviews_created", ["created_at", "review_id"])
+    _create_index(cursor, "Reviews", "idx_reviews_restaurant_created", ["restaurant_id", "created_at", "review_id"])
+
+
+def add_rating_stats_table(cursor):
+    histogram = "".join(f"            {column} INT NOT NULL DEFAULT 0,\n" for column in rating_stats.HISTOGRAM_COLUMNS)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS RestaurantRatingStats (
+            restaurant_id INT PRIMARY KEY,
+            review_count INT NOT NULL DEFAULT 0,
+            rating_sum INT NOT NULL DEFAULT 0,
+{histogram}            FOREIGN KEY (restaurant_id) REFERENCES Restaurants(restaurant_id)
+        )
+    """)
+    cursor.execute("DELETE FROM RestaurantRatingStats")
+    cursor.execute(f"""
+        INSERT INTO RestaurantRatingStats (restaurant_id, {", ".join(rating_stats.STATS_COLUMNS)})
+        {rating_stats.RECOMPUTE_QUERY}
+    """)
+
+
+def add_review_fulltext_index(cursor):
+    # Keyword search over review text (MATCH ... AGAINST)
+    if not _index_exists(cursor, "Reviews", ["review_text"]):
+        cursor.execute("CREATE FULLTEXT INDEX ft_reviews_text ON Reviews (review_text)")
+
+
+def add_updated_at_columns(cursor):
+    # Change tracking for incremental refresh (services/changes.py); the
+    # write paths set updated_at explicitly, ON UPDATE is a backstop
+    for table, index in [("Restaurants", "idx_restaurants_updated"),
+                         ("RestaurantRatingStats", "idx_rating_stats_updated")]:
+        if not _column_exists(cursor, table, "updated_at"):
+            cursor.execute(f"""
+                ALTER TABLE {table} ADD COLUMN updated_at TIMESTAMP NOT NULL
+                DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            """)
+        _create_index(cursor, table, index, ["updated_at"])
+
+
+MIGRATIONS = [
+    (1, "Add Restaurants.is_active for soft delete", add_is_active_column),
+    (2, "Index Restaurants (is_active, name)", add_is_active_index),
+    (3, "Index the foreign key columns of the linking tables and Reviews", add_foreign_key_indexes),
+    (4, "Index Restaurants (latitude, longitude)", add_coordinates_index),
+    (5, "Index Reviews for keyset paging by (created_at, review_id)", add_review_keyset_indexes),
+    (6, "Create and backfill RestaurantRatingStats", add_rating_stats_table),
+    (7, "Full-text index on Reviews.review_text", add_review_fulltext_index),
+    (8, "Add updated_at to Restaurants and RestaurantRatingStats", add_updated_at_columns),
+]
+
+
+# --------------------------------------------
+# Runner
+# --------------------------------------------
+def applied_versions(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaMigrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(200),
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT version FROM SchemaMigrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+# Apply every pending migration in order; returns the versions applied now.
+# A named lock keeps two app processes from migrating at the same time;
+# without it (GET_LOCK timed out: 0, or failed: NULL) nothing is migrated.
+def run_migrations(connection):
+    cursor = connection.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, 30)", (LOCK_NAME,))
+    if cursor.fetchone()[0] != 1:
+        cursor.close()
+        raise mysql.connector.Error(msg=f"Could not get the {LOCK_NAME} lock (another process may still be migrating)")
+    try:
+        done = applied_versions(cursor)
+        applied = []
+        for version, description, migrate in MIGRATIONS:
+            if version in done:
+                continue
+            migrate(cursor)
+            cursor.execute("INSERT INTO SchemaMigrations (version, description) VALUES (%s, %s)",
+                           (version, description))
+            connection.commit()
+            applied.append(version)
+        return applied
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+        cursor.fetchone()
+        cursor.close()
+
+
+# Run the migrations once per server process (not on every rerun)
+@st.cache_resource(show_spinner=False)
+def ensure_schema():
+    # The SQLite stand-in is generated with the current schema
+    if db.BACKEND == "sqlite":
+        return []
+    return run_migrations(db.get_connection())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--list", action="store_true", help="show applied and pending migrations")
+    args = parser.parse_args()
+
+    connection = mysql.connector.connect(**db.DB_CONFIG)
+    try:
+        if args.list:
+            cursor = connection.cursor()
+            done = applied_versions(cursor)
+            cursor.close()
+            for version, description, _ in MIGRATIONS:
+                print(f"{'applied' if version in done else 'pending':8} {version:3}  {description}")
+        else:
+            applied = run_migrations(connection)
+            print(f"Applied migrations: {applied}" if applied else "Schema is up to date")
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+# ============================================
+# Rerun profiling (PROFILING=1)
+# ============================================
+# Records, for every rerun of a session:
+#   - each statement sent to the database: its fingerprint (the SQL with
+#     literals and placeholders collapsed to "?"), time spent executing and
+#     fetching it, rows fetched and an estimate of their size in bytes
+#     (services/db.py wraps the cursors; snapshot reads are timed in
+#     services/repository.py)
+#   - the time of the whole script and of each page section
+# SHOW_PROFILER=1 shows the last full rerun in a sidebar panel. Statements
+# slower than SLOW_QUERY_MS are logged (to SLOW_QUERY_LOG, or stderr).
+# Totals per fingerprint, page and section are kept per server process and
+# exported in the Prometheus text format on http://METRICS_HOST:METRICS_PORT/metrics
+# and/or written to METRICS_FILE after every rerun. Fragment reruns (filters
+# and paging inside a section) only reach the totals and the slow-query log.
+
+import collections
+import contextlib
+import functools
+import hashlib
+import http.server
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+import streamlit as st
+
+SHOW_PROFILER = os.environ.get("SHOW_PROFILER", "0") == "1"
+ENABLED = os.environ.get("PROFILING", "0") == "1" or SHOW_PROFILER
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 250))
+SLOW_QUERY_LOG = os.environ.get("SLOW_QUERY_LOG", "")
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 0))
+METRICS_FILE = os.environ.get("METRICS_FILE", "")
+# Row sizes are averaged over the first rows of a result
+BYTES_SAMPLE_ROWS = 50
+RECENT_SLOW_QUERIES = 50
+
+_RUN_KEY = "_profile_run"
+_lock = threading.Lock()
+_totals = {"queries": {}, "pages": {}, "sections": {}}
+# Query id -> fingerprint, for the query_info metric
+_fingerprints = {}
+_recent_slow = collections.deque(maxlen=RECENT_SLOW_QUERIES)
+
+slow_query_log = logging.getLogger("group02.slow_queries")
+if SLOW_QUERY_LOG:
+    _handler = logging.FileHandler(SLOW_QUERY_LOG)
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_query_log.addHandler(_handler)
+
+
+# --------------------------------------------
+# Fingerprints and sizes
+# --------------------------------------------
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+# SQL with literals, placeholders and IN lists collapsed, so one statement
+# shape gives one fingerprint whatever its parameters
+@functools.lru_cache(maxsize=2048)
+def fingerprint(query):
+    text = " ".join(str(query).split())
+    text = _NUMBER.sub("?", _STRING.sub("?", text)).replace("%s", "?")
+    return _LIST.sub("(?, ...)", text)
+
+
+@functools.lru_cache(maxsize=2048)
+def query_id(text):
+    return hashlib.md5(text.encode()).hexdigest()[:12]
+
+
+def _value_bytes(value):
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    return 8
+
+
+# Approximate size of fetched rows (tuples or dicts), from a sample of them
+def estimate_bytes(rows, total=None):
+    sample = list(rows[:BYTES_SAMPLE_ROWS]) if isinstance(rows, list) else list(rows)
+    total = len(rows) if total is None else total
+    if not sample:
+        return 0
+    size = sum(_value_bytes(value) for row in sample
+               for value in (row.values() if isinstance(row, dict) else row))
+    return size * total // len(sample)
+
+
+# --------------------------------------------
+# Per-rerun record
+# --------------------------------------------
+def _run():
+    if _RUN_KEY not in st.session_state:
+        start_run()
+    return st.session_state[_RUN_KEY]
+
+
+# Called at the top of the script
+def start_run():
+    st.session_state[_RUN_KEY] = {"started": time.perf_counter(), "queries": [], "sections": [],
+                                  "stack": [], "total_ms": None}
+
+
+def _add_total(group, key, seconds, **counts):
+    with _lock:
+        total = _totals[group].setdefault(key, collections.Counter())
+        total["seconds"] += seconds
+        total.update(counts)
+
+
+# A statement was executed: returns its record, which the fetch wrappers
+# below complete with the rows they fetch
+def record_query(query, seconds, rows=0, size=0):
+    text = fingerprint(query)
+    run = _run()
+    record = {"fingerprint": text, "id": query_id(text), "ms": seconds * 1000, "rows": rows, "bytes": size,
+              "section": run["stack"][-1][0] if run["stack"] else None, "slow": False}
+    run["queries"].append(record)
+    _fingerprints[record["id"]] = text
+    _add_total("queries", record["id"], seconds, count=1, rows=rows, bytes=size)
+    _check_slow(record)
+    return record
+
+
+def _add_fetch(record, seconds, rows, size):
+    record["ms"] += seconds * 1000
+    record["rows"] += rows
+    record["bytes"] += size
+    _add_total("queries", record["id"], seconds, rows=rows, bytes=size)
+    _check_slow(record)
+
+
+# Log a statement once, when its time crosses SLOW_QUERY_MS
+def _check_slow(record):
+    if record["slow"] or record["ms"] < SLOW_QUERY_MS:
+        return
+    record["slow"] = True
+    _add_total("queries", record["id"], 0, slow=1)
+    entry = {"at": time.strftime("%H:%M:%S"), "ms": round(record["ms"], 1), "rows": record["rows"],
+             "section": record["section"], "query": record["fingerprint"]}
+    _recent_slow.appendleft(entry)
+    slow_query_log.warning("slow query %.1f ms, %d rows, section %s: %s", record["ms"], record["rows"],
+                           record["section"], record["fingerprint"])
+
+
+# Wrap execute / fetch* of a DB-API cursor (services/db.py calls this for
+# every cursor of a session connection when profiling is on)
+def instrument_cursor(cursor):
+    execute = cursor.execute
+    current = {"record": None, "fetching": False}
+
+    def timed_execute(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return execute(*args, **kwargs)
+        finally:
+            query = args[0] if args else next(iter(kwargs.values()), "")
+            current["record"] = record_query(query, time.perf_counter() - start)
+
+    # mysql-connector's fetchmany() calls fetchone(): count the outer call only
+    def timed_fetch(fetch, single=False):
+        def wrapper(*args, **kwargs):
+            if current["record"] is None or current["fetching"]:
+                return fetch(*args, **kwargs)
+            current["fetching"] = True
+            start = time.perf_counter()
+            try:
+                result = fetch(*args, **kwargs)
+            finally:
+                current["fetching"] = False
+            rows = ([] if result is None else [result]) if single else result
+            _add_fetch(current["record"], time.perf_counter() - start, len(rows), estimate_bytes(rows))
+            return result
+        return wrapper
+
+    cursor.execute = timed_execute
+    cursor.fetchall = timed_fetch(cursor.fetchall)
+    cursor.fetchmany = timed_fetch(cursor.fetchmany)
+    cursor.fetchone = timed_fetch(cursor.fetchone, single=True)
+    return cursor
+
+
+# Time a read that does not go through an instrumented cursor (the local
+# snapshot); the caller sets timing["rows"] / timing["bytes"]
+@contextlib.contextmanager
+def timed_query(query):
+    if not ENABLED:
+        yield {}
+        return
+    timing = {}
+    start = time.perf_counter()
+    yield timing
+    record_query(query, time.perf_counter() - start, timing.get("rows", 0), timing.get("bytes", 0))
+
+
+# --------------------------------------------
+# Sections
+# --------------------------------------------
+def _close_section(run, name, start):
+    seconds = time.perf_counter() - start
+    run["sections"].append({"section": name, "start": start, "ms": seconds * 1000,
+                            "queries": sum(1 for query in run["queries"] if query["section"] == name)})
+    _add_total("sections", name, seconds, count=1)
+
+
+# Time a block of a page (context manager or decorator). Sections opened
+# inside it with begin() end with it. Entering the section that is already
+# the innermost one is a no-op, so a fragment can carry the same name as the
+# page section it renders in (and is still timed on fragment reruns).
+@contextlib.contextmanager
+def section(name):
+    if not ENABLED:
+        yield
+        return
+    run = _run()
+    if run["stack"] and run["stack"][-1][0] == name:
+        yield
+        return
+    depth = len(run["stack"])
+    run["stack"].append((name, time.perf_counter()))
+    try:
+        yield
+    finally:
+        while len(run["stack"]) > depth:
+            _close_section(run, *run["stack"].pop())
+
+
+# Start a section that lasts until the enclosing section ends (the selected
+# tab of a page, for example)
+def begin(name):
+    if ENABLED:
+        _run()["stack"].append((name, time.perf_counter()))
+
+
+# Called at the end of the script
+def finish_run(page):
+    run = _run()
+    seconds = time.perf_counter() - run["started"]
+    run["total_ms"] = seconds * 1000
+    _add_total("pages", page, seconds, count=1)
+    if METRICS_FILE:
+        write_metrics(METRICS_FILE)
+
+
+# --------------------------------------------
+# Sidebar panel
+# --------------------------------------------
+def show_panel():
+    run = _run()
+    queries = run["queries"]
+    by_query = {}
+    for query in queries:
+        entry = by_query.setdefault(query["fingerprint"], {"query": query["fingerprint"], "calls": 0,
+                                                           "ms": 0.0, "rows": 0, "bytes": 0})
+        entry["calls"] += 1
+        entry["ms"] += query["ms"]
+        entry["rows"] += query["rows"]
+        entry["bytes"] += query["bytes"]
+    with st.sidebar.expander("🧪 Profiler", expanded=False):
+        st.caption(f"Last rerun: {run['total_ms'] or 0:.0f} ms, {len(queries)} queries, "
+                   f"{sum(query['ms'] for query in queries):.0f} ms in the database")
+        if run["sections"]:
+            st.dataframe([{"section": entry["section"], "ms": round(entry["ms"], 1), "queries": entry["queries"]}
+                          for entry in sorted(run["sections"], key=lambda entry: entry["start"])],
+                         hide_index=True, use_container_width=True)
+        if by_query:
+            st.dataframe(sorted(({**entry, "ms": round(entry["ms"], 1)} for entry in by_query.values()),
+                                key=lambda entry: -entry["ms"]), hide_index=True, use_container_width=True)
+        if _recent_slow:
+            st.caption(f"Slow queries (over {SLOW_QUERY_MS:.0f} ms), newest first")
+            st.dataframe(list(_recent_slow), hide_index=True, use_container_width=True)
+        st.caption("Fragment reruns are counted in the metrics export only.")
+
+
+# --------------------------------------------
+# Prometheus export
+# --------------------------------------------
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+# Totals since the server started, in the Prometheus text format
+def metrics_text():
+    with _lock:
+        totals = {group: {key: dict(values) for key, values in entries.items()}
+                  for group, entries in _totals.items()}
+        fingerprints = dict(_fingerprints)
+    lines = []
+
+    def summary(name, help_text, label, entries):
+        lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} summary"])
+        for key, values in entries.items():
+            lines.append(f'{name}_sum{{{label}="{_label(key)}"}} {values.get("seconds", 0):.6f}')
+            lines.append(f'{name}_count{{{label}="{_label(key)}"}} {values.get("count", 0)}')
+
+    def counter(name, help_text, label, entries, field):
+        lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} counter"])
+        for key, values in entries.items():
+            lines.append(f'{name}{{{label}="{_label(key)}"}} {values.get(field, 0)}')
+
+    queries = totals["queries"]
+    summary("group02_query_duration_seconds", "Time executing and fetching statements, per fingerprint.",
+            "query", queries)
+    counter("group02_query_rows_total", "Rows fetched, per fingerprint.", "query", queries, "rows")
+    counter("group02_query_bytes_total", "Estimated bytes fetched, per fingerprint.", "query", queries, "bytes")
+    counter("group02_slow_queries_total", f"Statements slower than {SLOW_QUERY_MS:.0f} ms, per fingerprint.",
+            "query", queries, "slow")
+    lines.extend(["# HELP group02_query_info Fingerprint of each query id.", "# TYPE group02_query_info gauge"])
+    for key, text in sorted(fingerprints.items()):
+        lines.append(f'group02_query_info{{query="{key}",fingerprint="{_label(text[:500])}"}} 1')
+    summary("group02_rerun_duration_seconds", "Full script reruns, per page.", "page", totals["pages"])
+    summary("group02_section_duration_seconds", "Page sections, including fragment reruns.", "section",
+            totals["sections"])
+    return "\n".join(lines) + "\n"
+
+
+# Write the metrics atomically (for a node_exporter textfile collector).
+# Every session writes after its reruns, so each write gets its own temporary
+# file; a failed write is logged and never breaks the page.
+def write_metrics(path):
+    temporary = None
+    try:
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path) or ".", prefix=".metrics-",
+                                         suffix=".tmp", delete=False) as f:
+            temporary = f.name
+            f.write(metrics_text())
+        os.replace(temporary, path)
+    except OSError as e:
+        logging.getLogger("group02.metrics").warning("could not write %s: %s", path, e)
+        if temporary and os.path.exists(temporary):
+            os.remove(temporary)
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Serve /metrics once per server process (METRICS_PORT)
+@st.cache_resource(show_spinner=False)
+def start_metrics_server():
+    server = http.server.ThreadingHTTPServer((METRICS_HOST, METRICS_PORT), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,163 @@
+# ============================================
+# "Near me" proximity search
+# ============================================
+# A uniform lat/lng grid over the active restaurants lets a radius or
+# k-nearest query look only at the grid cells around the user's point, then
+# rank those candidates with a vectorized haversine distance. The grid is
+# built once per restaurant table version, next to the map listing it
+# indexes (repository.find_restaurants_nearby).
+# For very large tables, PROXIMITY_SOURCE=sql instead prefilters candidates
+# with a bounding-box query on (latitude, longitude) in MySQL.
+
+import os
+
+import numpy as np
+
+EARTH_RADIUS_MI = 3958.8
+MILES_PER_DEGREE_LAT = 69.05
+CELL_DEGREES = float(os.environ.get("PROXIMITY_CELL_DEGREES", 0.02))
+PROXIMITY_SOURCE = os.environ.get("PROXIMITY_SOURCE", "index")
+
+# Local geocoder stub: well-known Dallas places -> (latitude, longitude)
+DALLAS_PLACES = {
+    "downtown dallas": (32.7767, -96.7970),
+    "deep ellum": (32.7843, -96.7837),
+    "uptown": (32.8006, -96.8009),
+    "bishop arts": (32.7491, -96.8285),
+    "bishop arts district": (32.7491, -96.8285),
+    "oak lawn": (32.8129, -96.8160),
+    "lower greenville": (32.8145, -96.7700),
+    "design district": (32.7956, -96.8220),
+    "knox-henderson": (32.8207, -96.7880),
+    "white rock lake": (32.8290, -96.7230),
+    "smu": (32.8412, -96.7845),
+    "love field": (32.8471, -96.8518),
+    "dallas love field": (32.8471, -96.8518),
+    "fair park": (32.7792, -96.7599),
+    "klyde warren park": (32.7894, -96.8016),
+    "reunion tower": (32.7755, -96.8089),
+    "north dallas": (32.9207, -96.7830),
+    "oak cliff": (32.7360, -96.8400),
+}
+
+
+# Resolve a typed address to (lat, lng). Known Dallas places are answered
+# locally; anything else goes to geopy's Nominatim geocoder when
+# GEOCODER=nominatim is set. Returns None when the address is not found.
+def geocode(address):
+    key = address.strip().lower()
+    if key in DALLAS_PLACES:
+        return DALLAS_PLACES[key]
+    if os.environ.get("GEOCODER") == "nominatim":
+        from geopy.geocoders import Nominatim
+        location = Nominatim(user_agent="group02-dallas-restaurants").geocode(f"{address}, Dallas, TX", timeout=5)
+        if location:
+            return location.latitude, location.longitude
+    return None
+
+
+# Great-circle distance in miles from one point to arrays of points
+def haversine_mi(lat, lng, lats, lngs):
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MI * np.arcsin(np.sqrt(a))
+
+
+# (south, west, north, east) of the box covering radius_mi around a point
+def bounding_box(lat, lng, radius_mi):
+    dlat = radius_mi / MILES_PER_DEGREE_LAT
+    dlng = radius_mi / (MILES_PER_DEGREE_LAT * max(float(np.cos(np.radians(lat))), 0.01))
+    return lat - dlat, lng - dlng, lat + dlat, lng + dlng
+
+
+# --------------------------------------------
+# Grid index
+# --------------------------------------------
+# Points are sorted by cell so the points of one grid row form contiguous
+# key ranges that np.searchsorted can slice out.
+def build_grid_index(restaurants):
+    lats = restaurants["latitude"].astype(float).to_numpy()
+    lngs = restaurants["longitude"].astype(float).to_numpy()
+    rows = np.floor(lats / CELL_DEGREES).astype(np.int64)
+    cols = np.floor(lngs / CELL_DEGREES).astype(np.int64)
+    row_min = rows.min() if len(rows) else 0
+    col_min = cols.min() if len(cols) else 0
+    width = (cols.max() - col_min + 1) if len(cols) else 1
+    keys = (rows - row_min) * width + (cols - col_min)
+    order = np.argsort(keys, kind="stable")
+    return {"lats": lats, "lngs": lngs, "order": order, "keys": keys[order],
+            "row_min": row_min, "col_min": col_min, "width": width,
+            "row_max": rows.max() if len(rows) else -1}
+
+
+# Positions of the points in the cells overlapping the bounding box
+def _candidates(index, lat, lng, radius_mi):
+    lat_lo, lng_lo, lat_hi, lng_hi = bounding_box(lat, lng, radius_mi)
+    row_lo = max(int(np.floor(lat_lo / CELL_DEGREES)) - index["row_min"], 0)
+    row_hi = min(int(np.floor(lat_hi / CELL_DEGREES)) - index["row_min"], index["row_max"] - index["row_min"])
+    col_lo = max(int(np.floor(lng_lo / CELL_DEGREES)) - index["col_min"], 0)
+    col_hi = min(int(np.floor(lng_hi / CELL_DEGREES)) - index["col_min"], index["width"] - 1)
+    if row_lo > row_hi or col_lo > col_hi:
+        return np.empty(0, dtype=np.int64)
+    starts = np.arange(row_lo, row_hi + 1) * index["width"] + col_lo
+    ends = np.arange(row_lo, row_hi + 1) * index["width"] + col_hi
+    lo = np.searchsorted(index["keys"], starts, side="left")
+    hi = np.searchsorted(index["keys"], ends, side="right")
+    return np.concatenate([index["order"][a:b] for a, b in zip(lo, hi)])
+
+
+# (positions, distances) of the points within radius_mi, nearest first
+def within_radius(index, lat, lng, radius_mi):
+    positions = _candidates(index, lat, lng, radius_mi)
+    distances = haversine_mi(lat, lng, index["lats"][positions], index["lngs"][positions])
+    keep = distances <= radius_mi
+    positions, distances = positions[keep], distances[keep]
+    order = np.argsort(distances, kind="stable")
+    return positions[order], distances[order]
+
+
+# (positions, distances) of the k nearest points. The search radius doubles
+# until it holds k points; anything outside that radius is farther away.
+def nearest(index, lat, lng, k, start_radius_mi=1.0):
+    total = len(index["lats"])
+    k = min(k, total)
+    radius = start_radius_mi
+    while True:
+        positions, distances = within_radius(index, lat, lng, radius)
+        if len(positions) >= k or radius > 2 * EARTH_RADIUS_MI:
+            return positions[:k], distances[:k]
+        radius *= 2
+
+
+# Nearby rows of the restaurant frame (indexed by build_grid_index) with a
+# distance_mi column, nearest first: the k closest when k is given, otherwise
+# everything within radius_mi
+def find_nearby(restaurants, index, lat, lng, radius_mi=None, k=None):
+    if k:
+        positions, distances = nearest(index, lat, lng, k)
+    else:
+        positions, distances = within_radius(index, lat, lng, radius_mi)
+    return restaurants.iloc[positions].assign(distance_mi=distances)
+
+
+# --------------------------------------------
+# Optional SQL prefilter
+# --------------------------------------------
+# Active restaurants inside (south, west, north, east); uses the
+# (latitude, longitude) index. Executed (and cached) by the repository.
+def build_bbox_query(south, west, north, east, limit=None):
+    query = """
+        SELECT r.restaurant_id, r.name, r.latitude, r.longitude, pr.price_symbol
+        FROM Restaurants r
+        LEFT JOIN RestaurantPricing rp ON r.restaurant_id = rp.restaurant_id
+        LEFT JOIN PriceRanges pr ON rp.price_range_id = pr.price_range_id
+        WHERE r.is_active = TRUE
+          AND r.latitude BETWEEN %s AND %s
+          AND r.longitude BETWEEN %s AND %s
+    """
+    params = [float(south), float(north), float(west), float(east)]
+    if limit:
+        query += " LIMIT %s"
+        params.append(int(limit))
+    return query, params
@@ -0,0 +1,146 @@
+# ============================================
+# Restaurant rating summary (RestaurantRatingStats)
+# ============================================
+# One row per reviewed restaurant with its review count, rating sum and star
+# histogram. The review write paths adjust it in the same transaction as the
+# INSERT / DELETE on Reviews, so reading a restaurant's average rating is a
+# primary-key lookup instead of a GROUP BY over Reviews.
+#
+#   python -m services.rating_stats --verify    # compare with Reviews
+#   python -m services.rating_stats --rebuild   # recompute from scratch
+
+import argparse
+
+import mysql.connector
+
+from services import db
+
+RATINGS = [1, 2, 3, 4, 5]
+HISTOGRAM_COLUMNS = [f"rating_{rating}" for rating in RATINGS]
+STATS_COLUMNS = ["review_count", "rating_sum"] + HISTOGRAM_COLUMNS
+
+# Stats recomputed from Reviews, one row per restaurant (rebuild / verify)
+RECOMPUTE_QUERY = f"""
+    SELECT restaurant_id, COUNT(*), SUM(rating),
+           {", ".join(f"SUM(CASE WHEN rating = {rating} THEN 1 ELSE 0 END)" for rating in RATINGS)}
+    FROM Reviews
+    GROUP BY restaurant_id
+"""
+
+
+# Upsert clause of each dialect: add the inserted deltas to an existing row
+UPSERT_SQL = {
+    "mysql": ("ON DUPLICATE KEY UPDATE {}", "{0} = {0} + VALUES({0})"),
+    "sqlite": ("ON CONFLICT(restaurant_id) DO UPDATE SET {}", "{0} = {0} + excluded.{0}"),
+}
+
+
+# Add `sign` (+1 / -1) times the (rating -> count) histogram to one
+# restaurant's row, creating the row on its first review. A single upsert, so
+# two transactions adding a restaurant's first review cannot both insert.
+def apply_histogram(cursor, restaurant_id, histogram, sign=1):
+    counts = [sign * histogram.get(rating, 0) for rating in RATINGS]
+    deltas = [sum(counts), sum(rating * count for rating, count in zip(RATINGS, counts))] + counts
+    clause, assignment = UPSERT_SQL[db.DIALECT]
+    assignments = ", ".join(assignment.format(column) for column in STATS_COLUMNS)
+    cursor.execute(f"""
+        INSERT INTO RestaurantRatingStats (restaurant_id, {", ".join(STATS_COLUMNS)}, updated_at)
+        VALUES ({", ".join(["%s"] * (len(STATS_COLUMNS) + 1))}, CURRENT_TIMESTAMP)
+        {clause.format(assignments + ", updated_at = CURRENT_TIMESTAMP")}
+    """, (int(restaurant_id), *deltas))
+
+
+# Called with the INSERT INTO Reviews
+def record_review(cursor, restaurant_id, rating):
+    apply_histogram(cursor, restaurant_id, {int(rating): 1})
+
+
+# Called before the DELETE FROM Reviews of the same ids. The rows are locked
+# so a concurrent delete of the same reviews cannot subtract them twice.
+def remove_reviews(cursor, review_ids):
+    placeholders = ", ".join(["%s"] * len(review_ids))
+    cursor.execute(f"""
+        SELECT restaurant_id, rating FROM Reviews
+        WHERE review_id IN ({placeholders})
+        FOR UPDATE
+    """, tuple(review_ids))
+    histograms = {}
+    for restaurant_id, rating in cursor.fetchall():
+        histogram = histograms.setdefault(restaurant_id, {})
+        histogram[int(rating)] = histogram.get(int(rating), 0) + 1
+    for restaurant_id, histogram in histograms.items():
+        apply_histogram(cursor, restaurant_id, histogram, sign=-1)
+
+
+# {"count", "average", "histogram": {rating: count}} from a stats row
+# (review_count, rating_sum, rating_1 .. rating_5); None counts as 0
+def summarize(row):
+    row = [int(value or 0) for value in (row or [0] * len(STATS_COLUMNS))]
+    count, rating_sum, histogram = row[0], row[1], row[2:]
+    return {"count": count,
+            "average": rating_sum / count if count else None,
+            "histogram": dict(zip(RATINGS, histogram))}
+
+
+# One restaurant's stats row, or the totals over all restaurants
+def build_summary_query(restaurant_id=None):
+    if restaurant_id is None:
+        return f"SELECT {', '.join(f'SUM({column})' for column in STATS_COLUMNS)} FROM RestaurantRatingStats", []
+    return (f"SELECT {', '.join(STATS_COLUMNS)} FROM RestaurantRatingStats WHERE restaurant_id = %s",
+            [int(restaurant_id)])
+
+
+# --------------------------------------------
+# Rebuild / verify
+# --------------------------------------------
+# Replace the table contents with stats recomputed from Reviews
+def rebuild(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM RestaurantRatingStats")
+        cursor.execute(f"INSERT INTO RestaurantRatingStats (restaurant_id, {', '.join(STATS_COLUMNS)}) {RECOMPUTE_QUERY}")
+        connection.commit()
+    except mysql.connector.Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# Restaurant ids whose stored stats differ from Reviews (restaurants without
+# reviews may keep an all-zero row)
+def verify(connection):
+    cursor = connection.cursor()
+    cursor.execute(RECOMPUTE_QUERY)
+    expected = {row[0]: [int(value) for value in row[1:]] for row in cursor.fetchall()}
+    cursor.execute(f"SELECT restaurant_id, {', '.join(STATS_COLUMNS)} FROM RestaurantRatingStats")
+    stored = {row[0]: [int(value) for value in row[1:]] for row in cursor.fetchall()}
+    cursor.close()
+    zero = [0] * len(STATS_COLUMNS)
+    return sorted(restaurant_id for restaurant_id in expected.keys() | stored.keys()
+                  if expected.get(restaurant_id, zero) != stored.get(restaurant_id, zero))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--verify", action="store_true", help="report restaurants whose stats are out of date")
+    group.add_argument("--rebuild", action="store_true", help="recompute the table from Reviews")
+    args = parser.parse_args()
+
+    connection = db.open_connection()
+    try:
+        if args.rebuild:
+            rebuild(connection)
+            print("RestaurantRatingStats rebuilt")
+        mismatched = verify(connection)
+        print(f"{len(mismatched)} restaurant(s) out of date: {mismatched}" if mismatched
+              else "RestaurantRatingStats matches Reviews")
+        if mismatched:
+            raise SystemExit(1)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+# ============================================
+# Restaurant / review data access layer
+# ============================================
+# Owns the read queries used by the pages. Results are memoized with
+# st.cache_data, shared across sessions and expire after CACHE_TTL_SECONDS,
+# so the database sees one query per interval instead of one per click.
+# Write paths call the matching invalidate_after_* helper so the next read
+# reflects the change immediately.
+#
+# The restaurant listings and the rating lookup are instead derived from
+# cached copies of Restaurants / RestaurantRatingStats that are kept current
+# incrementally (services/changes.py): after the first load only rows whose
+# updated_at moved are read again. The frames kept in memory get compact
+# dtypes (services/frames.py); descriptions are not part of them and are
+# fetched for the rows on screen only. The listings derived from the
+# restaurant table are built once per table version and shared by all
+# sessions.
+#
+# With READ_SOURCE=snapshot the loaders behind the read-only views (search,
+# map, status tab, rating lookup) read the local SQLite snapshot instead of
+# MySQL (services/snapshot.py); everything else, and all writes, use MySQL.
+
+import os
+import threading
+import time
+
+import streamlit as st
+import pandas as pd
+
+from services import changes, db, frames, profiling, proximity, rating_stats, reviews, search, snapshot, trigram, viewport
+
+CACHE_TTL_SECONDS = int(os.environ.get("CACHE_TTL_SECONDS", 300))
+
+# Restaurants joined with their price range and comma-joined cuisines
+RESTAURANT_CUISINE_QUERY = """
+    SELECT r.restaurant_id, r.name, r.website, r.is_active, pr.price_symbol,
+           GROUP_CONCAT(ct.cuisine_name) AS cuisines, r.latitude, r.longitude, r.updated_at
+    FROM Restaurants r
+    LEFT JOIN RestaurantPricing rp ON r.restaurant_id = rp.restaurant_id
+    LEFT JOIN PriceRanges pr ON rp.price_range_id = pr.price_range_id
+    LEFT JOIN RestaurantCuisines rc ON r.restaurant_id = rc.restaurant_id
+    LEFT JOIN CuisineTypes ct ON rc.cuisine_id = ct.cuisine_id
+    {where}
+    GROUP BY r.restaurant_id, r.name, r.website, r.is_active, pr.price_symbol,
+             r.latitude, r.longitude, r.updated_at
+"""
+# Columns of the Archive / Restore / status listings
+LISTING_COLUMNS = ["restaurant_id", "name", "website", "is_active", "price_symbol", "cuisines"]
+RESTAURANT_DTYPES = {"restaurant_id": "Int32", "name": "str", "website": "str", "is_active": "Int8",
+                     "price_symbol": "category", "cuisines": "category", "latitude": "float32",
+                     "longitude": "float32", "updated_at": "datetime64[s]"}
+RATING_DTYPES = {"restaurant_id": "Int32", "review_count": "Int32", "rating_sum": "Int32",
+                 "updated_at": "datetime64[s]"}
+REVIEW_DTYPES = {"review_id": "Int32", "restaurant_id": "Int32", "rating": "Int8", "review_text": "str",
+                 "created_at": "datetime64[s]", "restaurant_name": "category"}
+
+
+# --------------------------------------------
+# Read source of the read-only loaders
+# --------------------------------------------
+# Query results as a frame, from the snapshot or from MySQL (always MySQL
+# for readonly=False: data the write tabs act on)
+def _read_frame(query, params=None, readonly=True):
+    if not (readonly and snapshot.ENABLED):
+        return pd.read_sql(query, db.get_connection(), params=params)
+    snapshot.start_refresher(invalidate_after_snapshot)
+    connection = snapshot.connect()
+    try:
+        # Snapshot reads bypass the session connection's profiled cursors
+        with profiling.timed_query(query) as timing:
+            frame = pd.read_sql(snapshot.to_sqlite(query), connection, params=params)
+            timing.update(rows=len(frame), bytes=profiling.estimate_bytes(
+                list(frame.head(profiling.BYTES_SAMPLE_ROWS).itertuples(index=False, name=None)), len(frame)))
+        return frame
+    finally:
+        connection.close()
+
+
+# Query result rows, from the snapshot or from MySQL
+def _read_rows(query, params=(), readonly=True):
+    if not (readonly and snapshot.ENABLED):
+        cursor = db.get_connection().cursor()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+    snapshot.start_refresher(invalidate_after_snapshot)
+    connection = snapshot.connect()
+    try:
+        with profiling.timed_query(query) as timing:
+            rows = connection.execute(snapshot.to_sqlite(query), tuple(params)).fetchall()
+            timing.update(rows=len(rows), bytes=profiling.estimate_bytes(rows))
+        return rows
+    finally:
+        connection.close()
+
+
+# --------------------------------------------
+# Incrementally refreshed tables
+# --------------------------------------------
+# One cache per read source ("mysql", or "snapshot" for the read-only views
+# when READ_SOURCE=snapshot), shared by all sessions
+@st.cache_resource(show_spinner=False)
+def _restaurant_table(source):
+    return changes.new_table()
+
+
+@st.cache_resource(show_spinner=False)
+def _rating_table(source):
+    return changes.new_table()
+
+
+def _source(readonly):
+    return "snapshot" if readonly and snapshot.ENABLED else "mysql"
+
+
+# MySQL's clock for the change watermarks; the snapshot has none (it is
+# swapped in whole, so its newest updated_at is exact)
+def _clock(readonly):
+    if _source(readonly) == "snapshot":
+        return None
+    return lambda: _read_rows("SELECT CURRENT_TIMESTAMP", readonly=False)[0][0]
+
+
+# Name order, case-insensitive like the MySQL collation
+def _by_name(frame):
+    return frame.sort_values("name", key=lambda names: names.str.lower(), kind="stable", ignore_index=True)
+
+
+# Compact dtypes (again after a merge: categories are rebuilt), name order
+def _compact_by_name(frame):
+    return _by_name(frames.compact(frame, RESTAURANT_DTYPES))
+
+
+# Every restaurant with price, cuisines and coordinates, sorted by name: (frame, version)
+def _restaurants(readonly=True):
+    def load(where, params):
+        return _read_frame(RESTAURANT_CUISINE_QUERY.format(where=where), params, readonly)
+    return changes.refresh(_restaurant_table(_source(readonly)), load, "restaurant_id", _compact_by_name,
+                           "r.updated_at", _clock(readonly))
+
+
+# --------------------------------------------
+# Listings derived from the restaurant table
+# --------------------------------------------
+def _active_listing(frame):
+    return frame.loc[frame["is_active"] == 1, LISTING_COLUMNS].reset_index(drop=True)
+
+
+def _archived_listing(frame):
+    return frame.loc[frame["is_active"] == 0, LISTING_COLUMNS].reset_index(drop=True)
+
+
+def _status_listing(frame):
+    return (frame[LISTING_COLUMNS].sort_values("is_active", ascending=False, kind="stable", na_position="last")
+            .reset_index(drop=True))
+
+
+def _map_listing(frame):
+    on_map = (frame["is_active"] == 1) & frame["latitude"].notna() & frame["longitude"].notna()
+    return frame.loc[on_map, ["restaurant_id", "name", "latitude", "longitude", "price_symbol"]].reset_index(drop=True)
+
+
+LISTINGS = {"active": _active_listing, "archived": _archived_listing, "status": _status_listing,
+            "map": _map_listing}
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _build_listing(source, version, name, _frame):
+    return LISTINGS[name](_frame)
+
+
+# A listing shared by every session until the table changes. The shallow
+# copy shares the data (copy-on-write), so a page adding columns to it does
+# not touch the shared frame.
+def _listing(name, readonly=True):
+    frame, version = _restaurants(readonly)
+    return _build_listing(_source(readonly), version, name, frame).copy(deep=False)
+
+
+# Active restaurants (Archive tab)
+def load_active_restaurants():
+    return _listing("active", readonly=False)
+
+
+# Archived restaurants (Restore tab)
+def load_archived_restaurants():
+    return _listing("archived", readonly=False)
+
+
+# Every restaurant, active first (View All Status tab)
+def load_restaurant_status():
+    return _listing("status")
+
+
+# Coordinates and price of active restaurants (Find Food Near Me page)
+def load_map_restaurants():
+    return _listing("map")
+
+
+# Descriptions of the given restaurants ({restaurant_id: description}); the
+# pages fetch them for the rows they display
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=1000, show_spinner=False)
+def load_descriptions(restaurant_ids, readonly=True):
+    return _read_descriptions(restaurant_ids, readonly)
+
+
+# Uncached, in IN lists of DESCRIPTION_CHUNK ids
+DESCRIPTION_CHUNK = 1000
+
+
+def _read_descriptions(restaurant_ids, readonly=True):
+    ids = [int(rid) for rid in restaurant_ids]
+    descriptions = {}
+    for start in range(0, len(ids), DESCRIPTION_CHUNK):
+        chunk = ids[start:start + DESCRIPTION_CHUNK]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        descriptions.update(_read_rows(
+            f"SELECT restaurant_id, description FROM Restaurants WHERE restaurant_id IN ({placeholders})",
+            chunk, readonly))
+    return descriptions
+
+
+# The frame with a description column (frames from a query that already
+# selected it are returned as they are)
+def with_descriptions(restaurants, readonly=True):
+    if "description" in restaurants:
+        return restaurants
+    descriptions = load_descriptions(tuple(restaurants["restaurant_id"].tolist()), readonly)
+    return restaurants.assign(description=restaurants["restaurant_id"].map(descriptions))
+
+
+# Grid index over the map listing, built once per table version
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_grid_index(source, version, _frame):
+    return proximity.build_grid_index(_build_listing(source, version, "map", _frame))
+
+
+# Active restaurants near a point, from the grid index over the map listing
+# (PROXIMITY_SOURCE=index)
+def find_restaurants_nearby(lat, lng, radius_mi=None, k=None):
+    frame, version = _restaurants()
+    restaurants = _build_listing(_source(True), version, "map", frame)
+    index = _build_grid_index(_source(True), version, frame)
+    return proximity.find_nearby(restaurants, index, lat, lng, radius_mi=radius_mi, k=k)
+
+
+# Active restaurants near a point, prefiltered with a bounding-box query
+# (PROXIMITY_SOURCE=sql). For k-nearest the box doubles until it holds k rows.
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def find_restaurants_near(lat, lng, radius_mi=None, k=None):
+    radius = radius_mi or 1.0
+    while True:
+        query, params = proximity.build_bbox_query(*proximity.bounding_box(lat, lng, radius))
+        candidates = frames.compact(_read_frame(query, params), RESTAURANT_DTYPES)
+        candidates["distance_mi"] = proximity.haversine_mi(
+            lat, lng, candidates["latitude"].astype(float).to_numpy(), candidates["longitude"].astype(float).to_numpy())
+        nearby = candidates[candidates["distance_mi"] <= radius].sort_values("distance_mi", kind="stable")
+        if not k:
+            return nearby
+        if len(nearby) >= k or radius > 2 * proximity.EARTH_RADIUS_MI:
+            return nearby.head(k)
+        radius *= 2
+
+
+# Active restaurants inside one viewport tile (at most TILE_ROW_LIMIT rows)
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=1000, show_spinner=False)
+def load_tile_restaurants(tile):
+    query, params = proximity.build_bbox_query(*viewport.tile_bounds(tile), limit=viewport.TILE_ROW_LIMIT)
+    return frames.compact(_read_frame(query, params), RESTAURANT_DTYPES)
+
+
+# Active restaurants in the tiles covering the viewport; only tiles not seen
+# before (or expired) hit the database. Also reports whether any tile hit
+# its row limit (zooming in shows the rest).
+def load_viewport_restaurants(tiles):
+    tile_frames = [load_tile_restaurants(tile) for tile in tiles]
+    truncated = any(len(frame) >= viewport.TILE_ROW_LIMIT for frame in tile_frames)
+    return pd.concat(tile_frames, ignore_index=True), truncated
+
+
+# One page of Restaurant Search results plus the total match count
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def search_restaurants(name="", price="All", cuisines=(), page=0, page_size=search.PAGE_SIZE):
+    results = _read_frame(*search.build_search_query(name, price, cuisines, page, page_size))
+    total = _read_rows(*search.build_count_query(name, price, cuisines))[0][0]
+    return results, total
+
+
+# Active restaurants plus their cuisine membership and trigram name indexes,
+# shared read-only by all sessions (SEARCH_BACKEND=memory and search as you
+# type). Rebuilt when the restaurant table changed: the listing and the
+# cuisine matrix with array operations over the whole table, the trigram
+# index only for the changed rows (_update_name_index).
+def load_search_index():
+    frame, version = _restaurants()
+    return _build_search_index(_source(True), version, frame)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_search_index(source, version, _frame):
+    restaurants = _build_listing(source, version, "active", _frame)
+    stamps = _frame.loc[_frame["is_active"] == 1, "updated_at"]
+    watermark = _restaurant_table(source)["watermark"]
+    return {"restaurants": restaurants, "cuisine_index": search.build_cuisine_index(restaurants["cuisines"]),
+            "name_index": _update_name_index(source, restaurants, stamps, watermark)}
+
+
+# The last trigram name index of a source, the updated_at of the rows it was
+# built from and the restaurant table's watermark at the time
+@st.cache_resource(show_spinner=False)
+def _name_index_state(source):
+    return {"index": None, "stamps": None, "watermark": None, "built": 0.0, "lock": threading.Lock()}
+
+
+# Trigram index over the active restaurants' names and descriptions. Rows
+# whose updated_at moved, or is at or after the table watermark of the last
+# build (a second change within the same second keeps the stamp), are
+# indexed again, reading their descriptions only; the descriptions are not
+# kept. Built from scratch on the first call and every FULL_RELOAD_SECONDS.
+def _update_name_index(source, restaurants, stamps, watermark):
+    state = _name_index_state(source)
+    ids = restaurants["restaurant_id"].to_numpy(dtype="int64")
+    stamps = pd.Series(pd.to_datetime(stamps).to_numpy(), index=ids)
+    with state["lock"]:
+        now = time.monotonic()
+        if state["index"] is None or now - state["built"] > changes.FULL_RELOAD_SECONDS:
+            descriptions = dict(_read_rows("SELECT restaurant_id, description FROM Restaurants WHERE is_active = TRUE"))
+            index = trigram.build_trigram_index(restaurants["name"], restaurants["restaurant_id"].map(descriptions), ids)
+            state.update(built=now)
+        else:
+            previous = state["stamps"]
+            known = previous.reindex(ids)
+            unchanged = (known == stamps) | (known.isna() & stamps.isna() & known.index.isin(previous.index))
+            if state["watermark"] is not None:
+                unchanged &= ~(stamps >= pd.Timestamp(state["watermark"]))
+            changed = ~unchanged.to_numpy()
+            descriptions = _read_descriptions(ids[changed]) if changed.any() else {}
+            index = trigram.update_trigram_index(state["index"], ids[changed], restaurants["name"][changed],
+                                                 [descriptions.get(rid) for rid in ids[changed].tolist()], ids)
+        state.update(index=index, stamps=stamps, watermark=watermark)
+        return index
+
+
+# Cuisines offered by at least one active restaurant (search filter options)
+def load_cuisine_names():
+    frame, version = _restaurants()
+    return list(_build_cuisine_names(_source(True), version, frame))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_cuisine_names(source, version, _frame):
+    cuisines = _frame.loc[_frame["is_active"] == 1, "cuisines"].dropna()
+    return sorted(set(cuisines.str.split(",").explode()))
+
+
+# (restaurant_id, name) pairs of active restaurants for the select boxes
+def load_active_restaurant_names():
+    active = _listing("active", readonly=False)
+    return list(zip(active["restaurant_id"].tolist(), active["name"].tolist()))
+
+
+# Full record of one restaurant (Update tab)
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_restaurant_details(restaurant_id):
+    cursor = db.get_connection().cursor(dictionary=True)
+    cursor.execute("""
+        SELECT r.restaurant_id, r.name, r.street_address, r.city, r.state,
+               r.zip_code, r.phone, r.website, r.description,
+               r.latitude, r.longitude, r.is_active, pr.price_symbol
+        FROM Restaurants r
+        LEFT JOIN RestaurantPricing rp ON r.restaurant_id = rp.restaurant_id
+        LEFT JOIN PriceRanges pr ON rp.price_range_id = pr.price_range_id
+        WHERE r.restaurant_id = %s
+    """, (restaurant_id,))
+    details = cursor.fetchone()
+    cursor.close()
+    return details
+
+
+# All reviews with their restaurant name, newest first (Delete Review tab).
+# Held once for all sessions: st.cache_data would hand every rerun its own copy.
+def load_reviews():
+    return _load_reviews().copy(deep=False)
+
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _load_reviews():
+    query = """
+        SELECT rv.review_id, rv.restaurant_id, rv.rating, rv.review_text, rv.created_at,
+               r.name AS restaurant_name
+        FROM Reviews rv
+        INNER JOIN Restaurants r ON rv.restaurant_id = r.restaurant_id
+        ORDER BY rv.created_at DESC
+    """
+    return frames.compact(pd.read_sql(query, db.get_connection()), REVIEW_DTYPES)
+
+
+# One keyset page of reviews (View Reviews tab): (page frame, has_more)
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_review_page(restaurant_id=None, cursor=None, page_size=reviews.REVIEW_PAGE_SIZE):
+    query, params = reviews.build_review_page_query(restaurant_id, cursor, page_size)
+    page = pd.read_sql(query, db.get_connection(), params=params)
+    return page.head(page_size), len(page) > page_size
+
+
+# One page of reviews matching the keywords, most relevant first: (page frame, total)
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def search_reviews(text, restaurant_id=None, page=0, page_size=reviews.REVIEW_PAGE_SIZE):
+    connection = db.get_connection()
+    query, params = reviews.build_review_search_query(text, restaurant_id, page, page_size, db.DIALECT)
+    results = pd.read_sql(query, connection, params=params)
+
+    cursor = connection.cursor()
+    cursor.execute(*reviews.build_review_search_count_query(text, restaurant_id, db.DIALECT))
+    total = cursor.fetchone()[0]
+    cursor.close()
+    return results, total
+
+
+# Review count, average rating and star histogram for one restaurant (or all),
+# read from RestaurantRatingStats
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_rating_summary(restaurant_id=None):
+    cursor = db.get_connection().cursor()
+    cursor.execute(*rating_stats.build_summary_query(restaurant_id))
+    summary = rating_stats.summarize(cursor.fetchone())
+    cursor.close()
+    return summary
+
+
+# review_count / avg_rating of every reviewed restaurant, indexed by
+# restaurant_id. Pages join it onto their frames with with_ratings(), so a
+# new review only refreshes this small table, not the listings.
+def load_rating_lookup():
+    def load(where, params):
+        return _read_frame(f"SELECT restaurant_id, review_count, rating_sum, updated_at FROM RestaurantRatingStats {where}",
+                           params)
+    table = _rating_table(_source(True))
+    frame, version = changes.refresh(table, load, "restaurant_id",
+                                     lambda stats: frames.compact(stats, RATING_DTYPES).sort_values(
+                                         "restaurant_id", ignore_index=True),
+                                     clock=_clock(True),
+                                     count=lambda: _read_rows("SELECT COUNT(*) FROM RestaurantRatingStats")[0][0])
+    return _build_rating_lookup(_source(True), version, frame)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_rating_lookup(source, version, _frame):
+    stats = _frame[_frame["review_count"] > 0].set_index("restaurant_id")
+    stats["avg_rating"] = (stats["rating_sum"] / stats["review_count"]).astype(float).round(2)
+    return stats[["review_count", "avg_rating"]]
+
+
+# The restaurant frame with review_count (0 when unreviewed) and avg_rating columns
+def with_ratings(restaurants):
+    rated = restaurants.join(load_rating_lookup(), on="restaurant_id")
+    rated["review_count"] = rated["review_count"].fillna(0).astype(int)
+    return rated
+
+
+# (restaurant_id, name) pairs of restaurants that have reviews (review filter)
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_reviewed_restaurants():
+    cursor = db.get_connection().cursor()
+    cursor.execute("""
+        SELECT r.restaurant_id, r.name FROM Restaurants r
+        JOIN RestaurantRatingStats s ON s.restaurant_id = r.restaurant_id
+        WHERE s.review_count > 0
+        ORDER BY r.name
+    """)
+    restaurants = cursor.fetchall()
+    cursor.close()
+    return restaurants
+
+
+# --------------------------------------------
+# Cache invalidation for the write paths
+# --------------------------------------------
+# Writes land in MySQL; a snapshot-backed reader sees them after the next
+# rebuild, which the write triggers right away
+def _refresh_snapshot():
+    if snapshot.ENABLED:
+        snapshot.request_refresh()
+
+
+# The next read of the restaurant table pulls the rows this write changed
+def _restaurants_changed():
+    _refresh_snapshot()
+    for source in ("mysql", "snapshot"):
+        changes.mark_stale(_restaurant_table(source))
+    load_tile_restaurants.clear()
+    find_restaurants_near.clear()
+    search_restaurants.clear()
+
+
+def invalidate_after_archive():
+    _restaurants_changed()
+    load_restaurant_details.clear()
+
+
+def invalidate_after_restore():
+    invalidate_after_archive()
+
+
+def invalidate_after_add():
+    _restaurants_changed()
+
+
+def invalidate_after_update(restaurant_id):
+    _restaurants_changed()
+    load_restaurant_details.clear(restaurant_id)
+    load_descriptions.clear()
+    _load_reviews.clear()
+    load_review_page.clear()
+    search_reviews.clear()
+    load_reviewed_restaurants.clear()
+
+
+def invalidate_after_review_change():
+    _refresh_snapshot()
+    for source in ("mysql", "snapshot"):
+        changes.mark_stale(_rating_table(source))
+    _load_reviews.clear()
+    load_review_page.clear()
+    search_reviews.clear()
+    load_rating_summary.clear()
+    load_reviewed_restaurants.clear()
+
+
+# Called by the snapshot refresher after every rebuild
+def invalidate_after_snapshot():
+    changes.mark_stale(_restaurant_table("snapshot"))
+    changes.mark_stale(_rating_table("snapshot"))
+    find_restaurants_near.clear()
+    load_tile_restaurants.clear()
+    search_restaurants.clear()
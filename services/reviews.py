@@ -0,0 +1,108 @@
+# ============================================
+# View Reviews query builder
+# ============================================
+# Reviews are paged with a keyset on (created_at, review_id) instead of
+# OFFSET: every page is an index range scan that starts right after the last
+# review of the previous page, so page N costs the same as page 1. The
+# restaurant filter is part of the WHERE clause.
+#
+# Keyword search over review_text uses the full-text index instead of a
+# LIKE scan: MATCH ... AGAINST on MySQL's FULLTEXT index (migration 7), or
+# an FTS5 table kept in sync by triggers on the SQLite stand-in. Both are
+# maintained by the database on every insert and delete. The queries are
+# executed (and cached) by services/repository.py.
+
+import os
+import re
+
+REVIEW_PAGE_SIZE = int(os.environ.get("REVIEW_PAGE_SIZE", 20))
+
+
+# mysql-connector only converts plain datetimes, not pandas Timestamps
+def _plain(value):
+    return value.to_pydatetime() if hasattr(value, "to_pydatetime") else value
+
+
+# (created_at, review_id) of the last row of a page; the next page starts after it
+def page_cursor(page_df):
+    last = page_df.iloc[-1]
+    return _plain(last["created_at"]), int(last["review_id"])
+
+
+# One page of reviews, newest first, starting after `cursor`.
+# One extra row is fetched to tell whether another page follows.
+def build_review_page_query(restaurant_id=None, cursor=None, page_size=REVIEW_PAGE_SIZE):
+    clauses, params = [], []
+    if restaurant_id is not None:
+        clauses.append("rv.restaurant_id = %s")
+        params.append(int(restaurant_id))
+    if cursor is not None:
+        created_at, review_id = cursor
+        clauses.append("(rv.created_at < %s OR (rv.created_at = %s AND rv.review_id < %s))")
+        params.extend([created_at, created_at, int(review_id)])
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = f"""
+        SELECT rv.review_id, rv.restaurant_id, rv.rating, rv.review_text, rv.created_at,
+               r.name AS restaurant_name
+        FROM Reviews rv
+        INNER JOIN Restaurants r ON rv.restaurant_id = r.restaurant_id
+        {where}
+        ORDER BY rv.created_at DESC, rv.review_id DESC
+        LIMIT %s
+    """
+    return query, params + [page_size + 1]
+
+
+# --------------------------------------------
+# Full-text search
+# --------------------------------------------
+# User input -> full-text query requiring every word (as a prefix), or ""
+# when there is nothing to search for. Operators typed by the user are dropped.
+def match_expression(text, dialect="mysql"):
+    words = re.findall(r"\w+", text.lower())
+    if dialect == "sqlite":
+        return " ".join(f'"{word}"*' for word in words)
+    return " ".join(f"+{word}*" for word in words)
+
+
+# Relevance expression, FROM clause and match condition of each dialect
+FULLTEXT_SQL = {
+    "mysql": ("MATCH(rv.review_text) AGAINST (%s IN BOOLEAN MODE)",
+              "Reviews rv",
+              "MATCH(rv.review_text) AGAINST (%s IN BOOLEAN MODE)"),
+    "sqlite": ("-bm25(ReviewsFTS)",
+               "ReviewsFTS JOIN Reviews rv ON rv.review_id = ReviewsFTS.rowid",
+               "ReviewsFTS MATCH %s"),
+}
+
+
+def _search_filters(text, restaurant_id, dialect):
+    _, source, condition = FULLTEXT_SQL[dialect]
+    clauses, params = [condition], [match_expression(text, dialect)]
+    if restaurant_id is not None:
+        clauses.append("rv.restaurant_id = %s")
+        params.append(int(restaurant_id))
+    return source, " AND ".join(clauses), params
+
+
+# One page of reviews matching the keywords, most relevant first
+def build_review_search_query(text, restaurant_id=None, page=0, page_size=REVIEW_PAGE_SIZE, dialect="mysql"):
+    source, where, params = _search_filters(text, restaurant_id, dialect)
+    relevance = FULLTEXT_SQL[dialect][0]
+    relevance_params = params[:1] if "%s" in relevance else []
+    query = f"""
+        SELECT rv.review_id, rv.restaurant_id, rv.rating, rv.review_text, rv.created_at,
+               r.name AS restaurant_name, {relevance} AS relevance
+        FROM {source}
+        INNER JOIN Restaurants r ON rv.restaurant_id = r.restaurant_id
+        WHERE {where}
+        ORDER BY relevance DESC, rv.created_at DESC, rv.review_id DESC
+        LIMIT %s OFFSET %s
+    """
+    return query, relevance_params + params + [page_size, page * page_size]
+
+
+# Number of reviews matching the keywords (for the pager)
+def build_review_search_count_query(text, restaurant_id=None, dialect="mysql"):
+    source, where, params = _search_filters(text, restaurant_id, dialect)
+    return f"SELECT COUNT(*) FROM {source} WHERE {where}", params
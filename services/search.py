@@ -0,0 +1,136 @@
+# ============================================
+# Restaurant Search query builder
+# ============================================
+# Turns the name / price / cuisine filters of the Restaurant Search page into
+# one parameterized SQL statement so filtering and paging happen in MySQL.
+# Only the requested page of restaurants is transferred, and cuisines are
+# concatenated for the rows on that page only. The queries are executed
+# (and cached) by services/repository.py.
+#
+# With SEARCH_BACKEND=memory (or search as you type) the page instead filters
+# the cached active restaurant frame in pandas, using a precomputed
+# restaurant x cuisine boolean matrix so a multi-cuisine OR filter is a
+# single NumPy reduction, and the trigram index (services/trigram.py) for
+# typo-tolerant, ranked name matching.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from services import trigram
+
+PAGE_SIZE = int(os.environ.get("SEARCH_PAGE_SIZE", 50))
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "sql")
+
+PRICE_FILTER = """EXISTS (
+        SELECT 1 FROM RestaurantPricing rp
+        JOIN PriceRanges pr ON rp.price_range_id = pr.price_range_id
+        WHERE rp.restaurant_id = r.restaurant_id AND pr.price_symbol = %s)"""
+
+CUISINE_FILTER = """EXISTS (
+        SELECT 1 FROM RestaurantCuisines rc
+        JOIN CuisineTypes ct ON rc.cuisine_id = ct.cuisine_id
+        WHERE rc.restaurant_id = r.restaurant_id AND ct.cuisine_name IN ({placeholders}))"""
+
+
+# Escape LIKE wildcards so user input is matched literally
+def _like_pattern(text):
+    escaped = text.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return f"%{escaped}%"
+
+
+# WHERE clause and parameters shared by the page and count queries
+def build_filters(name="", price="All", cuisines=()):
+    clauses, params = ["r.is_active = TRUE"], []
+    if name:
+        clauses.append("r.name LIKE %s ESCAPE '!'")
+        params.append(_like_pattern(name))
+    if price and price != "All":
+        clauses.append(PRICE_FILTER)
+        params.append(price)
+    if cuisines:
+        clauses.append(CUISINE_FILTER.format(placeholders=", ".join(["%s"] * len(cuisines))))
+        params.extend(cuisines)
+    return " AND ".join(clauses), params
+
+
+# One page of matching restaurants, ordered by name
+def build_search_query(name="", price="All", cuisines=(), page=0, page_size=PAGE_SIZE):
+    where, params = build_filters(name, price, cuisines)
+    query = f"""
+        SELECT r.restaurant_id, r.name, r.description, r.website, pr.price_symbol,
+               GROUP_CONCAT(ct.cuisine_name) AS cuisines
+        FROM (
+            SELECT r.restaurant_id FROM Restaurants r
+            WHERE {where}
+            ORDER BY r.name, r.restaurant_id
+            LIMIT %s OFFSET %s
+        ) page
+        JOIN Restaurants r ON r.restaurant_id = page.restaurant_id
+        LEFT JOIN RestaurantPricing rp ON r.restaurant_id = rp.restaurant_id
+        LEFT JOIN PriceRanges pr ON rp.price_range_id = pr.price_range_id
+        LEFT JOIN RestaurantCuisines rc ON r.restaurant_id = rc.restaurant_id
+        LEFT JOIN CuisineTypes ct ON rc.cuisine_id = ct.cuisine_id
+        GROUP BY r.restaurant_id, r.name, r.description, r.website, pr.price_symbol
+        ORDER BY r.name, r.restaurant_id
+    """
+    return query, params + [page_size, page * page_size]
+
+
+# Number of restaurants matching the filters (for the pager)
+def build_count_query(name="", price="All", cuisines=()):
+    where, params = build_filters(name, price, cuisines)
+    return f"SELECT COUNT(*) FROM Restaurants r WHERE {where}", params
+
+
+# --------------------------------------------
+# In-memory filtering
+# --------------------------------------------
+# Build the cuisine membership index from the comma-joined `cuisines` column:
+# matrix[i, j] is True when row i serves cuisines[j]. Only the distinct
+# combinations (the column's categories) are split; rows take their
+# combination's row of the matrix.
+def build_cuisine_index(cuisines_column):
+    column = cuisines_column.astype("category")
+    lists = pd.Series(column.cat.categories, dtype=object).str.split(",")
+    rows = np.repeat(np.arange(len(lists)), lists.str.len().to_numpy())
+    names = lists.explode().to_numpy(dtype=object)
+    keep = names != ""
+    codes, columns = pd.factorize(names[keep], sort=True)
+    # The extra last row (no cuisines) is picked by the code -1 of missing values
+    by_combination = np.zeros((len(lists) + 1, len(columns)), dtype=bool)
+    by_combination[rows[keep], codes] = True
+    matrix = by_combination[column.cat.codes.to_numpy()]
+    cuisines = columns.tolist()
+    return {"cuisines": cuisines, "matrix": matrix,
+            "positions": {name: i for i, name in enumerate(cuisines)}}
+
+
+# Rows serving any of the selected cuisines
+def cuisine_mask(index, selected):
+    columns = [index["positions"][c] for c in selected if c in index["positions"]]
+    if not columns:
+        return np.zeros(len(index["matrix"]), dtype=bool)
+    return index["matrix"][:, columns].any(axis=1)
+
+
+# Apply the search filters to the cached restaurant frame; returns (page, total).
+# With a trigram name_index the name filter is typo-tolerant and results are
+# ranked by similarity (prefix=True for search as you type).
+def filter_restaurants(df, index, name="", price="All", cuisines=(), page=0, page_size=PAGE_SIZE,
+                       name_index=None, prefix=False):
+    mask = np.ones(len(df), dtype=bool)
+    if name and name_index is None:
+        mask &= df["name"].str.contains(name, case=False, regex=False, na=False).to_numpy()
+    if price and price != "All":
+        mask &= (df["price_symbol"] == price).to_numpy()
+    if cuisines:
+        mask &= cuisine_mask(index, cuisines)
+    if name and name_index is not None:
+        ranked, _ = trigram.search(name_index, name, prefix=prefix)
+        matches = ranked[mask[ranked]]
+    else:
+        matches = np.flatnonzero(mask)
+    start = page * page_size
+    return df.iloc[matches[start:start + page_size]], len(matches)
@@ -0,0 +1,94 @@
+# ============================================
+# Paginated selection grid
+# ============================================
+# One st.data_editor with a checkbox column per page of rows, instead of an
+# st.columns + st.checkbox row per record. The selection lives in a set in
+# st.session_state[state_key], so membership checks are O(1) and a rerun
+# only builds widgets for the current page. Buttons change state through
+# on_click callbacks, so the grid also works inside an st.fragment (a click
+# reruns only the fragment).
+
+import os
+
+import streamlit as st
+
+PAGE_SIZE = int(os.environ.get("SELECTION_PAGE_SIZE", 50))
+
+
+def get_selection(state_key):
+    if not isinstance(st.session_state.get(state_key), set):
+        st.session_state[state_key] = set()
+    return st.session_state[state_key]
+
+
+# The editor keeps its own per-row edits; bumping the version gives it a fresh
+# key so programmatic changes (select all, clear, after a commit) show up
+def _reset_editor(state_key):
+    st.session_state[f"{state_key}_version"] = st.session_state.get(f"{state_key}_version", 0) + 1
+
+
+# Add the given ids (the rows on the current page) to the selection
+def select_page(state_key, ids):
+    get_selection(state_key).update(ids)
+    _reset_editor(state_key)
+
+
+def clear_selection(state_key):
+    st.session_state[state_key] = set()
+    _reset_editor(state_key)
+
+
+def _set_page(state_key, page):
+    st.session_state[f"{state_key}_page"] = page
+
+
+# Render one page of df with a "Select" checkbox column and a pager; returns
+# the selected ids (across all pages). extend_page(page_rows) can add columns
+# loaded for the visible rows only (descriptions). select_buttons adds
+# "Select This Page" (only the rows on screen) and "Deselect All" above it.
+def selection_grid(df, state_key, id_column, columns, column_config=None, page_size=PAGE_SIZE, extend_page=None,
+                   select_buttons=False):
+    selected = get_selection(state_key)
+    page_count = max((len(df) - 1) // page_size + 1, 1)
+    page = min(st.session_state.get(f"{state_key}_page", 0), page_count - 1)
+    page_rows = df.iloc[page * page_size:(page + 1) * page_size]
+    if extend_page:
+        page_rows = extend_page(page_rows)
+    page_ids = page_rows[id_column].tolist()
+
+    if select_buttons:
+        col1, col2, _ = st.columns([1, 1, 3])
+        with col1:
+            st.button(f"✅ Select This Page ({len(page_ids)})", key=f"{state_key}_select_page",
+                      on_click=select_page, args=(state_key, page_ids))
+        with col2:
+            st.button("❌ Deselect All", key=f"{state_key}_deselect_all", on_click=clear_selection, args=(state_key,))
+
+    view = page_rows[columns].reset_index(drop=True)
+    view.insert(0, "Select", [rid in selected for rid in page_ids])
+    version = st.session_state.get(f"{state_key}_version", 0)
+    edited = st.data_editor(
+        view,
+        key=f"{state_key}_editor_{page}_{version}",
+        hide_index=True,
+        use_container_width=True,
+        disabled=columns,
+        column_config={"Select": st.column_config.CheckboxColumn("Select", width="small"), **(column_config or {})},
+    )
+    for rid, checked in zip(page_ids, edited["Select"].tolist()):
+        if checked:
+            selected.add(rid)
+        else:
+            selected.discard(rid)
+
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("⬅️ Previous", key=f"{state_key}_prev", disabled=page == 0,
+                      on_click=_set_page, args=(state_key, page - 1))
+        with col2:
+            st.markdown(f"<p style='text-align:center;'>Page {page + 1} of {page_count}</p>", unsafe_allow_html=True)
+        with col3:
+            st.button("Next ➡️", key=f"{state_key}_next", disabled=page >= page_count - 1,
+                      on_click=_set_page, args=(state_key, page + 1))
+    return selected
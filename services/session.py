@@ -0,0 +1,62 @@
+# ============================================
+# Database connection for the app pages
+# ============================================
+# A page calls connect() before it reads or writes data; streamlit_app.py
+# returns the connection to the pool once the page has run. A fragment rerun
+# does not run streamlit_app.py, so page fragments use fragment() below,
+# which returns it when the fragment ends. Pages without data (Home) never
+# check one out. Read-only pages call connect_reader(),
+# which skips MySQL entirely when they are served from the local snapshot.
+
+import functools
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from mysql.connector import Error
+
+from services import db, migrations, snapshot
+
+
+# Warm connection from the shared pool, or None when the database is
+# unreachable. Pending schema migrations are applied once per server process.
+def connect():
+    try:
+        connection = db.get_connection()
+        st.sidebar.success("✅ Connected to group02 database")
+    except Error as e:
+        st.sidebar.error(f"❌ DB Connection Failed: {e}")
+        return None
+    try:
+        migrations.ensure_schema()
+    except Error as e:
+        st.sidebar.warning(f"Note: schema migrations - {e}")
+    return connection
+
+
+# True when the read-only pages can load data: from the local snapshot
+# (READ_SOURCE=snapshot, no MySQL connection needed) or from MySQL
+def connect_reader():
+    if not snapshot.ENABLED:
+        return connect() is not None
+    built_at = snapshot.built_at()
+    if built_at is not None:
+        st.sidebar.info(f"📦 Reading from the local snapshot of {time.strftime('%b %d %H:%M', time.localtime(built_at))}")
+    if snapshot.last_error():
+        st.sidebar.warning(f"Snapshot refresh failed: {snapshot.last_error()}")
+    return True
+
+
+# st.fragment that returns the session's connection to the pool at the end
+# of a fragment rerun (also on st.rerun or an error). In a full rerun the
+# connection stays checked out for the rest of the page.
+def fragment(func):
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            context = get_script_run_ctx()
+            if context is not None and context.fragment_ids_this_run:
+                db.release_connection()
+    return st.fragment(run)
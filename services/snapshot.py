@@ -0,0 +1,293 @@
+# ============================================
+# Local read-replica snapshot (READ_SOURCE=snapshot)
+# ============================================
+# The read-only views (Restaurant Search, Find Food Near Me, the status tab)
+# can be served from a local SQLite copy of the restaurant tables instead of
+# the remote MySQL database. A background thread refreshes the copy every
+# SNAPSHOT_REFRESH_SECONDS on its own MySQL connection, into a temporary file
+# that atomically replaces the old one; readers open it read-only and
+# memory-mapped. Writes still go to MySQL and wake the refresher
+# (request_refresh), so the snapshot catches up within one refresh.
+#
+# A refresh copies only the restaurants and rating stats stamped (updated_at)
+# since the previous refresh started, by MySQL's clock (kept in the
+# SnapshotInfo table; see services/changes.py for the overlap), plus the
+# small lookup tables; the whole copy is rebuilt every FULL_RELOAD_SECONDS.
+#
+# With SNAPSHOT_REFRESH_SECONDS=0 the snapshot is never refreshed, so the read
+# pages run offline against whatever file SNAPSHOT_PATH points at (a fixture).
+#
+#   python -m services.snapshot          # build the snapshot now
+#   python -m services.snapshot --info   # show its age and row counts
+
+import argparse
+import datetime
+import os
+import pathlib
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from decimal import Decimal
+
+import streamlit as st
+import mysql.connector
+
+from services import changes, db
+
+ENABLED = os.environ.get("READ_SOURCE", "mysql") == "snapshot"
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "group02_snapshot.db"))
+REFRESH_SECONDS = int(os.environ.get("SNAPSHOT_REFRESH_SECONDS", 600))
+MMAP_BYTES = int(os.environ.get("SNAPSHOT_MMAP_BYTES", 256 * 1024 * 1024))
+COPY_CHUNK_ROWS = 5000
+
+# Tables copied into the snapshot, and the indexes the read queries rely on
+TABLES = ["Restaurants", "PriceRanges", "RestaurantPricing", "CuisineTypes",
+          "RestaurantCuisines", "RestaurantRatingStats"]
+# Incremental refresh: small tables copied whole, and the restaurant_id
+# tables refreshed for the ids whose updated_at (in the first table) moved
+LOOKUP_TABLES = ["PriceRanges", "CuisineTypes"]
+TRACKED_TABLES = [["Restaurants", "RestaurantPricing", "RestaurantCuisines"], ["RestaurantRatingStats"]]
+ID_BATCH_SIZE = 500
+INDEXES = [
+    "CREATE UNIQUE INDEX idx_restaurants_id ON Restaurants (restaurant_id)",
+    "CREATE INDEX idx_restaurants_active_name ON Restaurants (is_active, name)",
+    "CREATE INDEX idx_restaurants_lat_lng ON Restaurants (latitude, longitude)",
+    "CREATE UNIQUE INDEX idx_price_ranges_id ON PriceRanges (price_range_id)",
+    "CREATE UNIQUE INDEX idx_restaurant_pricing_id ON RestaurantPricing (restaurant_id)",
+    "CREATE UNIQUE INDEX idx_cuisine_types_id ON CuisineTypes (cuisine_id)",
+    "CREATE INDEX idx_restaurant_cuisines_restaurant ON RestaurantCuisines (restaurant_id, cuisine_id)",
+    "CREATE INDEX idx_restaurant_cuisines_cuisine ON RestaurantCuisines (cuisine_id)",
+    "CREATE UNIQUE INDEX idx_rating_stats_id ON RestaurantRatingStats (restaurant_id)",
+    "CREATE INDEX idx_restaurants_updated ON Restaurants (updated_at)",
+    "CREATE INDEX idx_rating_stats_updated ON RestaurantRatingStats (updated_at)",
+]
+
+_refresh_requested = threading.Event()
+_last_error = {"message": None}
+_last_full_build = {"at": time.monotonic()}
+
+
+# MySQL values sqlite3 cannot store as-is
+def _plain(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat(sep=" ") if isinstance(value, datetime.datetime) else value.isoformat()
+    return value
+
+
+# --------------------------------------------
+# Build
+# --------------------------------------------
+# Copy the rows of a MySQL query into a snapshot table (created from the
+# result columns when create=True)
+def _copy(cursor, snapshot, table, query, params=(), create=False):
+    cursor.execute(query, params)
+    columns = [column[0] for column in cursor.description]
+    if create:
+        snapshot.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+    insert = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+    rows = cursor.fetchmany(COPY_CHUNK_ROWS)
+    while rows:
+        snapshot.executemany(insert, [tuple(_plain(value) for value in row) for row in rows])
+        rows = cursor.fetchmany(COPY_CHUNK_ROWS)
+
+
+# MySQL's clock, and a one-row table recording it in the snapshot: the next
+# refresh copies the rows stamped since then
+def _now(cursor):
+    cursor.execute("SELECT CURRENT_TIMESTAMP")
+    return _plain(cursor.fetchone()[0])
+
+
+def _record_as_of(snapshot, as_of):
+    snapshot.execute("CREATE TABLE IF NOT EXISTS SnapshotInfo (as_of TEXT)")
+    snapshot.execute("DELETE FROM SnapshotInfo")
+    snapshot.execute("INSERT INTO SnapshotInfo (as_of) VALUES (?)", (as_of,))
+
+
+# A new empty file next to `path` (same filesystem, so os.replace is atomic).
+# Each build / update gets its own, so a `python -m services.snapshot` run and
+# the app's refresher never write the same temporary file.
+def _temporary_file(path):
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or ".", prefix=".snapshot-", suffix=".tmp",
+                                     delete=False) as f:
+        return f.name
+
+
+# Copy TABLES from a MySQL connection into a new SQLite file at `path`
+def build(connection, path=SNAPSHOT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = _temporary_file(path)
+    try:
+        snapshot = sqlite3.connect(temporary)
+        cursor = connection.cursor()
+        try:
+            as_of = _now(cursor)
+            for table in TABLES:
+                _copy(cursor, snapshot, table, f"SELECT * FROM {table}", create=True)
+            for statement in INDEXES:
+                snapshot.execute(statement)
+            snapshot.execute("ANALYZE")
+            _record_as_of(snapshot, as_of)
+            snapshot.commit()
+        finally:
+            cursor.close()
+            snapshot.close()
+        # Readers still holding the old file keep reading it; new ones get this one
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+# Bring an existing snapshot file up to date with the rows changed since it
+# was last refreshed. Returns False (nothing replaced) when the file cannot be
+# updated that way (built before migration 8, without SnapshotInfo, or rows
+# were deleted in MySQL).
+def update(connection, path=SNAPSHOT_PATH):
+    temporary = _temporary_file(path)
+    try:
+        shutil.copyfile(path, temporary)
+        if not _update_copy(connection, temporary):
+            return False
+        os.replace(temporary, path)
+        return True
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+# Apply the rows changed since the copy's as_of to the copy in place; False
+# when that cannot bring it up to date
+def _update_copy(connection, temporary):
+    snapshot = sqlite3.connect(temporary)
+    cursor = connection.cursor()
+    try:
+        previous = snapshot.execute("SELECT as_of FROM SnapshotInfo").fetchone()[0]
+        as_of = _now(cursor)
+        for table in LOOKUP_TABLES:
+            snapshot.execute(f"DELETE FROM {table}")
+            _copy(cursor, snapshot, table, f"SELECT * FROM {table}")
+        for tables in TRACKED_TABLES:
+            cursor.execute(f"SELECT restaurant_id FROM {tables[0]} WHERE updated_at >= %s", (changes.since(previous),))
+            changed_ids = [row[0] for row in cursor.fetchall()]
+            for start in range(0, len(changed_ids), ID_BATCH_SIZE):
+                batch = changed_ids[start:start + ID_BATCH_SIZE]
+                placeholders = ", ".join(["%s"] * len(batch))
+                for table in tables:
+                    snapshot.execute(f"DELETE FROM {table} WHERE restaurant_id IN ({to_sqlite(placeholders)})", batch)
+                    _copy(cursor, snapshot, table, f"SELECT * FROM {table} WHERE restaurant_id IN ({placeholders})", batch)
+            # Rows deleted in MySQL (rating_stats --rebuild) stay in the copy:
+            # a different row count means only a full build is correct
+            if changed_ids:
+                cursor.execute(f"SELECT COUNT(*) FROM {tables[0]}")
+                if cursor.fetchone()[0] != snapshot.execute(f"SELECT COUNT(*) FROM {tables[0]}").fetchone()[0]:
+                    return False
+        _record_as_of(snapshot, as_of)
+        snapshot.commit()
+    except sqlite3.OperationalError:
+        # Snapshot from before migration 8 (no SnapshotInfo table)
+        return False
+    finally:
+        cursor.close()
+        snapshot.close()
+    return True
+
+
+# Refresh from MySQL on a dedicated connection (pooled connections belong to
+# sessions): incrementally when possible, in full on the first run without a
+# file and every FULL_RELOAD_SECONDS
+def refresh():
+    connection = db.open_connection()
+    try:
+        full_due = time.monotonic() - _last_full_build["at"] > changes.FULL_RELOAD_SECONDS
+        if full_due or not os.path.exists(SNAPSHOT_PATH) or not update(connection):
+            build(connection)
+            _last_full_build["at"] = time.monotonic()
+    finally:
+        connection.close()
+
+
+# --------------------------------------------
+# Background refresh
+# --------------------------------------------
+def _refresh_loop(on_refresh):
+    while True:
+        _refresh_requested.wait(REFRESH_SECONDS)
+        _refresh_requested.clear()
+        try:
+            refresh()
+        except (mysql.connector.Error, sqlite3.Error, OSError) as e:
+            # Keep serving the previous snapshot; the read pages show the error
+            _last_error["message"] = str(e)
+            continue
+        _last_error["message"] = None
+        on_refresh()
+
+
+# Start the refresher once per server process. on_refresh runs after every
+# rebuild (the repository clears its snapshot-backed caches). Without a
+# snapshot file the first reader waits for the initial copy.
+@st.cache_resource(show_spinner=False)
+def start_refresher(_on_refresh):
+    if not os.path.exists(SNAPSHOT_PATH):
+        refresh()
+    if REFRESH_SECONDS > 0:
+        if time.time() - os.path.getmtime(SNAPSHOT_PATH) > REFRESH_SECONDS:
+            _refresh_requested.set()
+        threading.Thread(target=_refresh_loop, args=(_on_refresh,), name="snapshot-refresh", daemon=True).start()
+    return True
+
+
+# Called by the write paths so the snapshot picks up the change soon
+def request_refresh():
+    _refresh_requested.set()
+
+
+# --------------------------------------------
+# Reads
+# --------------------------------------------
+# Read-only, memory-mapped connection to the current snapshot file
+def connect():
+    uri = pathlib.Path(SNAPSHOT_PATH).absolute().as_uri() + "?mode=ro"
+    connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    connection.execute(f"PRAGMA mmap_size = {MMAP_BYTES}")
+    return connection
+
+
+# The repository's queries use MySQL placeholders
+def to_sqlite(query):
+    return query.replace("%s", "?")
+
+
+# Unix time of the current snapshot, or None before the first build
+def built_at():
+    return os.path.getmtime(SNAPSHOT_PATH) if os.path.exists(SNAPSHOT_PATH) else None
+
+
+def last_error():
+    return _last_error["message"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--info", action="store_true", help="show the snapshot's age and row counts without rebuilding")
+    args = parser.parse_args()
+
+    if not args.info:
+        refresh()
+        print(f"Snapshot written to {SNAPSHOT_PATH}")
+    if built_at() is None:
+        raise SystemExit(f"No snapshot at {SNAPSHOT_PATH}")
+    print(f"{SNAPSHOT_PATH}: built {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(built_at()))}")
+    connection = connect()
+    for table in TABLES:
+        print(f"  {table}: {connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]} rows")
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# ============================================
+# SQLite backend (DB_BACKEND=sqlite)
+# ============================================
+# Runs the app against a local SQLite file, such as a stand-in database
+# generated by benchmarks/standin.py, instead of MySQL. The connection
+# looks like a mysql-connector one to the rest of the app:
+#   - %s placeholders, plus NOW() and SELECT ... FOR UPDATE, are translated
+#   - @@auto_increment_increment reads 1 (SQLite ids always step by 1)
+#   - cursor(dictionary=True) returns dict rows
+#   - lastrowid of a multi-row INSERT is the first new id, as in MySQL
+#   - errors are raised as mysql.connector.Error, so the pages' error
+#     handling is unchanged
+# The stand-in already has the current schema, so migrations are skipped.
+
+import re
+import sqlite3
+
+from mysql.connector import Error
+
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE)
+
+
+# MySQL-flavoured statement -> SQLite
+def translate(query):
+    return _FOR_UPDATE.sub("", query.replace("%s", "?").replace("NOW()", "CURRENT_TIMESTAMP")
+                           .replace("@@auto_increment_increment", "1"))
+
+
+class Cursor:
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+        self._lastrowid = None
+
+    def execute(self, query, params=()):
+        try:
+            self._cursor.execute(translate(query), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+        # SQLite reports the last id of a multi-row INSERT, MySQL the first
+        self._lastrowid = self._cursor.lastrowid
+        if self._cursor.rowcount > 1 and query.lstrip()[:6].upper() == "INSERT":
+            self._lastrowid -= self._cursor.rowcount - 1
+
+    def executemany(self, query, seq_params):
+        try:
+            self._cursor.executemany(translate(query), seq_params)
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([column[0] for column in self._cursor.description], row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class Connection:
+    def __init__(self, path):
+        # Streamlit runs reruns on different threads
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+    def cursor(self, dictionary=False, **kwargs):
+        return Cursor(self._connection.cursor(), dictionary)
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self._connection.close()
+
+
+def connect(path):
+    return Connection(path)
@@ -0,0 +1,216 @@
+# ============================================
+# Trigram index for fuzzy restaurant name search
+# ============================================
+# Every name and description is lower-cased, reduced to letters / digits and
+# cut into overlapping 3-character grams ("  pizza " -> "  p", " pi", "piz",
+# "izz", "zza", "za "). An inverted index maps each trigram to the rows that
+# contain it, so a query only touches the posting lists of its own trigrams:
+# counting hits per row ranks typo'd ("pizzza") and partial ("piz") queries
+# without scanning the table.
+#
+# Rows are identified by a key (the restaurant id), so a data change does not
+# rebuild the index: update_trigram_index() indexes the changed rows as a
+# new segment and hides their old entries; small segments are merged with
+# array operations (no text processing) once there are MAX_SEGMENTS of them,
+# and everything is merged when a quarter of the entries are hidden.
+# search() returns positions in the row order given to the last build or
+# update (the cached search frame in services/repository.py).
+
+import os
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Share of the query's trigrams a row must contain to count as a match
+MIN_SIMILARITY = float(os.environ.get("FUZZY_MIN_SIMILARITY", 0.5))
+# Description hits rank below name hits
+DESCRIPTION_WEIGHT = 0.5
+# Segments before the ones added by updates are merged
+MAX_SEGMENTS = 8
+
+
+ACCENTS = "[\u0300-\u036f]"
+SEPARATORS = r"[\W_]+"
+
+
+# Lower-case, drop accents, keep letters and digits, and pad every word so its
+# first and last letters form their own trigrams
+def normalize(texts):
+    words = (texts.fillna("").astype(str).str.lower().str.normalize("NFKD")
+             .str.replace(ACCENTS, "", regex=True)
+             .str.replace(SEPARATORS, " ", regex=True).str.strip())
+    return "  " + words.str.replace(" ", "   ", regex=False) + " "
+
+
+# normalize() for a single query string
+def normalize_query(text):
+    words = re.sub(ACCENTS, "", unicodedata.normalize("NFKD", str(text).lower()))
+    words = re.sub(SEPARATORS, " ", words).strip()
+    return "  " + words.replace(" ", "   ") + " "
+
+
+# Trigram codes of one normalized string: three code points packed in an int64
+def _codes(chars):
+    return (chars[:-2].astype(np.int64) << 42) | (chars[1:-1].astype(np.int64) << 21) | chars[2:]
+
+
+# Sorted distinct values (sort + neighbour compare; faster than np.unique on
+# large integer arrays)
+def _distinct(values):
+    values = np.sort(values)
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = values[1:] != values[:-1]
+    return values[keep]
+
+
+# (code, row) of every trigram in a column of normalized strings
+def _trigrams(texts):
+    # All strings in one UTF-32 buffer, separated by NUL so no trigram spans two rows
+    buffer = np.frombuffer("\0".join(texts).encode("utf-32-le"), dtype=np.uint32)
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), texts.str.len().to_numpy() + 1)[:len(buffer)]
+    keep = (buffer[:-2] != 0) & (buffer[1:-1] != 0) & (buffer[2:] != 0)
+    return _codes(buffer)[keep], rows[:-2][keep]
+
+
+# Postings (CSR): the rows containing vocabulary[i] are rows[starts[i]:starts[i + 1]].
+# Also returns each row's number of distinct trigrams.
+def _postings(codes, rows, vocabulary, row_count):
+    pairs = _distinct(np.searchsorted(vocabulary, codes) * row_count + rows)
+    term_ids, rows = pairs // row_count, pairs % row_count
+    starts = np.searchsorted(term_ids, np.arange(len(vocabulary) + 1))
+    return starts, rows, np.bincount(rows, minlength=row_count)
+
+
+# One segment from (code, row) pairs of the name and description fields
+def _segment(name_pairs, description_pairs, row_count):
+    vocabulary = _distinct(np.concatenate([name_pairs[0], description_pairs[0]]))
+    name_starts, name_rows, name_sizes = _postings(*name_pairs, vocabulary, row_count)
+    description_starts, description_rows, _ = _postings(*description_pairs, vocabulary, row_count)
+    return {"vocabulary": vocabulary, "name": (name_starts, name_rows),
+            "description": (description_starts, description_rows), "name_sizes": name_sizes}
+
+
+# Segment over new name and description texts
+def _text_segment(names, descriptions):
+    names = pd.Series(names).reset_index(drop=True)
+    descriptions = pd.Series(descriptions).reset_index(drop=True)
+    return _segment(_trigrams(normalize(names)), _trigrams(normalize(descriptions)), len(names))
+
+
+# The index over its segments: keys[slot], alive[slot] (false once the
+# key was indexed again) and positions[slot] (row in the current order, -1
+# when hidden or no longer in it)
+def _index(segments, keys, alive, order):
+    order = np.asarray(order, dtype=np.int64)
+    positions = np.full(len(keys), -1, dtype=np.int64)
+    if len(order) and len(keys):
+        sorter = np.argsort(order, kind="stable")
+        found = sorter[np.minimum(np.searchsorted(order, keys, sorter=sorter), len(order) - 1)]
+        present = alive & (order[found] == keys)
+        positions[present] = found[present]
+    name_sizes = np.concatenate([segment["name_sizes"] for segment in segments]) if segments else np.zeros(0, np.int64)
+    return {"segments": segments, "keys": keys, "alive": alive, "positions": positions, "name_sizes": name_sizes}
+
+
+# Merge segments[first:] into one, dropping hidden entries, from their
+# postings alone
+def _merge(segments, keys, alive, first):
+    offset = sum(len(segment["name_sizes"]) for segment in segments[:first])
+    tail = alive[offset:]
+    renumber = np.cumsum(tail) - 1
+    row_count = int(tail.sum())
+    pairs = []
+    for field in ("name", "description"):
+        codes, rows, start = [], [], 0
+        for segment in segments[first:]:
+            starts, segment_rows = segment[field]
+            codes.append(np.repeat(segment["vocabulary"], np.diff(starts)))
+            rows.append(segment_rows + start)
+            start += len(segment["name_sizes"])
+        codes, rows = np.concatenate(codes), np.concatenate(rows)
+        keep = tail[rows]
+        pairs.append((codes[keep], renumber[rows[keep]]))
+    merged = [_segment(*pairs, row_count)] if row_count else []
+    return (segments[:first] + merged, np.concatenate([keys[:offset], keys[offset:][tail]]),
+            np.concatenate([alive[:offset], np.ones(row_count, dtype=bool)]))
+
+
+# Inverted trigram index over the name and description columns. keys
+# (default: the row positions) identify the rows for update_trigram_index().
+def build_trigram_index(names, descriptions, keys=None):
+    keys = np.arange(len(names), dtype=np.int64) if keys is None else np.asarray(keys, dtype=np.int64)
+    return _index([_text_segment(names, descriptions)], keys, np.ones(len(keys), dtype=bool), keys)
+
+
+# The index with the rows of `keys` (re)indexed from their new texts and
+# search positions following `order` (the keys of the current rows in row
+# order). Keys not in `order` are dropped: a key that comes back must be
+# passed in `keys` again. Costs as much as the changed rows, plus array work
+# on the slot arrays.
+def update_trigram_index(index, keys, names, descriptions, order):
+    segments, all_keys, alive = index["segments"], index["keys"], index["alive"]
+    keys = np.asarray(keys, dtype=np.int64)
+    alive = alive & ~np.isin(all_keys, keys) & np.isin(all_keys, np.asarray(order, dtype=np.int64))
+    if len(keys):
+        segments = segments + [_text_segment(names, descriptions)]
+        all_keys = np.concatenate([all_keys, keys])
+        alive = np.concatenate([alive, np.ones(len(keys), dtype=bool)])
+    if (~alive).sum() * 4 > len(alive):
+        segments, all_keys, alive = _merge(segments, all_keys, alive, 0)
+    elif len(segments) > MAX_SEGMENTS:
+        segments, all_keys, alive = _merge(segments, all_keys, alive, 1)
+    return _index(segments, all_keys, alive, order)
+
+
+# Distinct trigram codes of a query. In prefix mode the last word is not
+# closed, so "piz" also matches "pizza" and "pizzeria" (search as you type).
+def query_trigrams(text, prefix=False):
+    normalized = normalize_query(text)
+    if prefix:
+        normalized = normalized[:-1]
+    if len(normalized.strip()) == 0:
+        return np.empty(0, dtype=np.int64)
+    return _distinct(_codes(np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32)))
+
+
+# Number of the query's trigrams in every row of one field of a segment
+# (one pass over the posting lists of the query's trigrams)
+def _hits(segment, field, term_ids):
+    starts, rows = segment[field]
+    matched = [rows[starts[t]:starts[t + 1]] for t in term_ids]
+    if not matched:
+        return np.zeros(len(segment["name_sizes"]), dtype=np.int64)
+    return np.bincount(np.concatenate(matched), minlength=len(segment["name_sizes"]))
+
+
+# (positions, scores) of the rows matching a name query, best first.
+# score = share of the query's trigrams found in the name (plus a Jaccard
+# tiebreak that favours names of similar length), or DESCRIPTION_WEIGHT x the
+# share found in the description when that is higher.
+def search(index, text, prefix=False, min_similarity=MIN_SIMILARITY):
+    query = query_trigrams(text, prefix)
+    if len(query) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    name_hits, description_hits = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for segment in index["segments"]:
+        vocabulary = segment["vocabulary"]
+        positions = np.minimum(np.searchsorted(vocabulary, query), max(len(vocabulary) - 1, 0))
+        term_ids = positions[vocabulary[positions] == query] if len(vocabulary) else positions[:0]
+        name_hits.append(_hits(segment, "name", term_ids))
+        description_hits.append(_hits(segment, "description", term_ids))
+    name_hits, description_hits = np.concatenate(name_hits), np.concatenate(description_hits)
+
+    needed = min_similarity * len(query)
+    slots = np.flatnonzero((np.maximum(name_hits, description_hits) >= needed) & (index["positions"] >= 0))
+    rows = index["positions"][slots]
+
+    name_hits, description_hits = name_hits[slots], description_hits[slots]
+    jaccard = name_hits / (len(query) + index["name_sizes"][slots] - name_hits)
+    scores = np.maximum(np.where(name_hits >= needed, name_hits / len(query) + 0.1 * jaccard, 0),
+                        np.where(description_hits >= needed, DESCRIPTION_WEIGHT * description_hits / len(query), 0))
+    # Best score first, ties in row order: one int64 sort key (much faster
+    # than a stable float argsort)
+    ranked = np.argsort((np.round((2 - scores) * 1e6).astype(np.int64) << 32) | rows)
+    return rows[ranked], scores[ranked]
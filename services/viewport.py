@@ -0,0 +1,62 @@
+# ============================================
+# Viewport-driven map loading
+# ============================================
+# The visible map area (bounds + zoom returned by st_folium) is snapped to a
+# grid of square tiles. Each tile is loaded with its own cached bounding-box
+# query, so panning only queries the tiles that came into view and every
+# request stays bounded by the viewport, not by the size of the table.
+
+import math
+import os
+
+MAX_TILES = int(os.environ.get("VIEWPORT_MAX_TILES", 16))
+TILE_ROW_LIMIT = int(os.environ.get("VIEWPORT_TILE_ROW_LIMIT", 500))
+
+DEFAULT_CENTER = (32.7767, -96.7970)
+DEFAULT_ZOOM = 12
+# Approximate size of the map component, used before st_folium reports bounds
+MAP_WIDTH_PX, MAP_HEIGHT_PX = 1000, 600
+
+
+# Tile edge in degrees at a tile zoom level (halves with every level)
+def tile_degrees(tile_zoom):
+    return 360.0 / 2 ** tile_zoom
+
+
+# (south, west, north, east) of a tile
+def tile_bounds(tile):
+    tile_zoom, x, y = tile
+    size = tile_degrees(tile_zoom)
+    return y * size - 90, x * size - 180, (y + 1) * size - 90, (x + 1) * size - 180
+
+
+# Bounds shown by a map of MAP_WIDTH_PX x MAP_HEIGHT_PX at center / zoom
+def estimate_bounds(center=DEFAULT_CENTER, zoom=DEFAULT_ZOOM):
+    degrees_per_px = 360.0 / (256 * 2 ** zoom)
+    half_lng = MAP_WIDTH_PX / 2 * degrees_per_px
+    half_lat = MAP_HEIGHT_PX / 2 * degrees_per_px * math.cos(math.radians(center[0]))
+    return center[0] - half_lat, center[1] - half_lng, center[0] + half_lat, center[1] + half_lng
+
+
+# st_folium's bounds dict -> (south, west, north, east), or None before the
+# map has reported its bounds
+def bounds_from_map_state(state):
+    bounds = (state or {}).get("bounds") or {}
+    south_west, north_east = bounds.get("_southWest") or {}, bounds.get("_northEast") or {}
+    corners = (south_west.get("lat"), south_west.get("lng"), north_east.get("lat"), north_east.get("lng"))
+    return None if None in corners else corners
+
+
+# Tiles covering the bounds. Tiles are one zoom level coarser than the map so
+# a typical viewport needs a handful of them; when zoomed far out the tiles
+# get coarser until at most MAX_TILES cover the view.
+def tiles_for_bounds(bounds, zoom):
+    south, west, north, east = bounds
+    tile_zoom = max(int(zoom) - 1, 0)
+    while True:
+        size = tile_degrees(tile_zoom)
+        xs = range(math.floor((west + 180) / size), math.floor((east + 180) / size) + 1)
+        ys = range(math.floor((south + 90) / size), math.floor((north + 90) / size) + 1)
+        if len(xs) * len(ys) <= MAX_TILES or tile_zoom == 0:
+            return [(tile_zoom, x, y) for y in ys for x in xs]
+        tile_zoom -= 1
@@ -0,0 +1,73 @@
+# ============================================
+# Bulk write helpers
+# ============================================
+# Archive / restore / delete many rows with a few chunked IN-list statements
+# inside a single transaction instead of one round trip per id. Review writes
+# also adjust RestaurantRatingStats in the same transaction.
+
+import os
+
+from mysql.connector import Error
+
+from services import rating_stats
+
+BATCH_SIZE = int(os.environ.get("WRITE_BATCH_SIZE", 500))
+
+
+# Split ids into lists of at most size elements
+def _chunks(ids, size=BATCH_SIZE):
+    ids = [int(i) for i in ids]
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+# Run "<statement> IN (...)" for every chunk of ids in one transaction and
+# return the number of affected rows. Rolls back and re-raises on failure.
+# before_chunk(cursor, chunk) runs ahead of each statement.
+def _execute_in_chunks(connection, statement, ids, params=(), before_chunk=None):
+    cursor = connection.cursor()
+    affected = 0
+    try:
+        for chunk in _chunks(ids):
+            if before_chunk:
+                before_chunk(cursor, chunk)
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"{statement} IN ({placeholders})", (*params, *chunk))
+            affected += cursor.rowcount
+        connection.commit()
+    except Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return affected
+
+
+# Soft delete (active=False) or restore (active=True) restaurants
+def set_restaurants_active(connection, restaurant_ids, active):
+    return _execute_in_chunks(connection,
+                              "UPDATE Restaurants SET is_active = %s, updated_at = CURRENT_TIMESTAMP WHERE restaurant_id",
+                              restaurant_ids, (active,))
+
+
+# Add one review (always as user_id=1) and count it in the rating stats
+def add_review(connection, restaurant_id, rating, review_text):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO Reviews (restaurant_id, user_id, rating, review_text, created_at)
+            VALUES (%s, %s, %s, %s, NOW())
+        """, (int(restaurant_id), 1, int(rating), review_text or None))
+        rating_stats.record_review(cursor, restaurant_id, rating)
+        connection.commit()
+    except Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# Permanently delete reviews (and take them out of the rating stats)
+def delete_reviews(connection, review_ids):
+    return _execute_in_chunks(connection, "DELETE FROM Reviews WHERE review_id", review_ids,
+                              before_chunk=rating_stats.remove_reviews)